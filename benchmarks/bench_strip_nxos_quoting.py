@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Name: bench_strip_nxos_quoting.py
+Description: Compare the previous re.sub() based NxapiInventory.clean_dict(), a
+             str.translate() based cleaner, and general/util.py strip_nxos_quoting_dict()
+             (str.replace() based), over synthetic "show inventory" rows for a chassis switch.
+
+Runs offline (no switch required).
+
+Usage:
+
+PYTHONPATH=../lib ./bench_strip_nxos_quoting.py --rows 400 --repeat 200
+"""
+our_version = 100
+
+# standard libraries
+import argparse
+import re
+import timeit
+
+# local libraries
+from nxapi_netbox.general.util import strip_nxos_quoting_dict
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: benchmark NX-OS quote stripping for show inventory rows."
+    )
+    parser.add_argument(
+        "--rows",
+        dest="rows",
+        type=int,
+        default=400,
+        help="(default: %(default)s) number of inventory rows per iteration.",
+    )
+    parser.add_argument(
+        "--repeat",
+        dest="repeat",
+        type=int,
+        default=200,
+        help="(default: %(default)s) number of iterations.",
+    )
+    return parser.parse_args()
+
+
+def make_rows(n):
+    rows = list()
+    for i in range(n):
+        row = dict()
+        row["name"] = '"Ethernet{}/{} transceiver"'.format(i // 48 + 1, i % 48 + 1)
+        row["desc"] = '"Cisco 100GBASE AOC QSFP28 Cable, 1M"'
+        row["productid"] = "QSFP-100G-AOC1M"
+        row["vendorid"] = "V01"
+        row["serialnum"] = "FIW2229{:04d}".format(i)
+        rows.append(row)
+    return rows
+
+
+def re_clean_value(v):
+    v = re.sub("'", "", v)
+    v = re.sub('"', "", v)
+    return v
+
+
+def re_clean_dict(d):
+    """
+    NxapiInventory.clean_dict() prior to nxapi_inventory.py v106
+    """
+    new_dict = dict()
+    for key in d:
+        new_key = re.sub("'", "", key)
+        new_key = re.sub('"', "", key)
+        new_dict[new_key] = re_clean_value(d[key])
+    return new_dict
+
+
+NXOS_QUOTING = str.maketrans("", "", "'\"")
+
+
+def translate_clean_dict(d):
+    return {key.translate(NXOS_QUOTING): value.translate(NXOS_QUOTING) for key, value in d.items()}
+
+
+def run(name, func, rows):
+    elapsed = timeit.timeit(lambda: [func(row) for row in rows], number=cfg.repeat)
+    per_row = elapsed / (cfg.repeat * len(rows)) * 1e6
+    print("{:<28} {:>10.4f}s {:>10.3f}us/row".format(name, elapsed, per_row))
+    return elapsed
+
+
+cfg = get_parser()
+rows = make_rows(cfg.rows)
+expected = [re_clean_dict(row) for row in rows]
+for func in [translate_clean_dict, strip_nxos_quoting_dict]:
+    if [func(row) for row in rows] != expected:
+        print("exiting. re_clean_dict and {} results differ".format(func.__name__))
+        exit(1)
+print("rows {} repeat {}".format(cfg.rows, cfg.repeat))
+baseline = run("re.sub (previous)", re_clean_dict, rows)
+for name, func in [
+    ("str.translate", translate_clean_dict),
+    ("str.replace (current)", strip_nxos_quoting_dict),
+]:
+    elapsed = run(name, func, rows)
+    print("{:<28} speedup {:.1f}x".format("", baseline / elapsed))
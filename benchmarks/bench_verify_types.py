@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Name: bench_verify_types.py
+Description: Per-call cost of VerifyTypes() is_ipv4_address(), is_ipv6_address(),
+             and is_mac_address(), compared with the previous implementation
+             (an ipaddress object or regex search built on every call).
+
+Runs offline (no switch required).
+
+Usage:
+
+PYTHONPATH=../lib ./bench_verify_types.py --number 200000
+"""
+our_version = 100
+
+# standard libraries
+import argparse
+import ipaddress
+import logging
+import timeit
+
+# local libraries
+from nxapi_netbox.general.constants import Constants
+from nxapi_netbox.general.verify_types import VerifyTypes
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: benchmark VerifyTypes address validation."
+    )
+    parser.add_argument(
+        "--number",
+        dest="number",
+        type=int,
+        default=200000,
+        help="(default: %(default)s) number of calls per measurement.",
+    )
+    return parser.parse_args()
+
+
+def previous_is_ipv4_address(param):
+    try:
+        if isinstance(ipaddress.IPv4Address(param), ipaddress.IPv4Address):
+            return True
+        return False
+    except Exception:
+        return False
+
+
+def previous_is_ipv6_address(param):
+    try:
+        if isinstance(ipaddress.IPv6Address(param), ipaddress.IPv6Address):
+            return True
+        return False
+    except Exception:
+        return False
+
+
+def previous_is_mac_address(param):
+    if constants.RE_MAC_COLON.search(param):
+        return True
+    if constants.RE_MAC_HYPHEN.search(param):
+        return True
+    if constants.RE_MAC_PERIOD.search(param):
+        return True
+    return False
+
+
+def per_call_ns(func, value):
+    return timeit.timeit(lambda: func(value), number=cfg.number) / cfg.number * 1e9
+
+
+cfg = get_parser()
+constants = Constants()
+verify = VerifyTypes(logging.getLogger(__name__))
+
+cases = [
+    ("is_ipv4_address", "192.168.1.1", previous_is_ipv4_address, verify.is_ipv4_address),
+    ("is_ipv4_address", "2001:db8::1", previous_is_ipv4_address, verify.is_ipv4_address),
+    ("is_ipv6_address", "2001:db8::1", previous_is_ipv6_address, verify.is_ipv6_address),
+    ("is_ipv6_address", "192.168.1.1", previous_is_ipv6_address, verify.is_ipv6_address),
+    ("is_ipv6_address", "cvd-leaf-1", previous_is_ipv6_address, verify.is_ipv6_address),
+    ("is_mac_address", "0050.56a1.0c2e", previous_is_mac_address, verify.is_mac_address),
+    ("is_mac_address", "Ethernet1/1", previous_is_mac_address, verify.is_mac_address),
+]
+
+fmt = "{:<16} {:<16} {:>14} {:>14} {:>8}"
+print(fmt.format("method", "value", "previous_ns", "current_ns", "speedup"))
+for name, value, previous, current in cases:
+    if previous(value) != current(value):
+        print("exiting. {}({}) result differs from previous".format(name, value))
+        exit(1)
+    previous_ns = per_call_ns(previous, value)
+    current_ns = per_call_ns(current, value)
+    print(
+        fmt.format(
+            name,
+            value,
+            "{:.0f}".format(previous_ns),
+            "{:.0f}".format(current_ns),
+            "{:.1f}x".format(previous_ns / current_ns),
+        )
+    )
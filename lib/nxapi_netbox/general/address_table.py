@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Name: address_table.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Compact, sorted, address -> (vrf, mac, interface) table used by NxapiArpTable() and NxapiIpv6NeighborTable()
+
+AddressTable() stores ARP/ND entries as parallel arrays rather than one dict() per entry:
+
+    self.addresses      bytes   addresses packed big-endian (4 bytes ipv4, 16 bytes ipv6), sorted
+    self.vrf_indexes    array('H')  index into self.vrfs
+    self.macs           array('Q')  mac address as a 48-bit int (0 if unresolved, e.g. INCOMPLETE)
+    self.intf_indexes   array('I')  index into self.interfaces
+    self.mac_order      array('I')  row numbers sorted on mac
+    self.intf_order     array('I')  row numbers sorted on interface
+
+Because packed big-endian addresses compare in the same order as the addresses
+themselves, address, subnet, mac, and interface lookups are binary searches
+(bisect) over these arrays.
+
+Synopsis:
+
+from nxapi_netbox.general.address_table import AddressTable
+from nxapi_netbox.general.log import get_logger
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+table = AddressTable(log, 4)
+table.add('10.1.1.2', 'default', '0050.56a1.0c2e', 'Vlan10')
+table.add('10.1.1.3', 'default', '0050.56a1.0c2f', 'Vlan10')
+table.build()
+table.lookup_address('10.1.1.2')      # list of entry dict()
+table.lookup_subnet('10.1.1.0/24')
+table.lookup_mac('0050.56a1.0c2e')
+table.lookup_interface('Vlan10')
+"""
+our_version = 100
+
+# standard libraries
+from array import array
+from bisect import bisect_left, bisect_right
+import ipaddress
+import socket
+
+
+class _SortedView(object):
+    """
+    read-only sequence over keys[order[i]], so that bisect can search
+    keys in the order given by order without building a sorted copy
+    """
+
+    def __init__(self, keys, order):
+        self.keys = keys
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.keys[self.order[i]]
+
+
+class _PackedView(object):
+    """
+    read-only sequence over fixed-width records in a bytes object
+    """
+
+    def __init__(self, data, width):
+        self.data = data
+        self.width = width
+
+    def __len__(self):
+        return len(self.data) // self.width
+
+    def __getitem__(self, i):
+        return self.data[i * self.width : (i + 1) * self.width]
+
+
+class AddressTable(object):
+    """
+    Takes two arguments:
+
+    1. log instance - mandatory
+    2. ip version, 4 or 6 - mandatory
+    """
+
+    def __init__(self, log, version):
+        self.lib_name = "AddressTable"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        if version == 4:
+            self.family = socket.AF_INET
+            self.width = 4
+        elif version == 6:
+            self.family = socket.AF_INET6
+            self.width = 16
+        else:
+            self.log.error(
+                "{} exiting. version must be 4 or 6. Got {}".format(
+                    self.log_prefix, version
+                )
+            )
+            exit(1)
+        self.version = version
+        self.clear()
+
+    def clear(self):
+        self.vrfs = list()
+        self.interfaces = list()
+        self._vrf_index = dict()
+        self._intf_index = dict()
+        self._pending = list()
+        self.addresses = bytes()
+        self.vrf_indexes = array("H")
+        self.macs = array("Q")
+        self.intf_indexes = array("I")
+        self.mac_order = array("I")
+        self.intf_order = array("I")
+
+    def _index(self, names, index, name):
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    def mac_to_int(self, mac):
+        try:
+            return int(mac.replace(".", "").replace(":", "").replace("-", ""), 16)
+        except (AttributeError, ValueError):
+            return 0
+
+    def int_to_mac(self, x):
+        if x == 0:
+            return "na"
+        _hex = "{:012x}".format(x)
+        return "{}.{}.{}".format(_hex[0:4], _hex[4:8], _hex[8:12])
+
+    def pack(self, address):
+        """
+        return address packed big-endian, or None if address is not a valid address of self.version
+        """
+        try:
+            return socket.inet_pton(self.family, str(address).split("%")[0])
+        except (OSError, ValueError):
+            return None
+
+    def add(self, address, vrf, mac, interface):
+        """
+        queue one entry.  Call build() after all entries are added.
+        Returns False if address could not be parsed.
+        """
+        _packed = self.pack(address)
+        if _packed is None:
+            return False
+        self._pending.append(
+            (
+                _packed,
+                self._index(self.vrfs, self._vrf_index, vrf),
+                self.mac_to_int(mac),
+                self._index(self.interfaces, self._intf_index, interface),
+            )
+        )
+        return True
+
+    def build(self):
+        """
+        sort the queued entries on (address, vrf) and populate the arrays
+        """
+        self._pending.sort()
+        self.addresses = b"".join([_entry[0] for _entry in self._pending])
+        self.vrf_indexes = array("H", [_entry[1] for _entry in self._pending])
+        self.macs = array("Q", [_entry[2] for _entry in self._pending])
+        self.intf_indexes = array("I", [_entry[3] for _entry in self._pending])
+        self._pending = list()
+        _rows = range(len(self.macs))
+        self.mac_order = array("I", sorted(_rows, key=self.macs.__getitem__))
+        self.intf_order = array(
+            "I", sorted(_rows, key=self.intf_indexes.__getitem__)
+        )
+
+    def __len__(self):
+        return len(self.macs)
+
+    def entry(self, row):
+        """
+        return the entry at row as a dict()
+        """
+        _packed = self.addresses[row * self.width : (row + 1) * self.width]
+        _entry = dict()
+        _entry["address"] = socket.inet_ntop(self.family, _packed)
+        _entry["vrf"] = self.vrfs[self.vrf_indexes[row]]
+        _entry["mac"] = self.int_to_mac(self.macs[row])
+        _entry["interface"] = self.interfaces[self.intf_indexes[row]]
+        return _entry
+
+    def _entries(self, rows, vrf=None):
+        _entries = list()
+        for _row in rows:
+            if vrf is not None and self.vrfs[self.vrf_indexes[_row]] != vrf:
+                continue
+            _entries.append(self.entry(_row))
+        return _entries
+
+    def _address_range(self, start, end):
+        _view = _PackedView(self.addresses, self.width)
+        return range(bisect_left(_view, start), bisect_right(_view, end))
+
+    def lookup_address(self, address, vrf=None):
+        """
+        return a list of entries for address, optionally restricted to vrf
+        """
+        _packed = self.pack(address)
+        if _packed is None:
+            return list()
+        return self._entries(self._address_range(_packed, _packed), vrf)
+
+    def lookup_subnet(self, prefix, vrf=None):
+        """
+        return a list of entries within prefix (e.g. 10.1.0.0/16), optionally restricted to vrf
+        """
+        try:
+            _network = ipaddress.ip_network(prefix, strict=False)
+        except ValueError:
+            return list()
+        if _network.version != self.version:
+            return list()
+        _start = _network.network_address.packed
+        _end = _network.broadcast_address.packed
+        return self._entries(self._address_range(_start, _end), vrf)
+
+    def lookup_mac(self, mac, vrf=None):
+        """
+        return a list of entries for mac, optionally restricted to vrf
+        """
+        _mac = self.mac_to_int(mac)
+        _view = _SortedView(self.macs, self.mac_order)
+        _rows = [
+            self.mac_order[i]
+            for i in range(bisect_left(_view, _mac), bisect_right(_view, _mac))
+        ]
+        return self._entries(sorted(_rows), vrf)
+
+    def lookup_interface(self, interface, vrf=None):
+        """
+        return a list of entries learned on interface, optionally restricted to vrf
+        """
+        if interface not in self._intf_index:
+            return list()
+        _index = self._intf_index[interface]
+        _view = _SortedView(self.intf_indexes, self.intf_order)
+        _rows = [
+            self.intf_order[i]
+            for i in range(bisect_left(_view, _index), bisect_right(_view, _index))
+        ]
+        return self._entries(sorted(_rows), vrf)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Name: bgp_peer_tracker.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Track bgp peer state, uptime, and prefixes received over time
+
+BgpPeerTracker() stores, per (hostname, afi, peer), the last qlen samples of
+state, uptime, and prefixreceived in fixed-size ring buffers (deque).  From
+these it computes flap counts, prefix churn, and time since last change,
+so questions like "which evpn peers flapped in the last hour" are answered
+from memory without re-querying the switches.
+
+A flap is counted when, between two consecutive samples, either:
+    - state changed, or
+    - uptime went backwards (the session reset and came back up between polls)
+
+Samples are fed from refreshed NxapiBgpUnicastSummaryIpv4/Ipv6() or
+NxapiBgpL2vpnEvpnSummary() instances, e.g.:
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.bgp_peer_tracker import BgpPeerTracker
+from nxapi_netbox.nxapi.nxapi_bgp_l2vpn_evpn_summary import NxapiBgpL2vpnEvpnSummary
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+tracker = BgpPeerTracker(log, qlen=360)
+nx = NxapiBgpL2vpnEvpnSummary('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+while True:
+    tracker.poll(nx, 'l2vpn_evpn')
+    for key in tracker.flapped(window=3600):
+        print(key, tracker.flaps(key, 3600), tracker.time_since_last_change(key))
+    time.sleep(10)
+
+See also: scripts/bgp_peer_flap_tracker.py
+"""
+our_version = 100
+
+# standard libraries
+from collections import deque
+import time
+
+# local libraries
+from nxapi_netbox.general.util import iso8601_duration_to_seconds
+from nxapi_netbox.general.verify_types import VerifyTypes
+
+
+class BgpPeerTracker(object):
+    """
+    Per-peer ring buffers of (timestamp, state, uptime, prefixreceived)
+
+    Keys are tuples (hostname, afi, peer)
+
+    Takes two arguments:
+
+    1. log instance - mandatory
+    2. the ring buffer length, in samples.  Optional. Default is 120 samples.
+    """
+
+    def __init__(self, log, qlen=120):
+        self.lib_name = "BgpPeerTracker"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        self.verify = VerifyTypes(self.log)
+
+        if not self.verify.is_int(qlen) or qlen < 2:
+            self.log.warning(
+                "{} invalid ring buffer length {}.  Setting to default 120".format(
+                    self.log_prefix, qlen
+                )
+            )
+            qlen = 120
+        self.qlen = qlen
+        # (hostname, afi, peer) -> deque of (timestamp, state, uptime, prefixreceived)
+        self.samples = dict()
+        # (hostname, afi, peer) -> deque of timestamps at which a flap was seen
+        self.flap_times = dict()
+        # (hostname, afi, peer) -> timestamp of the last state or prefixreceived change
+        self.last_change = dict()
+
+    def _to_int(self, x):
+        try:
+            return int(x)
+        except (TypeError, ValueError):
+            return None
+
+    def update(self, hostname, afi, neighbor_info, timestamp=None):
+        """
+        record one sample for each peer in neighbor_info, which is the
+        neighbor_info dict() of a refreshed NxapiBgp*Summary() instance,
+        keyed on neighborid.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        for peer in neighbor_info:
+            _dict = neighbor_info[peer]
+            self.add_sample(
+                (hostname, afi, peer),
+                timestamp,
+                _dict.get("state", "na"),
+                iso8601_duration_to_seconds(_dict.get("time")),
+                self._to_int(_dict.get("prefixreceived")),
+            )
+
+    def add_sample(self, key, timestamp, state, uptime, prefixreceived):
+        if key not in self.samples:
+            self.samples[key] = deque(maxlen=self.qlen)
+            self.flap_times[key] = deque(maxlen=self.qlen)
+            self.last_change[key] = timestamp
+        q = self.samples[key]
+        if len(q) != 0:
+            _, last_state, last_uptime, last_prefixreceived = q[-1]
+            flapped = False
+            if state != last_state:
+                flapped = True
+            elif uptime is not None and last_uptime is not None and uptime < last_uptime:
+                flapped = True
+            if flapped:
+                self.flap_times[key].append(timestamp)
+                self.log.debug(
+                    "{} {} flapped. state {} -> {}, uptime {} -> {}".format(
+                        self.log_prefix, key, last_state, state, last_uptime, uptime
+                    )
+                )
+            if flapped or prefixreceived != last_prefixreceived:
+                self.last_change[key] = timestamp
+        q.append((timestamp, state, uptime, prefixreceived))
+
+    def poll(self, instance, afi, timestamp=None):
+        """
+        refresh instance, an NxapiBgpUnicastSummaryIpv4/Ipv6() or
+        NxapiBgpL2vpnEvpnSummary(), and record a sample for each of its peers.
+        """
+        instance.refresh()
+        self.update(instance.hostname, afi, instance.neighbor_info, timestamp)
+
+    def _window_start(self, window):
+        if window is None:
+            return None
+        return time.time() - window
+
+    def flaps(self, key, window=None):
+        """
+        number of flaps for key within the last window seconds.
+        If window is None, all flaps within the ring buffer are counted.
+        """
+        if key not in self.flap_times:
+            return 0
+        start = self._window_start(window)
+        if start is None:
+            return len(self.flap_times[key])
+        return sum(1 for ts in self.flap_times[key] if ts >= start)
+
+    def flapped(self, window=None, afi=None):
+        """
+        return a list of keys with at least one flap within the last window seconds,
+        optionally restricted to afi.
+        """
+        keys = list()
+        for key in self.flap_times:
+            if afi is not None and key[1] != afi:
+                continue
+            if self.flaps(key, window) > 0:
+                keys.append(key)
+        return keys
+
+    def churn(self, key, window=None):
+        """
+        sum of absolute changes in prefixreceived between consecutive samples
+        for key within the last window seconds.
+        """
+        if key not in self.samples:
+            return 0
+        start = self._window_start(window)
+        total = 0
+        previous = None
+        for ts, _, _, prefixreceived in self.samples[key]:
+            if start is not None and ts < start:
+                previous = prefixreceived
+                continue
+            if previous is not None and prefixreceived is not None:
+                total += abs(prefixreceived - previous)
+            previous = prefixreceived
+        return total
+
+    def churn_rate(self, key, window=None):
+        """
+        prefixreceived churn per second for key within the last window seconds.
+        Returns 0.0 if fewer than two samples are available.
+        """
+        if key not in self.samples or len(self.samples[key]) < 2:
+            return 0.0
+        start = self._window_start(window)
+        first = self.samples[key][0][0]
+        if start is not None and start > first:
+            first = start
+        elapsed = self.samples[key][-1][0] - first
+        if elapsed <= 0:
+            return 0.0
+        return self.churn(key, window) / elapsed
+
+    def time_since_last_change(self, key):
+        """
+        seconds since state or prefixreceived last changed for key.
+        Returns None if key has never been sampled.
+        """
+        if key not in self.last_change:
+            return None
+        return time.time() - self.last_change[key]
+
+    def last(self, key):
+        """
+        the most recent sample (timestamp, state, uptime, prefixreceived) for key, or None
+        """
+        try:
+            return self.samples[key][-1]
+        except (KeyError, IndexError):
+            return None
+
+    def clear(self):
+        self.samples = dict()
+        self.flap_times = dict()
+        self.last_change = dict()
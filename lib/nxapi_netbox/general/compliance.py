@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Name: compliance.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Evaluate desired-state rules (software version, boot variables, system mode) against facts from many switches
+
+ComplianceEngine() holds a set of rules, and the facts of any number of
+devices.  Facts are a flat dict() attribute -> value per device.
+device_facts_to_dict() builds one from a refreshed NxapiDeviceFacts()
+(nxapi/nxapi_device_facts.py), with the following attributes:
+
+    hostname
+    nxos_version                    show version nxos_ver_str
+    bios_version                    show version bios_ver_str
+    chassis                         show version chassis_id
+    reset_reason                    show version rr_reason
+    reset_sys_ver                   show version rr_sys_ver
+    system_mode                     show system mode system_mode (Normal, Maintenance)
+    maintenance_timer               show system mode timer_state
+    host_id                         show license host-id
+    sups                            number of supervisors
+    boot_current_image_sup<N>       show boot current image of sup N (NxapiBoot.sup_instance = N)
+    boot_startup_image_sup<N>       show boot startup image of sup N
+    boot_consistent                 True if, on every sup, the startup image is the current image,
+                                    and (dual sup) all sups boot the same image
+
+Only these values are kept per device, so memory grows with the number of
+devices and attributes, not with the size of the switch outputs.
+
+Rules have the following structure:
+
+    name:       rule name, reported with each violation
+    attribute:  one of the attributes above
+    op:         one of:
+                    equals      value equals rule value
+                    in          value is in the list of rule values
+                    not_in      value is not in the list of rule values
+                    regex       value matches the rule value (re.search)
+    value:      str(), or list() for in / not_in
+    roles:      optional list of netbox device roles the rule applies to.  Default: all devices.
+
+The devices are indexed on attribute -> value -> devices, so each rule is
+evaluated once per distinct value of its attribute (e.g. once per NX-OS
+version in the fleet), rather than once per device.
+
+Rules can be loaded from a YAML file e.g.:
+
+    rules:
+      - name: approved_nxos
+        attribute: nxos_version
+        op: in
+        value: ["10.2(5)", "10.3(2)"]
+      - name: spine_nxos
+        attribute: nxos_version
+        op: equals
+        value: "10.3(2)"
+        roles: [spine]
+      - name: boot_consistent
+        attribute: boot_consistent
+        op: equals
+        value: true
+      - name: not_in_maintenance
+        attribute: system_mode
+        op: equals
+        value: Normal
+      - name: boot_image_sup1
+        attribute: boot_startup_image_sup1
+        op: regex
+        value: 'nxos64-cs\\.10\\.3\\.2\\.F\\.bin$'
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.compliance import ComplianceEngine, device_facts_to_dict
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+engine = ComplianceEngine(log)
+engine.load_rules('/tmp/rules.yml')
+# nx is a refreshed NxapiDeviceFacts() instance
+engine.add_device('leaf_1', device_facts_to_dict(nx), role='leaf')
+for violation in engine.violations():
+    print(violation)
+
+See also: scripts/compliance_check.py
+"""
+our_version = 100
+
+# standard libraries
+import re
+
+# local libraries
+from nxapi_netbox.general.util import file_exists
+
+
+def _boot_image(boot, sup, which):
+    boot.sup_instance = sup
+    if which == "current":
+        image = boot.current_image
+    else:
+        image = boot.startup_image
+    if image is False:
+        return "na"
+    return image
+
+
+def device_facts_to_dict(nx):
+    """
+    return a flat dict() of the attributes described in the library header,
+    from a refreshed NxapiDeviceFacts() instance
+    """
+    facts = dict()
+    facts["hostname"] = str(nx.hostname)
+    facts["nxos_version"] = nx.version.nxos_ver_str
+    facts["bios_version"] = nx.version.bios_ver_str
+    facts["chassis"] = nx.version.chassis_id
+    facts["reset_reason"] = nx.version.rr_reason
+    facts["reset_sys_ver"] = nx.version.rr_sys_ver
+    facts["system_mode"] = nx.system_mode.system_mode
+    facts["maintenance_timer"] = nx.system_mode.timer_state
+    facts["host_id"] = str(nx.license_hostid.host_id)
+    sups = [
+        sup
+        for sup in sorted(nx.boot.info.keys())
+        if _boot_image(nx.boot, sup, "current") != "na"
+    ]
+    facts["sups"] = len(sups)
+    images = set()
+    consistent = len(sups) != 0
+    for sup in sorted(nx.boot.info.keys()):
+        current = _boot_image(nx.boot, sup, "current")
+        startup = _boot_image(nx.boot, sup, "startup")
+        facts["boot_current_image_sup{}".format(sup)] = current
+        facts["boot_startup_image_sup{}".format(sup)] = startup
+        if sup not in sups:
+            continue
+        images.add(current)
+        images.add(startup)
+        if current != startup:
+            consistent = False
+    if len(images) > 1:
+        consistent = False
+    facts["boot_consistent"] = consistent
+    nx.boot.sup_instance = 1
+    return facts
+
+
+class ComplianceEngine(object):
+    """
+    Takes one argument:
+
+    1. log instance - mandatory
+    """
+
+    def __init__(self, log):
+        self.lib_name = "ComplianceEngine"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        self.ops = ["equals", "in", "not_in", "regex"]
+        self.rules = list()
+        # device -> role
+        self.roles = dict()
+        # attribute -> value -> set of devices
+        self.index = dict()
+        # device -> error string, for devices whose facts could not be collected
+        self.errors = dict()
+
+    def add_rule(self, name, attribute, op, value, roles=None):
+        if op not in self.ops:
+            self.log.error(
+                "{} exiting. rule {} unknown op {}. Expected one of {}".format(
+                    self.log_prefix, name, op, self.ops
+                )
+            )
+            exit(1)
+        if op in ["in", "not_in"] and not isinstance(value, list):
+            value = [value]
+        rule = dict()
+        rule["name"] = name
+        rule["attribute"] = attribute
+        rule["op"] = op
+        rule["value"] = value
+        rule["roles"] = None if roles is None else set(roles)
+        if op == "regex":
+            try:
+                rule["regex"] = re.compile(str(value))
+            except re.error as e:
+                self.log.error(
+                    "{} exiting. rule {} invalid regex {}. Error: {}".format(
+                        self.log_prefix, name, value, e
+                    )
+                )
+                exit(1)
+        self.rules.append(rule)
+
+    def load_rules(self, filename):
+        """
+        load rules from a YAML file.  See the library header for the format.
+        """
+        import yaml
+
+        if not file_exists(filename):
+            self.log.error(
+                "{} exiting. rules file {} not found.".format(self.log_prefix, filename)
+            )
+            exit(1)
+        with open(filename, "r") as fh:
+            _rules = yaml.safe_load(fh)
+        try:
+            _rules = _rules["rules"]
+        except (KeyError, TypeError):
+            self.log.error(
+                "{} exiting. rules file {} has no rules key.".format(
+                    self.log_prefix, filename
+                )
+            )
+            exit(1)
+        for _rule in _rules:
+            for key in ["name", "attribute", "op", "value"]:
+                if key not in _rule:
+                    self.log.error(
+                        "{} exiting. rule {} in {} is missing key {}".format(
+                            self.log_prefix, _rule, filename, key
+                        )
+                    )
+                    exit(1)
+            self.add_rule(
+                _rule["name"],
+                _rule["attribute"],
+                _rule["op"],
+                _rule["value"],
+                _rule.get("roles"),
+            )
+
+    def add_device(self, device, facts, role="na"):
+        """
+        index facts, a flat dict() attribute -> value, for device
+        """
+        self.roles[device] = role
+        for attribute, value in facts.items():
+            values = self.index.setdefault(attribute, dict())
+            values.setdefault(value, set()).add(device)
+
+    def add_error(self, device, error, role="na"):
+        """
+        record that the facts of device could not be collected
+        """
+        self.roles[device] = role
+        self.errors[device] = error
+
+    def _violates(self, rule, value):
+        op = rule["op"]
+        if op == "equals":
+            return value != rule["value"]
+        if op == "in":
+            return value not in rule["value"]
+        if op == "not_in":
+            return value in rule["value"]
+        return rule["regex"].search(str(value)) is None
+
+    def _in_scope(self, rule, device):
+        if device in self.errors:
+            return False
+        return rule["roles"] is None or self.roles.get(device) in rule["roles"]
+
+    def violations(self):
+        """
+        return a list of tuples (device, rule name, attribute, value, expected),
+        sorted on device and rule name.  Devices whose facts could not be
+        collected are reported with rule name 'collection'.
+        """
+        result = list()
+        for rule in self.rules:
+            attribute = rule["attribute"]
+            values = self.index.get(attribute, dict())
+            seen = set()
+            for value, devices in values.items():
+                seen.update(devices)
+                if not self._violates(rule, value):
+                    continue
+                for device in devices:
+                    if self._in_scope(rule, device):
+                        result.append(
+                            (device, rule["name"], attribute, value, rule["value"])
+                        )
+            # devices without the attribute are violations, unless the rule accepts 'na'
+            if not self._violates(rule, "na"):
+                continue
+            for device in self.roles:
+                if device not in seen and self._in_scope(rule, device):
+                    result.append(
+                        (device, rule["name"], attribute, "na", rule["value"])
+                    )
+        for device, error in self.errors.items():
+            result.append((device, "collection", "na", error, "facts collected"))
+        return sorted(result, key=lambda x: (str(x[0]), x[1]))
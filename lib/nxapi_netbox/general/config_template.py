@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Name: config_template.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Render per-device NX-OS configs from a Jinja2 template and Netbox device context, in a process pool
+
+ConfigTemplate() renders template_file once per device, with the device's
+context (see netbox_session.get_device_context()) available in the template as
+the variable device, e.g.:
+
+    hostname {{ device.name }}
+    {% for server in device.config_context.ntp_servers %}
+    ntp server {{ server }} use-vrf management
+    {% endfor %}
+
+The rendered text is converted to a config list (one line per element, with
+blank lines and comment lines removed) suitable for NxapiConfig().config_list
+or NxapiConfigFleet().add_device().
+
+Rendering is done in a pool of max_processes processes, so that rendering
+many devices is not limited to one CPU.  Each process compiles the template
+once, and reuses it for every device it renders.  With fewer than
+min_process_devices devices, rendering is done in the calling process, where
+starting the pool would cost more than it saves.
+
+Undefined template variables are errors, rather than silently rendering as
+empty strings.  Devices whose template fails to render are recorded in
+self.errors, and are not in the dict() returned by render().
+
+Jinja2 is an optional dependency, needed only by this library:
+
+    pip install jinja2
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.config_template import ConfigTemplate
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_context
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+nb = netbox(vault)
+contexts = dict()
+for device in ['leaf_1', 'leaf_2']:
+    contexts[device] = get_device_context(nb, device)
+template = ConfigTemplate(log)
+template.template_file = '/tmp/ntp.j2'
+configs = template.render(contexts)
+for device, config_list in configs.items():
+    print(device, config_list)
+for device, error in template.errors.items():
+    print(device, error)
+
+See also: scripts/config_push.py
+"""
+our_version = 100
+
+# standard libraries
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+# local libraries
+from nxapi_netbox.general.util import file_exists
+
+# template directory -> jinja2.Environment().  One per process.
+# Each Environment caches the templates it has compiled.
+_environments = dict()
+
+
+def _get_template(template_file):
+    import jinja2
+
+    template_dir, template_name = os.path.split(os.path.abspath(template_file))
+    if template_dir not in _environments:
+        _environments[template_dir] = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(template_dir),
+            undefined=jinja2.StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+        )
+    return _environments[template_dir].get_template(template_name)
+
+
+def config_text_to_list(text):
+    """
+    return text as a list of config lines, without blank lines and comment lines
+    """
+    config_list = list()
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped == "" or stripped[0] == "#":
+            continue
+        config_list.append(line.rstrip())
+    return config_list
+
+
+def _render(item):
+    """
+    item is a tuple (template_file, device, context)
+    returns a tuple (device, config_list, error).  One of config_list or error is None.
+    """
+    template_file, device, context = item
+    try:
+        text = _get_template(template_file).render(device=context)
+    except Exception as e:
+        return (device, None, "{}: {}".format(type(e).__name__, e))
+    return (device, config_text_to_list(text), None)
+
+
+class ConfigTemplate(object):
+    """
+    Takes one argument:
+
+    1. log instance - mandatory
+    """
+
+    def __init__(self, log):
+        self.lib_name = "ConfigTemplate"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        self.template_file = None
+        self.max_processes = os.cpu_count() or 1
+        self.min_process_devices = 50
+        # device -> error string, for devices whose template failed to render
+        self.errors = dict()
+
+    def verify(self):
+        try:
+            import jinja2
+        except ImportError:
+            self.log.error(
+                "{} exiting. jinja2 is required for config templates. Try: pip install jinja2".format(
+                    self.log_prefix
+                )
+            )
+            exit(1)
+        if self.template_file is None or not file_exists(self.template_file):
+            self.log.error(
+                "{} exiting. template_file {} not found.".format(
+                    self.log_prefix, self.template_file
+                )
+            )
+            exit(1)
+
+    def render(self, contexts):
+        """
+        contexts is a dict() device -> context dict()
+        returns a dict() device -> config list, for devices that rendered without error
+        """
+        self.verify()
+        self.errors = dict()
+        items = [(self.template_file, device, contexts[device]) for device in contexts]
+        if len(items) < self.min_process_devices or self.max_processes < 2:
+            results = [_render(item) for item in items]
+        else:
+            processes = min(self.max_processes, len(items))
+            # a few chunks per process balances the load without per-device IPC
+            chunksize = max(1, len(items) // (processes * 4))
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(_render, items, chunksize=chunksize))
+        configs = dict()
+        for device, config_list, error in results:
+            if error is not None:
+                self.log.error(
+                    "{} {} unable to render {}. {}".format(
+                        self.log_prefix, device, self.template_file, error
+                    )
+                )
+                self.errors[device] = error
+                continue
+            configs[device] = config_list
+        return configs
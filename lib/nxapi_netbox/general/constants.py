@@ -4,7 +4,7 @@ Description: Constants used by nxapi-netbox libraries
 """
 import re
 
-OUR_VERSION = 102
+OUR_VERSION = 103
 class Constants:
     """
     Constants used by nxapi-netbox libraries
@@ -20,6 +20,13 @@ class Constants:
         self.DEFAULT_LOGLEVEL = "INFO"
         self.VALID_LOGLEVELS = ["INFO", "WARNING", "DEBUG", "ERROR", "CRITICAL"]
         self.HEX_DIGITS = frozenset("0123456789ABCDEFabcdef")
+        # characters that can appear in an ipv4 address, and in an ipv6
+        # address (excluding scope id).  Used by VerifyTypes() to reject
+        # obvious non-addresses before calling ipaddress
+        self.IPV4_ADDRESS_CHARS = frozenset("0123456789.")
+        self.IPV6_ADDRESS_CHARS = frozenset("0123456789ABCDEFabcdef:.")
+        # maximum number of results memoized per VerifyTypes() address method
+        self.VERIFY_CACHE_SIZE = 8192
         self.RE_DIGITS = re.compile("^(\d+)$")
         self.RE_MAC_COLON = re.compile(r"^([0-9a-fA-F]{2}[:]){5}([0-9a-fA-F]{2})$")
         self.RE_MAC_HYPHEN = re.compile(r"^([0-9a-fA-F]{2}[-]){5}([0-9a-fA-F]{2})$")
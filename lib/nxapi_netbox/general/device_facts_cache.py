@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Name: device_facts_cache.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Local, persistent cache of static device facts, invalidated when a device reloads
+
+DeviceFactsCache() stores one entry per device, keyed on a caller-chosen key
+(NxapiDeviceFacts() uses its mgmt_ip):
+
+    {
+        'boot_time': <float() seconds since the epoch at which the device last booted>,
+        'collected': <float() seconds since the epoch at which the facts were collected>,
+        'bodies': <dict() fact name -> NXAPI body, e.g. 'version' -> show version body>
+    }
+
+valid(key, boot_time) returns True if the entry for key was collected during
+the device's current boot, i.e. its boot_time is within boot_time_tolerance
+seconds of boot_time (boot_time is derived from uptime, so it differs slightly
+between polls), and, if max_age is not 0, it is less than max_age seconds old.
+
+The entries are persisted to a JSON file.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.device_facts_cache import DeviceFactsCache
+from nxapi_netbox.nxapi.nxapi_device_facts import NxapiDeviceFacts
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+cache = DeviceFactsCache(log)
+cache.cache_file = '/tmp/device_facts.json'
+cache.load()
+
+nx = NxapiDeviceFacts('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+nx.cache = cache
+nx.refresh()
+print(nx.from_cache, nx.version.nxos_ver_str, nx.license_hostid.host_id)
+cache.save()
+
+See also: lib/nxapi_netbox/nxapi/nxapi_device_facts.py, scripts/device_facts.py
+"""
+our_version = 100
+
+# standard libraries
+import json
+import time
+
+# local libraries
+from nxapi_netbox.general.util import file_exists
+
+
+class DeviceFactsCache(object):
+    """
+    Takes one argument:
+
+    1. log instance - mandatory
+    """
+
+    def __init__(self, log):
+        self.lib_name = "DeviceFactsCache"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        self.cache_file = None
+        self.boot_time_tolerance = 120
+        # seconds after which an entry is invalid, even if the device has not reloaded.  0 = no limit
+        self.max_age = 0
+        # key -> entry dict(), see library header
+        self.entries = dict()
+
+    def get(self, key):
+        """
+        return the entry for key, or None
+        """
+        return self.entries.get(key)
+
+    def put(self, key, boot_time, bodies, collected=None):
+        if collected is None:
+            collected = time.time()
+        self.entries[key] = {
+            "boot_time": boot_time,
+            "collected": collected,
+            "bodies": bodies,
+        }
+
+    def remove(self, key):
+        self.entries.pop(key, None)
+
+    def valid(self, key, boot_time):
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        if abs(entry["boot_time"] - boot_time) > self.boot_time_tolerance:
+            self.log.debug(
+                "{} {} invalid. device rebooted. boot_time {} -> {}".format(
+                    self.log_prefix, key, entry["boot_time"], boot_time
+                )
+            )
+            return False
+        if self.max_age != 0 and time.time() - entry["collected"] > self.max_age:
+            self.log.debug(
+                "{} {} invalid. older than max_age {}".format(
+                    self.log_prefix, key, self.max_age
+                )
+            )
+            return False
+        return True
+
+    def save(self):
+        if self.cache_file is None:
+            return
+        cache = dict()
+        cache["version"] = self.lib_version
+        cache["entries"] = self.entries
+        with open(self.cache_file, "w") as fh:
+            json.dump(cache, fh)
+
+    def load(self):
+        if self.cache_file is None or not file_exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as fh:
+                cache = json.load(fh)
+            entries = cache["entries"]
+        except Exception as e:
+            self.log.warning(
+                "{} ignoring unreadable cache_file {}. Exception: {}".format(
+                    self.log_prefix, self.cache_file, e
+                )
+            )
+            return
+        self.entries = entries
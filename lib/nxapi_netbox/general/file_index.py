@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Name: file_index.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Local, persistent index of files and free space across switches, built from NxapiDirTargets() sweeps
+
+FileIndex() stores one record per file, keyed on (device, target, fname):
+
+    {
+        'device': <device name, as passed to update()>,
+        'target': <dir target e.g. bootflash:>,
+        'fname': <file name>,
+        'size': <int() size in bytes, or -1>,
+        'mtime': <int() seconds since the epoch, or -1 if timestring could not be parsed>,
+        'timestring': <timestring as returned by the switch e.g. Jul 25 21:59:17 2018>
+    }
+
+and the space usage of each (device, target):
+
+    index.space[(device, target)] = {'used': int(), 'free': int(), 'total': int(), 'usage': str()}
+
+Many switches share the same file names (e.g. NX-OS images), so searches
+(case-insensitive substring, or fnmatch-style glob) scan the distinct file
+names once, then return every record for the names that matched.
+
+Free-space queries are answered from self.space, without re-listing directories.
+
+A digest of each (device, target) listing is kept, and listings that have not
+changed since the last update() are skipped.  The records and space usage are
+persisted to a JSON file.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.file_index import FileIndex
+from nxapi_netbox.nxapi.nxapi_dir import NxapiDirTargets
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+index = FileIndex(log)
+index.cache_file = '/tmp/file_index.json'
+index.load()
+
+d = NxapiDirTargets('admin', 'mypassword', '192.168.1.1', log)
+d.nxapi_init()
+d.targets = ['bootflash:', 'logflash:']
+d.refresh()
+for target in d.targets_info:
+    d.select(target)
+    index.update('leaf_1', target, d.files, d.used, d.free, d.total, d.stats.get('usage', 'na'))
+index.save()
+
+for record in index.search('nxos*.bin', match='glob'):
+    print(record['device'], record['target'], record['fname'], record['size'])
+for (device, target), space in index.free_space(below=4 * 1024**3):
+    print(device, target, space['free'])
+
+See also: scripts/switch_file_index.py
+"""
+our_version = 100
+
+# standard libraries
+from datetime import datetime
+from fnmatch import fnmatchcase
+import hashlib
+import json
+
+# local libraries
+from nxapi_netbox.general.util import file_exists
+
+
+class FileIndex(object):
+    """
+    Takes one argument:
+
+    1. log instance - mandatory
+    """
+
+    def __init__(self, log):
+        self.lib_name = "FileIndex"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        self.cache_file = None
+        self.match_types = ["substring", "glob"]
+        self.timestring_format = "%b %d %H:%M:%S %Y"
+        # (device, target, fname) -> record dict(), see library header
+        self.records = dict()
+        # (device, target) -> space dict(), see library header
+        self.space = dict()
+        # (device, target) -> digest of the listing last merged for (device, target)
+        self.digests = dict()
+        # lowercase fname -> set of record keys
+        self.names = dict()
+
+    def _digest(self, files):
+        rows = sorted(
+            [
+                [str(fname), str(files[fname].get("fsize")), str(files[fname].get("timestring"))]
+                for fname in files
+            ]
+        )
+        return hashlib.sha1(json.dumps(rows).encode("utf-8")).hexdigest()
+
+    def _mtime(self, timestring):
+        try:
+            return int(datetime.strptime(str(timestring).strip(), self.timestring_format).timestamp())
+        except ValueError:
+            return -1
+
+    def _size(self, fsize):
+        try:
+            return int(str(fsize))
+        except ValueError:
+            return -1
+
+    def _index_record(self, key):
+        self.names.setdefault(key[2].lower(), set()).add(key)
+
+    def _unindex_record(self, key):
+        name = key[2].lower()
+        if name not in self.names:
+            return
+        self.names[name].discard(key)
+        if len(self.names[name]) == 0:
+            del self.names[name]
+
+    def update(self, device, target, files, used=-1, free=-1, total=-1, usage="na"):
+        """
+        merge NxapiDir().files (or NxapiDirTargets().files after select(target))
+        and space usage for (device, target).
+
+        Space usage is always updated.  Returns True if the file records for
+        (device, target) changed, False if unchanged.
+        """
+        self.space[(device, target)] = {
+            "used": used,
+            "free": free,
+            "total": total,
+            "usage": usage,
+        }
+        digest = self._digest(files)
+        if self.digests.get((device, target)) == digest:
+            self.log.debug(
+                "{} {} {} unchanged. skipping.".format(self.log_prefix, device, target)
+            )
+            return False
+        for key in [
+            key for key in self.records if key[0] == device and key[1] == target
+        ]:
+            self._unindex_record(key)
+            del self.records[key]
+        for fname in files:
+            key = (device, target, fname)
+            record = dict()
+            record["device"] = device
+            record["target"] = target
+            record["fname"] = fname
+            record["size"] = self._size(files[fname].get("fsize", -1))
+            record["timestring"] = files[fname].get("timestring", "na")
+            record["mtime"] = self._mtime(record["timestring"])
+            self.records[key] = record
+            self._index_record(key)
+        self.digests[(device, target)] = digest
+        return True
+
+    def remove_device(self, device):
+        for key in [key for key in self.records if key[0] == device]:
+            self._unindex_record(key)
+            del self.records[key]
+        for table in [self.space, self.digests]:
+            for key in [key for key in table if key[0] == device]:
+                del table[key]
+
+    def _filter(self, keys, devices=None, targets=None):
+        if devices is not None:
+            devices = set(devices)
+            keys = [key for key in keys if key[0] in devices]
+        if targets is not None:
+            targets = set(targets)
+            keys = [key for key in keys if key[1] in targets]
+        return keys
+
+    def search(self, pattern, match="substring", devices=None, targets=None):
+        """
+        return a list of records whose fname matches pattern (case-insensitive),
+        sorted on (device, target, fname).
+
+        match is one of:
+            substring - pattern is a substring of fname
+            glob - fname matches pattern, e.g. nxos*.bin
+
+        If devices and/or targets is not None, only records for those devices/targets are returned.
+        """
+        if match not in self.match_types:
+            self.log.error(
+                "{} exiting. Unknown match {}. Expected one of {}".format(
+                    self.log_prefix, match, self.match_types
+                )
+            )
+            exit(1)
+        pattern = str(pattern).lower()
+        keys = list()
+        for name in self.names:
+            if match == "substring" and pattern not in name:
+                continue
+            if match == "glob" and not fnmatchcase(name, pattern):
+                continue
+            keys.extend(self.names[name])
+        keys = self._filter(keys, devices, targets)
+        return [self.records[key] for key in sorted(keys)]
+
+    def free_space(self, below=None, devices=None, targets=None):
+        """
+        return a list of ((device, target), space dict()), sorted on free space ascending.
+        If below is not None, only (device, target) with less than below bytes free are returned.
+        """
+        keys = self._filter(list(self.space.keys()), devices, targets)
+        result = list()
+        for key in keys:
+            if below is not None and self.space[key]["free"] >= below:
+                continue
+            result.append((key, self.space[key]))
+        return sorted(result, key=lambda item: (item[1]["free"], item[0]))
+
+    def totals(self, devices=None, targets=None):
+        """
+        return a dict() with the sum of used, free, and total bytes across (device, target).
+        Values of -1 (unknown) are not included in the sums.
+        """
+        sums = {"used": 0, "free": 0, "total": 0}
+        for key in self._filter(list(self.space.keys()), devices, targets):
+            for field in sums:
+                if self.space[key][field] >= 0:
+                    sums[field] += self.space[key][field]
+        return sums
+
+    @property
+    def devices(self):
+        return sorted(set(key[0] for key in self.space))
+
+    def save(self):
+        if self.cache_file is None:
+            return
+        cache = dict()
+        cache["version"] = self.lib_version
+        cache["digests"] = [[key[0], key[1], digest] for key, digest in self.digests.items()]
+        cache["space"] = [[key[0], key[1], space] for key, space in self.space.items()]
+        cache["records"] = list(self.records.values())
+        with open(self.cache_file, "w") as fh:
+            json.dump(cache, fh)
+
+    def load(self):
+        if self.cache_file is None or not file_exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as fh:
+                cache = json.load(fh)
+            digests = {(device, target): digest for device, target, digest in cache["digests"]}
+            space = {(device, target): _space for device, target, _space in cache["space"]}
+            records = cache["records"]
+        except Exception as e:
+            self.log.warning(
+                "{} ignoring unreadable cache_file {}. Exception: {}".format(
+                    self.log_prefix, self.cache_file, e
+                )
+            )
+            return
+        for record in records:
+            key = (record["device"], record["target"], record["fname"])
+            self.records[key] = record
+            self._index_record(key)
+        self.digests = digests
+        self.space = space
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Name: inventory_index.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Local, persistent index of inventory and transceiver information across switches
+
+InventoryIndex() stores one record per inventory item (NxapiInventory) and per
+transceiver (NxapiInterfaceTransceiver), for any number of switches, and indexes
+the records on the following fields:
+
+    serialnum, productid, partnum, vendor, type
+
+Records have the following structure:
+
+    {
+        'device': <device name, as passed to update_inventory() / update_transceivers()>,
+        'ip': <mgmt ip>,
+        'hostname': <NX-OS hostname>,
+        'source': 'inventory' or 'transceiver',
+        'location': inventory item name (e.g. 'Slot 1') or interface (e.g. 'Ethernet1/49'),
+        'serialnum': ...,
+        'productid': inventory productid, or transceiver cisco_product_id,
+        'partnum': transceiver partnum (inventory items do not have a partnum),
+        'vendor': transceiver name (e.g. CISCO-FINISAR).  'na' for inventory items,
+                  which do not report a vendor,
+        'type': transceiver type (inventory items do not have a type),
+        'desc': inventory desc (transceivers do not have a desc),
+        'vid': inventory vendorid, i.e. the hardware version id (e.g. V01).  Not indexed.
+    }
+
+Three kinds of lookup are supported, all case-insensitive:
+
+    - exact:     dict() lookup, O(1)
+    - prefix:    bisect over the sorted distinct values of the field
+    - substring: trigram index over the distinct values of the field, verified with 'in'
+
+The index is refreshed incrementally.  A digest of each device's inventory and
+transceiver records is kept, and devices whose records have not changed since
+the last update are skipped.  The records (not the indexes, which are rebuilt
+on load) are persisted to a JSON file.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.inventory_index import InventoryIndex
+from nxapi_netbox.nxapi.nxapi_inventory import NxapiInventory
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+index = InventoryIndex(log)
+index.cache_file = '/tmp/inventory_index.json'
+index.load()
+
+nx = NxapiInventory('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+nx.refresh()
+index.update_inventory('leaf_1', '192.168.1.1', nx.hostname, nx.info)
+index.save()
+
+for record in index.search('serialnum', 'FIW2229030N', match='prefix'):
+    print(record['device'], record['location'], record['serialnum'])
+
+See also: scripts/inventory_index.py
+"""
+our_version = 101
+
+# standard libraries
+from bisect import bisect_left
+import hashlib
+import json
+
+# local libraries
+from nxapi_netbox.general.util import file_exists
+
+
+class InventoryIndex(object):
+    """
+    Takes one argument:
+
+    1. log instance - mandatory
+    """
+
+    def __init__(self, log):
+        self.lib_name = "InventoryIndex"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        self.cache_file = None
+        self.fields = ["serialnum", "productid", "partnum", "vendor", "type"]
+        self.match_types = ["exact", "prefix", "substring"]
+        # values that mean "no value" and are not indexed
+        self.empty_values = set(["", "na", "n/a"])
+        # (device, source, location) -> record dict(), see library header
+        self.records = dict()
+        # (device, source) -> digest of the records last merged for (device, source)
+        self.digests = dict()
+        # field -> lowercase value -> set of record keys
+        self.exact = dict()
+        # field -> sorted list of distinct lowercase values, rebuilt when dirty
+        self.sorted_values = dict()
+        # field -> trigram -> set of distinct lowercase values, rebuilt when dirty
+        self.trigrams = dict()
+        self.dirty = set()
+        for field in self.fields:
+            self.exact[field] = dict()
+            self.sorted_values[field] = list()
+            self.trigrams[field] = dict()
+
+    def _normalize(self, value):
+        return str(value).strip().lower()
+
+    def _digest(self, records):
+        rows = sorted(
+            [[str(record[key]) for key in sorted(record)] for record in records]
+        )
+        return hashlib.sha1(json.dumps(rows).encode("utf-8")).hexdigest()
+
+    def _index_record(self, key, record):
+        for field in self.fields:
+            value = self._normalize(record.get(field, ""))
+            if value in self.empty_values:
+                continue
+            if value not in self.exact[field]:
+                self.exact[field][value] = set()
+                self.dirty.add(field)
+            self.exact[field][value].add(key)
+
+    def _unindex_record(self, key, record):
+        for field in self.fields:
+            value = self._normalize(record.get(field, ""))
+            if value not in self.exact[field]:
+                continue
+            self.exact[field][value].discard(key)
+            if len(self.exact[field][value]) == 0:
+                del self.exact[field][value]
+                self.dirty.add(field)
+
+    def _rebuild(self, field):
+        """
+        rebuild the prefix and trigram indexes for field from its distinct values
+        """
+        if field not in self.dirty:
+            return
+        self.sorted_values[field] = sorted(self.exact[field])
+        trigrams = dict()
+        for value in self.sorted_values[field]:
+            for i in range(len(value) - 2):
+                trigrams.setdefault(value[i : i + 3], set()).add(value)
+        self.trigrams[field] = trigrams
+        self.dirty.discard(field)
+
+    def _replace(self, device, source, records):
+        """
+        replace the records for (device, source) with records, unless their
+        digest is unchanged.  Returns True if the records were replaced.
+        """
+        digest = self._digest(records)
+        if self.digests.get((device, source)) == digest:
+            self.log.debug(
+                "{} {} {} unchanged. skipping.".format(self.log_prefix, device, source)
+            )
+            return False
+        for key in [
+            key for key in self.records if key[0] == device and key[1] == source
+        ]:
+            self._unindex_record(key, self.records[key])
+            del self.records[key]
+        for record in records:
+            key = (device, source, record["location"])
+            self.records[key] = record
+            self._index_record(key, record)
+        self.digests[(device, source)] = digest
+        return True
+
+    def _make_record(self, device, ip, hostname, source, location):
+        record = dict()
+        record["device"] = device
+        record["ip"] = ip
+        record["hostname"] = hostname
+        record["source"] = source
+        record["location"] = location
+        for field in self.fields:
+            record[field] = "na"
+        record["desc"] = "na"
+        record["vid"] = "na"
+        return record
+
+    def update_inventory(self, device, ip, hostname, info):
+        """
+        merge NxapiInventory().info for device.
+
+        Returns True if device's inventory records changed, False if unchanged.
+        """
+        records = list()
+        for item in info:
+            record = self._make_record(device, ip, hostname, "inventory", item)
+            record["serialnum"] = info[item].get("serialnum", "na")
+            record["productid"] = info[item].get("productid", "na")
+            record["vid"] = info[item].get("vendorid", "na")
+            record["desc"] = info[item].get("desc", "na")
+            records.append(record)
+        return self._replace(device, "inventory", records)
+
+    def update_transceivers(self, device, ip, hostname, info):
+        """
+        merge NxapiInterfaceTransceiver().info for device.  Interfaces without
+        a transceiver present are not indexed.
+
+        Returns True if device's transceiver records changed, False if unchanged.
+        """
+        records = list()
+        for interface in info:
+            if info[interface].get("sfp") != "present":
+                continue
+            record = self._make_record(device, ip, hostname, "transceiver", interface)
+            record["serialnum"] = info[interface].get("serialnum", "na")
+            record["productid"] = info[interface].get("cisco_product_id", "na")
+            record["partnum"] = info[interface].get("partnum", "na")
+            record["vendor"] = info[interface].get("name", "na")
+            record["type"] = info[interface].get("type", "na")
+            records.append(record)
+        return self._replace(device, "transceiver", records)
+
+    def remove_device(self, device):
+        for key in [key for key in self.records if key[0] == device]:
+            self._unindex_record(key, self.records[key])
+            del self.records[key]
+        for key in [key for key in self.digests if key[0] == device]:
+            del self.digests[key]
+
+    def matching_values(self, field, value, match="exact"):
+        """
+        return the set of distinct (lowercase) values of field that match value
+        """
+        if field not in self.fields:
+            self.log.error(
+                "{} exiting. Unknown field {}. Expected one of {}".format(
+                    self.log_prefix, field, self.fields
+                )
+            )
+            exit(1)
+        if match not in self.match_types:
+            self.log.error(
+                "{} exiting. Unknown match {}. Expected one of {}".format(
+                    self.log_prefix, match, self.match_types
+                )
+            )
+            exit(1)
+        value = self._normalize(value)
+        if match == "exact":
+            if value in self.exact[field]:
+                return set([value])
+            return set()
+        self._rebuild(field)
+        if match == "prefix":
+            values = set()
+            values_list = self.sorted_values[field]
+            i = bisect_left(values_list, value)
+            while i < len(values_list) and values_list[i].startswith(value):
+                values.add(values_list[i])
+                i += 1
+            return values
+        if len(value) < 3:
+            return set(x for x in self.exact[field] if value in x)
+        candidates = None
+        for i in range(len(value) - 2):
+            values = self.trigrams[field].get(value[i : i + 3], set())
+            if candidates is None:
+                candidates = set(values)
+            else:
+                candidates &= values
+            if len(candidates) == 0:
+                return candidates
+        return set(x for x in candidates if value in x)
+
+    def search(self, field, value, match="exact", devices=None):
+        """
+        return a list of records whose field matches value, sorted on record key.
+        If devices is not None, only records for devices in devices are returned.
+        """
+        keys = set()
+        for _value in self.matching_values(field, value, match):
+            keys.update(self.exact[field][_value])
+        if devices is not None:
+            devices = set(devices)
+            keys = set(key for key in keys if key[0] in devices)
+        return [self.records[key] for key in sorted(keys)]
+
+    @property
+    def devices(self):
+        return sorted(set(key[0] for key in self.records))
+
+    def save(self):
+        if self.cache_file is None:
+            return
+        cache = dict()
+        cache["version"] = self.lib_version
+        cache["digests"] = [[key[0], key[1], digest] for key, digest in self.digests.items()]
+        cache["records"] = list(self.records.values())
+        with open(self.cache_file, "w") as fh:
+            json.dump(cache, fh)
+
+    def load(self):
+        if self.cache_file is None or not file_exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as fh:
+                cache = json.load(fh)
+            digests = {(device, source): digest for device, source, digest in cache["digests"]}
+            records = cache["records"]
+            version = cache["version"]
+        except Exception as e:
+            self.log.warning(
+                "{} ignoring unreadable cache_file {}. Exception: {}".format(
+                    self.log_prefix, self.cache_file, e
+                )
+            )
+            return
+        if version < 101:
+            # records from versions < 101 stored inventory vendorid as vendor
+            self.log.info(
+                "{} ignoring cache_file {} from version {}".format(
+                    self.log_prefix, self.cache_file, version
+                )
+            )
+            return
+        for record in records:
+            key = (record["device"], record["source"], record["location"])
+            self.records[key] = record
+            self._index_record(key, record)
+        self.digests = digests
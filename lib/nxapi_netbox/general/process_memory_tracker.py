@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Name: process_memory_tracker.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Track per-process memory usage over time and flag processes whose memory grows monotonically
+
+ProcessMemoryTracker() stores, per device, the last qlen sample timestamps in a
+ring buffer, and per (device, processname), the memory used (self.metric, one
+of rss, physical, virtual, in KB, summed across all instances of the process)
+at each of those timestamps, in a ring buffer of the same length (array('d'),
+with NaN where the process was not present in a sample).
+
+Samples are fed from the self.info dict() of refreshed NxapiProcessMemoryPhysical()
+instances.
+
+growers() fits a least-squares line to each series and returns the
+processes whose memory is growing.  A series is flagged when:
+
+    - it contains at least min_samples samples
+    - its slope is at least min_slope KB per hour
+    - at least monotonic_ratio of the steps between consecutive samples are
+      non-decreasing
+    - it has grown by at least min_growth KB between its first and last samples
+
+All processes on a device share the device's sample timestamps, so the
+centered timestamps and their sum of squares are computed once per device.
+The slope of each complete series is then a single dot product with these
+centered timestamps.  Only series with gaps (processes that started or
+stopped within the window) are fitted individually.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.process_memory_tracker import ProcessMemoryTracker
+from nxapi_netbox.nxapi.nxapi_process_memory import NxapiProcessMemoryPhysical
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+tracker = ProcessMemoryTracker(log, qlen=360)
+nx = NxapiProcessMemoryPhysical('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+while True:
+    tracker.poll(nx, 'leaf_1')
+    for grower in tracker.growers():
+        print(grower['device'], grower['process'], grower['slope'], grower['growth'])
+    time.sleep(60)
+
+See also: scripts/process_memory_leaks.py
+"""
+our_version = 100
+
+# standard libraries
+from array import array
+from math import isnan, nan
+from operator import mul
+import time
+
+# local libraries
+from nxapi_netbox.general.verify_types import VerifyTypes
+
+
+class ProcessMemoryTracker(object):
+    """
+    Per-device ring buffers of sample timestamps, and per-(device, process)
+    ring buffers of memory used.
+
+    Takes two arguments:
+
+    1. log instance - mandatory
+    2. the ring buffer length, in samples.  Optional. Default is 120 samples.
+    """
+
+    def __init__(self, log, qlen=120):
+        self.lib_name = "ProcessMemoryTracker"
+        self.lib_version = our_version
+        self.log_prefix = "{}_{}".format(self.lib_name, self.lib_version)
+        self.log = log
+        self.verify = VerifyTypes(self.log)
+
+        if not self.verify.is_int(qlen) or qlen < 2:
+            self.log.warning(
+                "{} invalid ring buffer length {}.  Setting to default 120".format(
+                    self.log_prefix, qlen
+                )
+            )
+            qlen = 120
+        self.qlen = qlen
+        self.metrics = ["rss", "physical", "virtual"]
+        self.metric = "rss"
+        self.min_samples = 10
+        self.min_slope = 1.0
+        self.monotonic_ratio = 0.9
+        self.min_growth = 0
+        # device -> array('d') of sample timestamps
+        self.timestamps = dict()
+        # device -> index of the slot that the next sample is written to
+        self.head = dict()
+        # device -> number of samples written, up to qlen
+        self.count = dict()
+        # (device, process) -> array('d') of memory used, aligned with self.timestamps[device]
+        self.values = dict()
+        # device -> list of processes of that device in self.values
+        self.processes = dict()
+
+    def _empty(self):
+        return array("d", [nan]) * self.qlen
+
+    def update(self, device, info, timestamp=None):
+        """
+        record one sample for device from info, which is the info dict() of a
+        refreshed NxapiProcessMemoryPhysical() instance, keyed on processname.
+        """
+        if not isinstance(info, dict):
+            self.log.debug(
+                "{} {} skipping sample. info is not a dict(): {}".format(
+                    self.log_prefix, device, info
+                )
+            )
+            return
+        if self.metric not in self.metrics:
+            self.log.error(
+                "{} exiting. Unknown metric {}. Expected one of {}".format(
+                    self.log_prefix, self.metric, self.metrics
+                )
+            )
+            exit(1)
+        if timestamp is None:
+            timestamp = time.time()
+        if device not in self.timestamps:
+            self.timestamps[device] = self._empty()
+            self.head[device] = 0
+            self.count[device] = 0
+            self.processes[device] = list()
+        slot = self.head[device]
+        self.timestamps[device][slot] = timestamp
+        for process in self.processes[device]:
+            self.values[(device, process)][slot] = nan
+        for process, _dict in info.items():
+            key = (device, process)
+            if key not in self.values:
+                self.values[key] = self._empty()
+                self.processes[device].append(process)
+            self.values[key][slot] = _dict[self.metric]
+        self.head[device] = (slot + 1) % self.qlen
+        self.count[device] = min(self.count[device] + 1, self.qlen)
+
+    def poll(self, instance, device, timestamp=None):
+        """
+        refresh instance, an NxapiProcessMemoryPhysical(), and record a sample for device.
+        """
+        instance.refresh()
+        self.update(device, instance.info, timestamp)
+
+    def _ordered(self, device, buffer):
+        """
+        return the samples in buffer, oldest first
+        """
+        if self.count[device] < self.qlen:
+            return buffer[: self.count[device]]
+        head = self.head[device]
+        return buffer[head:] + buffer[:head]
+
+    def series(self, device, process):
+        """
+        return a list of tuples (timestamp, value), oldest first, for (device, process),
+        excluding samples in which process was not present
+        """
+        if (device, process) not in self.values:
+            return list()
+        timestamps = self._ordered(device, self.timestamps[device])
+        values = self._ordered(device, self.values[(device, process)])
+        return [(ts, value) for ts, value in zip(timestamps, values) if not isnan(value)]
+
+    def _fit(self, xs, ys):
+        """
+        least-squares slope of ys against xs, in ys units per x unit
+        """
+        n = len(xs)
+        x_mean = sum(xs) / n
+        dx = [x - x_mean for x in xs]
+        sxx = sum(map(mul, dx, dx))
+        if sxx == 0:
+            return 0.0
+        return sum(map(mul, dx, ys)) / sxx
+
+    def _monotonic(self, ys):
+        """
+        fraction of steps between consecutive values that are non-decreasing
+        """
+        steps = len(ys) - 1
+        if steps < 1:
+            return 0.0
+        return sum(1 for a, b in zip(ys, ys[1:]) if b >= a) / steps
+
+    def slopes(self, devices=None):
+        """
+        return a list of dict(), one per (device, process) with at least
+        min_samples samples, with keys:
+
+            device, process, samples, slope (KB per hour), first, last,
+            growth (last - first), monotonic (ratio of non-decreasing steps)
+        """
+        results = list()
+        for device in self.timestamps:
+            if devices is not None and device not in devices:
+                continue
+            if self.count[device] < self.min_samples:
+                continue
+            timestamps = self._ordered(device, self.timestamps[device])
+            # timestamps are centered once per device, and shared by
+            # every process that was present in all samples
+            t_mean = sum(timestamps) / len(timestamps)
+            dt = [t - t_mean for t in timestamps]
+            stt = sum(map(mul, dt, dt))
+            for process in self.processes[device]:
+                values = self._ordered(device, self.values[(device, process)])
+                present = [value for value in values if not isnan(value)]
+                if len(present) < self.min_samples:
+                    continue
+                if len(present) == len(values):
+                    slope = sum(map(mul, dt, values)) / stt if stt != 0 else 0.0
+                else:
+                    xs = [t for t, value in zip(timestamps, values) if not isnan(value)]
+                    slope = self._fit(xs, present)
+                result = dict()
+                result["device"] = device
+                result["process"] = process
+                result["samples"] = len(present)
+                result["slope"] = slope * 3600
+                result["first"] = int(present[0])
+                result["last"] = int(present[-1])
+                result["growth"] = int(present[-1] - present[0])
+                result["monotonic"] = self._monotonic(present)
+                results.append(result)
+        return results
+
+    def growers(self, devices=None):
+        """
+        return the results of slopes() for processes flagged as growing (see
+        the library header), sorted on slope, largest first.
+        """
+        results = list()
+        for result in self.slopes(devices):
+            if result["slope"] < self.min_slope:
+                continue
+            if result["monotonic"] < self.monotonic_ratio:
+                continue
+            if result["growth"] < self.min_growth or result["growth"] <= 0:
+                continue
+            results.append(result)
+        return sorted(results, key=lambda x: (-x["slope"], x["device"], x["process"]))
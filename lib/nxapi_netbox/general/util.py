@@ -23,7 +23,7 @@ Usage:
                # Normally placed at the end of a script, or as part of an abort handler
 
 """
-OUR_VERSION = 141
+OUR_VERSION = 145
 
 import time  # localtime(), strftime()
 from collections import deque
@@ -290,6 +290,140 @@ def ranges(ints):
     yield range_start, previous_number
 
 
+def ranges_to_str(ints):
+    """
+    return a compact, NX-OS style, string representation of a list of
+    integers, built from ranges()
+
+    Example:
+
+        ranges_to_str([1,4,39,5,2,7,8,9,10])   # 1-2,4-5,7-10,39
+    """
+    if len(ints) == 0:
+        return ""
+    items = list()
+    for start, end in ranges(ints):
+        if start == end:
+            items.append(str(start))
+        else:
+            items.append("{}-{}".format(start, end))
+    return ",".join(items)
+
+
+def expand_ranges(s):
+    """
+    inverse of ranges_to_str().  Given a str of comma-separated integers
+    and integer ranges, return a sorted list of the integers.
+
+    Raises ValueError if s cannot be parsed.
+
+    Example:
+
+        expand_ranges("1-2,4-5,7-10,39")   # [1, 2, 4, 5, 7, 8, 9, 10, 39]
+    """
+    ints = set()
+    for item in str(s).split(","):
+        item = item.strip()
+        if item == "":
+            continue
+        if "-" in item:
+            start, end = item.split("-", 1)
+            ints.update(range(int(start), int(end) + 1))
+        else:
+            ints.add(int(item))
+    return sorted(ints)
+
+
+RE_INTERFACE_RANGE = re.compile(r"^(.*?)(\d+)-(\d+)$")
+
+
+def expand_interface_ranges(value):
+    """
+    expand an NX-OS interface list, in which consecutive interfaces are
+    compressed into a range on the last number of the interface name, into
+    a set() of interface names.  value is a comma-separated str, or a list()
+    of such str (NX-OS splits long port lists across a list).
+
+    Example:
+
+        expand_interface_ranges("Ethernet1/1-3,Ethernet1/53,port-channel10")
+
+    returns:
+
+        {'Ethernet1/1', 'Ethernet1/2', 'Ethernet1/3', 'Ethernet1/53', 'port-channel10'}
+    """
+    if isinstance(value, list):
+        value = ",".join([str(x) for x in value])
+    interfaces = set()
+    for item in str(value).split(","):
+        item = item.strip()
+        if item == "":
+            continue
+        match = RE_INTERFACE_RANGE.search(item)
+        if not match:
+            interfaces.add(item)
+            continue
+        prefix, start, end = match.groups()
+        for number in range(int(start), int(end) + 1):
+            interfaces.add("{}{}".format(prefix, number))
+    return interfaces
+
+
+RE_ISO8601_DURATION = re.compile(
+    r"^P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?$"
+)
+
+
+def iso8601_duration_to_seconds(duration):
+    """
+    convert an ISO 8601 duration, as returned by NX-OS in e.g. bgp summary
+    "time" and bgp neighbor "elapsedtime", to float() seconds.
+
+    Returns None if duration cannot be parsed.
+
+    Examples:
+
+        iso8601_duration_to_seconds("PT34M9S")       # 2049.0
+        iso8601_duration_to_seconds("P1DT4H28M45S")  # 102525.0
+    """
+    match = RE_ISO8601_DURATION.search(str(duration))
+    if not match:
+        return None
+    weeks, days, hours, minutes, seconds = [float(x or 0) for x in match.groups()]
+    return (
+        weeks * 604800.0 + days * 86400.0 + hours * 3600.0 + minutes * 60.0 + seconds
+    )
+
+
+def strip_nxos_quoting(value):
+    """
+    remove the single and double quotes that NX-OS embeds in some
+    JSON string values.  Non-str values are returned unchanged.
+
+    str.replace() is used rather than re.sub() or str.translate(), which
+    measured about 7x and 5.3x slower respectively for this case (13.9us
+    and 10.6us per row, vs 2.0us for str.replace()).
+    See benchmarks/bench_strip_nxos_quoting.py
+
+    Example:
+
+        strip_nxos_quoting('"Slot 1"')   # Slot 1
+    """
+    if type(value) is not str:
+        return value
+    return value.replace('"', "").replace("'", "")
+
+
+def strip_nxos_quoting_dict(d):
+    """
+    return a new dict() with strip_nxos_quoting() applied to
+    each key and value of d
+    """
+    return {
+        strip_nxos_quoting(key): strip_nxos_quoting(value) for key, value in d.items()
+    }
+
+
 def split_list(l, n):
     """
     splits list l into n sublists.
@@ -305,6 +439,37 @@ def split_list(l, n):
     return [l[i : i + n] for i in range(0, len(l), n)]
 
 
+def batch_cli(cli_list, max_commands=10, max_length=4096):
+    """
+    splits cli_list into batches suitable for sending in a single NXAPI
+    request, i.e. as ' ; '.join(batch).  Each batch contains at most
+    max_commands cli, and its joined length is at most max_length
+    characters (a cli longer than max_length gets a batch of its own).
+
+    Example:
+
+        cli_list = ['show vpc consistency-parameters interface Po{}'.format(x) for x in range(1, 26)]
+        for batch in batch_cli(cli_list):
+            nx.show(' ; '.join(batch))
+    """
+    batches = list()
+    batch = list()
+    length = 0
+    for cli in cli_list:
+        cli_length = len(cli) + len(" ; ")
+        if len(batch) != 0 and (
+            len(batch) == max_commands or length + cli_length > max_length
+        ):
+            batches.append(batch)
+            batch = list()
+            length = 0
+        batch.append(cli)
+        length += cli_length
+    if len(batch) != 0:
+        batches.append(batch)
+    return batches
+
+
 # if sys.version < '3':
 #     def b(x):
 #         return x
@@ -1,7 +1,18 @@
 """
 verify_types.py
 Summary: Methods for verifying types (e.g. int, str) and formats (mac address, ipv4 address)
+
+is_ipv4_address(), is_ipv6_address(), and is_mac_address() are called in hot
+paths (e.g. per-neighbor property setters), so they:
+
+    1. reject str() values containing characters that cannot appear in the
+       address type, without calling ipaddress or re (fast path)
+    2. memoize results for repeated values (functools.lru_cache, shared by
+       all VerifyTypes() instances)
+
+See benchmarks/bench_verify_types.py
 """
+from functools import lru_cache
 import ipaddress
 import logging
 import math  # is_power()
@@ -11,7 +22,39 @@ import string
 # local libraries
 from nxapi_netbox.general.constants import Constants
 
-OUR_VERSION = 135
+OUR_VERSION = 136
+
+_constants = Constants()
+
+
+@lru_cache(maxsize=_constants.VERIFY_CACHE_SIZE)
+def _cached_is_ipv4_address(param):
+    try:
+        ipaddress.IPv4Address(param)
+    except ValueError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=_constants.VERIFY_CACHE_SIZE)
+def _cached_is_ipv6_address(param):
+    try:
+        ipaddress.IPv6Address(param)
+    except ValueError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=_constants.VERIFY_CACHE_SIZE)
+def _cached_is_mac_address(param):
+    if _constants.RE_MAC_COLON.search(param):
+        return True
+    if _constants.RE_MAC_HYPHEN.search(param):
+        return True
+    if _constants.RE_MAC_PERIOD.search(param):
+        return True
+    return False
+
 
 class VerifyTypes:
     """
@@ -32,7 +75,7 @@ class VerifyTypes:
         self.lib_version = OUR_VERSION
         self.lib_name = "VerifyTypes"
         self.log = log
-        self.constants = Constants()
+        self.constants = _constants
 
     def is_boolean(self, param):
         """verify x is a boolean value"""
@@ -42,7 +85,7 @@ class VerifyTypes:
 
     def is_digits(self, param):
         """verify x contains only digits i.e. is a positive integer"""
-        if not self.constants.RE_DIGITS.search(str(x)):
+        if not self.constants.RE_DIGITS.search(str(param)):
             return False
         return True
 
@@ -56,7 +99,7 @@ class VerifyTypes:
         """
         verify x contains only hexidecimal characters
         """
-        if not self.constants.HEX_DIGITS.issuperset(x):
+        if not self.constants.HEX_DIGITS.issuperset(param):
             return False
         return True
 
@@ -67,13 +110,14 @@ class VerifyTypes:
         return False
 
     def is_ipv4_address(self, param):
-        """verify x is an ipv4 address"""
+        """verify param is an ipv4 address"""
+        if isinstance(param, str):
+            if len(param) > 15 or not self.constants.IPV4_ADDRESS_CHARS.issuperset(param):
+                return False
         try:
-            if isinstance(ipaddress.IPv4Address(param), ipaddress.IPv4Address):
-                return True
-            return False
-        except Exception as general_exception:
-            self.log.error(f"Got exception: {general_exception}"
+            return _cached_is_ipv4_address(param)
+        except TypeError:
+            # unhashable param
             return False
 
     def is_ipv4_address_with_prefix(self, param):
@@ -90,7 +134,7 @@ class VerifyTypes:
 
     def is_ipv4_network(self, param):
         try:
-            if isinstance(ipaddress.IPv4Address(param), ipaddress.IPv4Network):
+            if isinstance(ipaddress.IPv4Network(param), ipaddress.IPv4Network):
                 return True
             return False
         except Exception as general_exception:
@@ -103,7 +147,7 @@ class VerifyTypes:
                 f"bad ipv4 network mask.Expected an integer. Got {param}"
             )
             return False
-        if x not in self.constants.IPV4_MASK_RANGE:
+        if param not in self.constants.IPV4_MASK_RANGE:
             msg = f"bad ipv4 network mask {param}"
             msg += f"Should be an int {self.constants.IPV4_MASK_RANGE.start} >= x"
             msg += f" <= {self.constants.IPV4_MASK_RANGE.stop - 1}."
@@ -113,9 +157,9 @@ class VerifyTypes:
 
     def is_ipv4_unicast_address(self, param):
         """verify x is an ipv4 address"""
-        if not self.is_ipv4_address(x):
+        if not self.is_ipv4_address(param):
             return False
-        _ = ipaddress.IPv4Address(x)
+        _ = ipaddress.IPv4Address(param)
         bad_type = ""
         if _.is_multicast:
             bad_type = "is_multicast"
@@ -127,7 +171,7 @@ class VerifyTypes:
             bad_type = "is_unspecified"
         elif _.is_link_local:
             bad_type = "is_link_local"
-        elif re.search("\/", x):
+        elif re.search("\/", param):
             bad_type = "is_subnet"
         if bad_type != "":
             self.log.debug(f"{param} not a unicast ipv4 address -> {bad_type}")
@@ -137,7 +181,7 @@ class VerifyTypes:
     def is_ipv6_network(self, param):
         """verify param is a valid ipv6 network mask"""
         try:
-            if isinstance(ipaddress.IPv4Address(param), ipaddress.IPv6Network):
+            if isinstance(ipaddress.IPv6Network(param), ipaddress.IPv6Network):
                 return True
             return False
         except Exception as general_exception:
@@ -145,11 +189,11 @@ class VerifyTypes:
             return False
 
     def is_ipv6_mask(self, param):
-      """verify param is a valid ipv6 network mask"""
+        """verify param is a valid ipv6 network mask"""
         if not isinstance(param, int):
             self.log.debug(f"bad ipv6 network mask {param}. Should be an integer.")
             return False
-        if x not in self.constants.IPV6_MASK_RANGE:
+        if param not in self.constants.IPV6_MASK_RANGE:
             msg = f"bad ipv6 network mask {param}"
             msg += f"Should be an int {self.constants.IPV6_MASK_RANGE.start} >= x"
             msg += f" <= {self.constants.IPV6_MASK_RANGE.stop - 1}."
@@ -161,12 +205,15 @@ class VerifyTypes:
         """
         verify param is an ipv6 address
         """
+        if isinstance(param, str):
+            # scope id (e.g. fe80::1%eth0) may contain any characters
+            _address = param.split("%", 1)[0]
+            if ":" not in _address or not self.constants.IPV6_ADDRESS_CHARS.issuperset(_address):
+                return False
         try:
-            if isinstance(ipaddress.IPv6Address(param), ipaddress.IPv6Address):
-                return True
-            return False
-        except Exception as general_exception:
-            self.log.error(f"Got exception: {general_exception}")
+            return _cached_is_ipv6_address(param)
+        except TypeError:
+            # unhashable param
             return False
 
     def is_ipv6_link_local_address(self, param):
@@ -257,13 +304,9 @@ class VerifyTypes:
 
         For everything else, it returns False
         """
-        if self.constants.RE_MAC_COLON.search(param):
-            return True
-        if self.constants.RE_MAC_HYPHEN.search(param):
-            return True
-        if self.constants.RE_MAC_PERIOD.search(param):
-            return True
-        return False
+        if not isinstance(param, str) or len(param) not in (14, 17):
+            return False
+        return _cached_is_mac_address(param)
 
     def is_power(self, x, b):
         """
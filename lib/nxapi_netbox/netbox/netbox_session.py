@@ -32,3 +32,75 @@ def get_device_mgmt_ip(nb, device_name):
         )
         exit(1)
     return device.primary_ip4.address.split("/")[0]
+
+
+def get_device_role(nb, device_name):
+    """
+    return the slug of device_name's netbox device role, or 'na' if the device has no role.
+    netbox >= 3.6 renamed device_role to role, so both are checked.
+    """
+    device = nb.dcim.devices.get(name=device_name)
+    if device == None:
+        print(
+            "netbox_session.get_device_role: exiting. Device {} does not exist in netbox.".format(
+                device_name
+            )
+        )
+        exit(1)
+    role = getattr(device, "role", None)
+    if role == None:
+        role = getattr(device, "device_role", None)
+    if role == None:
+        return "na"
+    return role.slug
+
+
+def get_device_context(nb, device_name):
+    """
+    return a dict() containing device_name's netbox device record (including
+    config_context, site, role, platform, tags, custom_fields, etc), plus:
+
+        mgmt_ip - primary_ip4 without the prefix length, or 'na'
+
+    Used as the template context by general/config_template.py
+    """
+    device = nb.dcim.devices.get(name=device_name)
+    if device == None:
+        print(
+            "netbox_session.get_device_context: exiting. Device {} does not exist in netbox.".format(
+                device_name
+            )
+        )
+        exit(1)
+    context = dict(device)
+    try:
+        context["mgmt_ip"] = device.primary_ip4.address.split("/")[0]
+    except AttributeError:
+        context["mgmt_ip"] = "na"
+    return context
+
+
+def get_devices(nb):
+    """
+    return a dict(), keyed on netbox device name, of all netbox devices,
+    retrieved with a single query.  Each value is a dict() with keys:
+
+        mgmt_ip  - primary_ip4 without the prefix length, or None
+        serial   - serial number, or None
+        hostname - the hostname custom field, or None if not defined
+
+    Used by nxapi/nxapi_lldp_topology.py to build its neighbor resolution index.
+    """
+    devices = dict()
+    for device in nb.dcim.devices.all():
+        try:
+            mgmt_ip = device.primary_ip4.address.split("/")[0]
+        except AttributeError:
+            mgmt_ip = None
+        custom_fields = getattr(device, "custom_fields", None) or dict()
+        devices[device.name] = {
+            "mgmt_ip": mgmt_ip,
+            "serial": getattr(device, "serial", None) or None,
+            "hostname": custom_fields.get("hostname") or None,
+        }
+    return devices
@@ -21,11 +21,55 @@ switch# sh ip arp summary | json-pretty
         }
     }
 }
+
+NxapiArpTable() corresponds to the output provided by the following cli:
+
+show ip arp vrf all
+
+switch# show ip arp vrf all | json-pretty
+{
+    "TABLE_vrf": {
+        "ROW_vrf": [
+            {
+                "vrf-name-out": "default",
+                "cnt-total": "2",
+                "TABLE_adj": {
+                    "ROW_adj": [
+                        {
+                            "intf-out": "Vlan10",
+                            "ip-addr-out": "10.1.1.2",
+                            "time-stamp": "00:01:02",
+                            "mac": "0050.56a1.0c2e"
+                        },
+                        etc...
+                    ]
+                }
+            },
+            etc...
+        ]
+    }
+}
+
+Entries are stored in a compact AddressTable() (see general/address_table.py),
+and can be looked up by address, subnet, mac, or interface with a binary search.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.nxapi.nxapi_arp import NxapiArpTable
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+nx = NxapiArpTable('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+nx.refresh()
+for entry in nx.table.lookup_subnet('10.1.1.0/24', vrf='TENANT1'):
+    print(entry['address'], entry['vrf'], entry['mac'], entry['interface'])
 '''
-our_version = 106
+our_version = 107
 
 # standard libraries
 # local libraries
+from nxapi_netbox.general.address_table import AddressTable
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
 class NxapiArpSummary(NxapiBase):
@@ -176,3 +220,54 @@ class NxapiArpSummary(NxapiBase):
         except:
             return -1
 
+
+
+class NxapiArpTable(NxapiBase):
+    '''
+    Parse "show ip arp vrf all" (or "show ip arp vrf <self.vrf>" if
+    self.vrf_all is False) into self.table, an AddressTable().
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiArpTable'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.vrf_all = True
+        self.table = AddressTable(self.log, 4)
+
+    def refresh(self):
+        if self.vrf_all:
+            self.cli = 'show ip arp vrf all'
+        else:
+            self.cli = f"show ip arp vrf {self.vrf}"
+        self.show(self.cli)
+        self.make_table()
+
+    def make_table(self):
+        self.table.clear()
+        if not self._verify_body_length():
+            return
+        _vrf_list = self._get_table_row('vrf', self.body[0])
+        if _vrf_list == False:
+            return
+        for _vrf_dict in _vrf_list:
+            if 'vrf-name-out' not in _vrf_dict:
+                continue
+            if 'TABLE_adj' not in _vrf_dict:
+                continue
+            _adj_list = self._get_table_row('adj', _vrf_dict)
+            if _adj_list == False:
+                continue
+            for _adj_dict in _adj_list:
+                if not self.table.add(
+                    _adj_dict.get('ip-addr-out'),
+                    _vrf_dict['vrf-name-out'],
+                    _adj_dict.get('mac'),
+                    _adj_dict.get('intf-out', 'na'),
+                ):
+                    self.log.debug(f"{self.log_prefix} {self.hostname} skipping {_adj_dict}")
+        self.table.build()
+
+    @property
+    def entry_count(self):
+        return len(self.table)
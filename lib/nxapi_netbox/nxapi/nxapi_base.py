@@ -14,7 +14,7 @@ import re
 from nxapi_netbox.nxapi.nxapi_json import Nxapi
 from nxapi_netbox.general.util import file2list
 
-OUR_VERSION = 130
+OUR_VERSION = 131
 
 class NxapiBase(Nxapi):
     def __init__(self, username, password, mgmt_ip, _log):
@@ -132,6 +132,13 @@ class NxapiBase(Nxapi):
         self.log.warning(msg)
 
 
+    def _is_empty_or_comment(self, line):
+        '''
+        string-method equivalent of self.re_empty_line / self.re_comment_line
+        '''
+        _stripped = line.strip()
+        return _stripped == '' or _stripped[0] == '#'
+
     def configure_from_file(self):
         if self.config_file == None:
             self.log.error(
@@ -154,15 +161,7 @@ class NxapiBase(Nxapi):
             self.log.warning(msg)
             return
 
-        _list = []
-        for line in self.config_list:
-            m = self.re_empty_line.search(line)
-            if m:
-                continue
-            m = self.re_comment_line.search(line)
-            if m:
-                continue
-            _list.append(line)
+        _list = [line for line in self.config_list if not self._is_empty_or_comment(line)]
         self.log.debug(
             f"{self.log_prefix} {self.hostname} sending _list {_list}"
         )
@@ -68,7 +68,7 @@ ts_104     1090519042 Ethernet1/50  10.136.14.2     10.136.14.1     Up
 $ 
 
 '''
-our_version = 111
+our_version = 113
 
 # standard libraries
 # local libraries
@@ -666,3 +666,157 @@ class NxapiBfdNeighbors(NxapiBase):
 
 
 
+
+
+class NxapiBfdNeighborsDualStack(NxapiBfdNeighbors):
+    '''
+    Retrieves both ipv4 and ipv6 bfd sessions in a single request:
+
+    show bfd ipv4 neighbors detail ; show bfd ipv6 neighbors detail
+
+    self.info is keyed on local_disc (as with NxapiBfdNeighbors()) and contains
+    the sessions for both address families.  self.afi_dict[local_disc] is 'ipv4' or 'ipv6'.
+
+    Watch mode:
+
+    Each refresh() saves the (local_state, remote_state) of every session from the
+    previous refresh().  state_changes() returns only the sessions whose state changed
+    (or that appeared/disappeared) between the last two refresh() calls, so
+    short-interval monitoring only has to print/process transitions.
+
+    Synopsis:
+
+    bfd = NxapiBfdNeighborsDualStack('admin', 'password', mgmt_ip, log)
+    bfd.nxapi_init()
+    while True:
+        bfd.refresh()
+        for change in bfd.state_changes():
+            local_disc, afi, old_state, new_state = change
+            print(bfd.hostname, local_disc, afi, old_state, new_state)
+        time.sleep(0.5)
+
+    old_state/new_state are tuples (local_state, remote_state), or None if the
+    session did not exist in the previous/current refresh().
+
+    Sessions that disappeared are no longer in self.info, so use
+    session_summary(local_disc) to retrieve their intf and dest_addr, which
+    are served from the previous refresh() in that case.
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.afi_list = ['ipv4', 'ipv6']
+        self._afi_dict = dict()
+        self._previous_afi_dict = dict()
+        self._previous_info_dict = dict()
+        # None until the first refresh()
+        self._state_dict = None
+        self._previous_state_dict = None
+
+    def refresh(self):
+        _cli_list = [f"show bfd {_afi} neighbors detail" for _afi in self.afi_list]
+        self.cli = ' ; '.join(_cli_list)
+        self.show(self.cli)
+        self.make_info_dict()
+
+    def make_info_dict(self):
+        '''
+        from self.body (one body per afi in self.afi_list) populate:
+            self._info_dict[local_disc] = ROW_bfdNeighbor dict()
+            self._afi_dict[local_disc] = afi
+            self._state_dict[local_disc] = (local_state, remote_state)
+        '''
+        self._previous_info_dict = self._info_dict
+        self._info_dict = dict()
+        self._previous_afi_dict = self._afi_dict
+        self._afi_dict = dict()
+        self._previous_state_dict = self._state_dict
+        self._state_dict = dict()
+        if self.body_length != len(self.afi_list):
+            self.log.error('{} early return: unexpected body_length {}. Expected {}'.format(self.hostname, self.body_length, len(self.afi_list)))
+            return
+        for _afi, _body in zip(self.afi_list, self.body):
+            if 'TABLE_bfdNeighbor' not in _body:
+                self.log.debug('{} no {} bfd sessions'.format(self.hostname, _afi))
+                continue
+            _list = self._get_table_row('bfdNeighbor', _body)
+            if _list == False:
+                continue
+            for _dict in _list:
+                try:
+                    _local_disc = int(_dict['local_disc'])
+                except:
+                    self.log.error('{} skipping: unable to find [local_disc], or [local_disc] not convertable to int() _dict {}'.format(self.hostname, _dict))
+                    continue
+                self._info_dict[_local_disc] = _dict
+                self._afi_dict[_local_disc] = _afi
+                self._state_dict[_local_disc] = (_dict.get('local_state', 'na'), _dict.get('remote_state', 'na'))
+
+    def state_changes(self):
+        '''
+        return a list of tuples (local_disc, afi, old_state, new_state) for sessions whose
+        (local_state, remote_state) changed between the last two refresh() calls.
+
+        On the first refresh(), all sessions are returned with old_state None.
+        '''
+        _previous = self._previous_state_dict
+        if _previous is None:
+            _previous = dict()
+        _changes = list()
+        if self._state_dict is None:
+            return _changes
+        for _local_disc, _state in self._state_dict.items():
+            _old_state = _previous.get(_local_disc)
+            if _old_state != _state:
+                _changes.append((_local_disc, self._afi_dict[_local_disc], _old_state, _state))
+        for _local_disc in _previous.keys() - self._state_dict.keys():
+            _changes.append((_local_disc, self._previous_afi_dict.get(_local_disc, 'na'), _previous[_local_disc], None))
+        return _changes
+
+    def session_summary(self, local_disc):
+        '''
+        return a tuple (intf, dest_addr) for local_disc, from the last refresh(),
+        or from the previous refresh() if the session has since disappeared.
+        ('na', 'na') if local_disc is in neither.
+        '''
+        if local_disc in self._info_dict:
+            _dict = self._info_dict[local_disc]
+            _afi = self._afi_dict.get(local_disc)
+        elif local_disc in self._previous_info_dict:
+            _dict = self._previous_info_dict[local_disc]
+            _afi = self._previous_afi_dict.get(local_disc)
+        else:
+            return ('na', 'na')
+        if _afi == 'ipv6':
+            _dest_addr = _dict.get('dest_ipv6_addr', 'na')
+        else:
+            _dest_addr = _dict.get('dest_ip_addr', 'na')
+        return (_dict.get('intf', 'na'), _dest_addr)
+
+    @property
+    def afi_dict(self):
+        return self._afi_dict
+
+    @property
+    def afi(self):
+        try:
+            return self._afi_dict[self.local_disc]
+        except:
+            return 'na'
+
+    @property
+    def src_addr(self):
+        '''
+        src_ip_addr for ipv4 sessions, src_ipv6_addr for ipv6 sessions
+        '''
+        if self.afi == 'ipv6':
+            return self.src_ipv6_addr
+        return self.src_ip_addr
+
+    @property
+    def dest_addr(self):
+        '''
+        dest_ip_addr for ipv4 sessions, dest_ipv6_addr for ipv6 sessions
+        '''
+        if self.afi == 'ipv6':
+            return self.dest_ipv6_addr
+        return self.dest_ip_addr
@@ -13,7 +13,7 @@ TODO:
     - NxapiBgpNeighbors() verify vrf @property
 
 '''
-our_version = 118
+our_version = 119
 
 # standard libraries
 # local libraries
@@ -25,9 +25,9 @@ class NxapiBgpNeighbors(NxapiBase):
 
     All dict() are keyed on "neighbor" (ipv4) or "ipv4neighbor" (ipv6)
 
-    - self._peers_global contains the top-level per-neighbor info
+    - self._peer_global_dict contains the top-level per-neighbor info
         i.e. everything within [TABLE_neighbor][ROW_neighbor] that is not in a TABLE_
-        This can be retrieved with the @property self.peers_global
+        This can be retrieved with the @property self.peer_global
 
     - self._peers_dict contains ALL per-neighbor info
         i.e. everything within [TABLE_neighbor][ROW_neighbor], including all sub-tables
@@ -218,22 +218,40 @@ class NxapiBgpNeighbors(NxapiBase):
     def __init__(self, username, password, mgmt_ip, _log):
         super().__init__(username, password, mgmt_ip, _log)
         self._peers_dict = dict()
-        self._peer_global = dict()
+        self._peer_global_dict = dict()
+        self._nh_af_peer_dict = dict()
+        self._nh_saf_peer_dict = dict()
 
     def refresh(self):
+        '''
+        Only the peer index (self._peers_dict) is built here.  The per-peer
+        global and capextendednh dictionaries are decoded on first access
+        (see get_peer_global() and get_capextendednh()) and memoized until
+        the next refresh().
+        '''
         self.show(self.cli)
         self.make_peers_dict()
-        self.make_peer_global_dict() # order important here. make_peer_global_dict() is first...
-        self.make_per_peer_capextendednh_dicts() # ... make_per_peer_capextendednh_dicts() is second as we need peer state info in make_per_peer_capextendednh_dicts()
-
-        for _peer in self.peer_global:
-            self.log.debug('{} peer {} peer_global {}'.format(self.hostname, _peer, self.peer_global[_peer]))
-        for _peer in self._nh_af_peer_dict:
-            self.log.debug('{} peer {} capextendednhaf {}'.format(self.hostname, _peer, self._nh_af_peer_dict[_peer]))
-        for _peer in self._nh_saf_peer_dict:
-            self.log.debug('{} peer {} capextendednhsaf {}'.format(self.hostname, _peer, self._nh_saf_peer_dict[_peer]))
+        self._peer_global_dict = dict()
+        self._nh_af_peer_dict = dict()
+        self._nh_saf_peer_dict = dict()
 
-    def make_per_peer_capextendednh_dicts(self):
+    def _fix_ipv6_nh_af_name(self, _saf_value):
+        '''
+        For older images, ipv6 address is returned for capextendednh-af-name
+        we handle this by testing to see if af-name is an ipv6 address and, if so, change 
+        the value to 'IPv6 Unicast', which is what more recent images return
+        '''
+        if _saf_value in ['IPv4 Unicast', 'VPNv4 Unicast', 'IPv6 Unicast']:
+            # If the saf_value is legit, return immediately to avoid error logs from is_ipv6_address
+            return _saf_value
+        if self.verify.is_ipv6_address(_saf_value):
+            self.log.debug('{} older image. capextendednh-af-name {} is ipv6 address, change value to IPv6 Unicast'.format(
+                self.hostname,
+                _saf_value))
+            return 'IPv6 Unicast'
+        return _saf_value
+
+    def get_capextendednh(self, _peer):
         '''
         NXOS: version 7.0(3)I4(7)
 
@@ -267,66 +285,54 @@ class NxapiBgpNeighbors(NxapiBase):
                 }
             }
         }
-        '''
-        def __fix_ipv6_nh_af_name(_saf_value):
-            '''
-            For older images, ipv6 address is returned for capextendednh-af-name
-            we handle this by testing to see if af-name is an ipv6 address and, if so, change 
-            the value to 'IPv6 Unicast', which is what more recent images return
-            '''
-            if _saf_value in ['IPv4 Unicast', 'VPNv4 Unicast', 'IPv6 Unicast']:
-                # If the saf_value is legit, return immediately to avoid error logs from is_ipv6_address
-                return
-            if self.verify.is_ipv6_address(_saf_value):
-                self.log.debug('{} older image. {} is ipv6 address {}, change value to IPv6 Unicast'.format(
-                    self.hostname,
-                    _saf_key,
-                    _saf_value))
-                return 'IPv6 Unicast'
-            return _saf_value
 
-        # temporary dicts which are copied to self._nh_* if successfully populated
-        _nh_af_peer_dict = dict()
-        _nh_saf_peer_dict = dict()
-        # final dicts which receive the info from temporary dicts, if they are successfully populated
-        self._nh_af_peer_dict = dict()
-        self._nh_saf_peer_dict = dict()
-        for _peer in self._peers_dict:
-            _nh_af_peer_dict[_peer] = dict()
-            _nh_saf_peer_dict[_peer] = dict()
-            self._nh_af_peer_dict[_peer] = dict()
-            self._nh_saf_peer_dict[_peer] = dict()
-
-            _row_capextended_nh_af = self._get_table_row('capextendednhaf', self._peers_dict[_peer])
-            if _row_capextended_nh_af == False:
-                self.log.debug('{} skipping peer {}.'.format(self.hostname, _peer))
-                continue
-
-            for _capextended_nh_af_dict in _row_capextended_nh_af:
-                if 'capextendednh-afi' not in _capextended_nh_af_dict:
-                    self.log.debug('{} early return: key [capextendednh-afi] not found in _capextended_nh_af_dict {}'.format(self.hostname, _capextended_nh_af_dict))
-                    return
-                for _key in _capextended_nh_af_dict:
-                    if _key == 'capextendednh-afi':
-                        _afi = _capextended_nh_af_dict[_key]
-                        _nh_saf_peer_dict[_peer][_afi] = dict()
-                        _nh_af_peer_dict[_peer][_key] = _afi
-                        continue
-
-                    _row_capextended_nh_saf = self._get_table_row('capextendednhsaf', _capextended_nh_af_dict)
-                    if _row_capextended_nh_af == False:
-                        continue
+        Returns a tuple (nh_af_dict, nh_saf_dict) for _peer, decoding the
+        capextendednh tables on first access and memoizing the result.
 
-                    for _saf_dict in _row_capextended_nh_saf:
-                        for _saf_key in _saf_dict:
-                            _saf_value = _saf_dict[_saf_key]
-                            if _saf_key == 'capextendednh-af-name':
-                                _saf_value = __fix_ipv6_nh_af_name(_saf_value)
-                            _nh_saf_peer_dict[_peer][_afi][_saf_key] = _saf_value
-
-            self._nh_af_peer_dict[_peer] = _nh_af_peer_dict[_peer]
-            self._nh_saf_peer_dict[_peer] = _nh_saf_peer_dict[_peer]
+        nh_af_dict:  {'capextendednh-afi': afi}
+        nh_saf_dict: {afi: {'capextendednh-safi': safi, 'capextendednh-af-name': af_name}}
+        '''
+        if _peer in self._nh_af_peer_dict:
+            return self._nh_af_peer_dict[_peer], self._nh_saf_peer_dict[_peer]
+        _nh_af_dict = dict()
+        _nh_saf_dict = dict()
+        self._nh_af_peer_dict[_peer] = _nh_af_dict
+        self._nh_saf_peer_dict[_peer] = _nh_saf_dict
+        if _peer not in self._peers_dict:
+            return _nh_af_dict, _nh_saf_dict
+        if 'TABLE_capextendednhaf' not in self._peers_dict[_peer]:
+            return _nh_af_dict, _nh_saf_dict
+
+        _row_capextended_nh_af = self._get_table_row('capextendednhaf', self._peers_dict[_peer])
+        if _row_capextended_nh_af == False:
+            self.log.debug('{} skipping peer {}.'.format(self.hostname, _peer))
+            return _nh_af_dict, _nh_saf_dict
+
+        for _capextended_nh_af_dict in _row_capextended_nh_af:
+            if 'capextendednh-afi' not in _capextended_nh_af_dict:
+                self.log.debug('{} skipping: key [capextendednh-afi] not found in _capextended_nh_af_dict {}'.format(self.hostname, _capextended_nh_af_dict))
+                continue
+            _afi = _capextended_nh_af_dict['capextendednh-afi']
+            _nh_af_dict['capextendednh-afi'] = _afi
+            _nh_saf_dict[_afi] = dict()
+            _row_capextended_nh_saf = self._get_table_row('capextendednhsaf', _capextended_nh_af_dict)
+            if _row_capextended_nh_saf == False:
+                continue
+            for _saf_dict in _row_capextended_nh_saf:
+                for _saf_key in _saf_dict:
+                    _saf_value = _saf_dict[_saf_key]
+                    if _saf_key == 'capextendednh-af-name':
+                        _saf_value = self._fix_ipv6_nh_af_name(_saf_value)
+                    _nh_saf_dict[_afi][_saf_key] = _saf_value
+        return _nh_af_dict, _nh_saf_dict
 
+    def make_per_peer_capextendednh_dicts(self):
+        '''
+        decode the capextendednh tables for all peers.
+        Called by the capextendednhaf and capextendednhsaf @properties.
+        '''
+        for _peer in self._peers_dict:
+            self.get_capextendednh(_peer)
 
     def make_peers_dict(self):
         '''
@@ -339,39 +345,52 @@ class NxapiBgpNeighbors(NxapiBase):
         _list = self._get_table_row('neighbor', self.body[0])
         if _list == False:
             return
+        _peer_dict_key = self.peer_dict_key
         for _dict in _list:
-            if self.peer_dict_key not in _dict:
-                self.log.debug('{} skipping. key [{}] not in _dict {}'.format(self.hostname, self.peer_dict_key, _dict))
+            if _peer_dict_key not in _dict:
+                self.log.debug('{} skipping. key [{}] not in _dict {}'.format(self.hostname, _peer_dict_key, _dict))
                 continue
-            self._peers_dict[_dict[self.peer_dict_key]] = _dict
+            self._peers_dict[_dict[_peer_dict_key]] = _dict
+
+    def get_peer_global(self, _peer):
+        '''
+        Returns the top-level (non-TABLE_) items for _peer, building and
+        memoizing the dict() on first access.
+        '''
+        if _peer in self._peer_global_dict:
+            return self._peer_global_dict[_peer]
+        _dict = self._peers_dict.get(_peer, dict())
+        self._peer_global_dict[_peer] = {_key: _dict[_key] for _key in _dict if 'TABLE_' not in _key}
+        return self._peer_global_dict[_peer]
 
     def make_peer_global_dict(self):
-        self._peer_global_dict = dict()
+        '''
+        build the peer global dict() for all peers.
+        Called by the peer_global @property.
+        '''
         for _peer in self._peers_dict:
-            self.log.debug('{} peer -> {}'.format(self.hostname, _peer))
-            self._peer_global_dict[_peer] = dict()
-            for _key in self._peers_dict[_peer]:
-                if 'TABLE_' in _key:
-                    continue
-                self.log.debug('{} key {} value {}'.format(self.hostname, _key, self._peers_dict[_peer][_key]))
-                self._peer_global_dict[_peer][_key] = self._peers_dict[_peer][_key]
+            self.get_peer_global(_peer)
 
     # dict @properties
     # these return dictionaries created by NxapiBgpNeighbors()
+    # peer_global, capextendednhaf, and capextendednhsaf decode all peers on access
     @property
     def peers(self):
         return self._peers_dict
 
     @property
     def peer_global(self):
+        self.make_peer_global_dict()
         return self._peer_global_dict
 
     @property
     def capextendednhaf(self):
+        self.make_per_peer_capextendednh_dicts()
         return self._nh_af_peer_dict
 
     @property
     def capextendednhsaf(self):
+        self.make_per_peer_capextendednh_dicts()
         return self._nh_saf_peer_dict
 
     # VRF @properties (TODO, verify this)
@@ -389,21 +408,21 @@ class NxapiBgpNeighbors(NxapiBase):
     @property
     def capextendednh_afi(self):
         try:
-            return self._nh_af_peer_dict[self.peer]['capextendednh-afi']
+            return self.get_capextendednh(self.peer)[0]['capextendednh-afi']
         except:
             return 'na'
 
     @property
     def capextendednh_af_name(self):
         try:
-            return self._nh_saf_peer_dict[self.peer][self.capextendednh_afi]['capextendednh-af-name']
+            return self.get_capextendednh(self.peer)[1][self.capextendednh_afi]['capextendednh-af-name']
         except:
             return 'na'
 
     @property
     def capextendednh_safi(self):
         try:
-            return self._nh_saf_peer_dict[self.peer][self.capextendednh_afi]['capextendednh-safi']
+            return self.get_capextendednh(self.peer)[1][self.capextendednh_afi]['capextendednh-safi']
         except:
             return 'na'
 
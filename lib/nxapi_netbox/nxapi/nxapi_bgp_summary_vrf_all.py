@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+'''
+Name: nxapi_bgp_summary_vrf_all.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Collect bgp summary information for all vrfs and address-families in one request
+
+NxapiBgpUnicastSummary*() and NxapiBgpL2vpnEvpnSummary() are parameterized by
+a single vrf, so collecting peer info for a multi-tenant fabric costs one request
+per vrf, per address-family.  NxapiBgpSummaryVrfAll() sends the "vrf all" variant
+of each summary cli in a single NXAPI request (or, if instance.vrfs is set, the
+per-vrf cli for each vrf in the list) and indexes the results on (vrf, afi, peer).
+
+The JSON for each cli has the same structure as documented in
+nxapi_bgp_unicast_summary.py, except that ROW_vrf contains one entry per vrf:
+
+    "TABLE_vrf": {
+        "ROW_vrf": [
+            {
+                "vrf-name-out": "default",
+                "TABLE_af": { "ROW_af": { "TABLE_saf": { "ROW_saf": {
+                    "TABLE_neighbor": { "ROW_neighbor": [ {...}, {...} ] }
+                }}}}
+            },
+            {
+                "vrf-name-out": "TENANT1",
+                etc...
+            }
+        ]
+    }
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.nxapi.nxapi_bgp_summary_vrf_all import NxapiBgpSummaryVrfAll
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+bgp = NxapiBgpSummaryVrfAll('admin', 'mypassword', '192.168.1.1', log)
+bgp.nxapi_init()
+bgp.afis = ['ipv4', 'l2vpn_evpn']   # default: ['ipv4', 'ipv6', 'l2vpn_evpn']
+bgp.refresh()
+for key in bgp.info:   # key is a tuple (vrf, afi, peer)
+    bgp.key = key
+    print(bgp.vrf_name, bgp.afi_name, bgp.peer, bgp.state, bgp.prefixreceived)
+
+# O(1) lookup for a given peer
+info = bgp.lookup('TENANT1', 'ipv4', '10.1.1.1')
+
+# all peers within a vrf
+for key in bgp.vrf_index['TENANT1']:
+    print(key, bgp.info[key]['state'])
+
+See also: scripts/bgp_neighbor_prefix_received.py --vrf all
+'''
+our_version = 100
+
+# standard libraries
+# local libraries
+from nxapi_netbox.nxapi.nxapi_base import NxapiBase
+
+class NxapiBgpSummaryVrfAll(NxapiBase):
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiBgpSummaryVrfAll'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        # afi label -> cli template.  {} is replaced with the vrf name.
+        self.afi_cli = dict()
+        self.afi_cli['ipv4'] = 'show bgp ipv4 unicast summary vrf {}'
+        self.afi_cli['ipv6'] = 'show bgp ipv6 unicast summary vrf {}'
+        self.afi_cli['l2vpn_evpn'] = 'show bgp l2vpn evpn summary vrf {}'
+        self._afis = ['ipv4', 'ipv6', 'l2vpn_evpn']
+        self._vrfs = list()
+        self._key = None
+        self._info = dict()
+        self._vrf_index = dict()
+        self._afi_index = dict()
+        self._peer_index = dict()
+        self._saf_info = dict()
+
+    def make_cli_list(self):
+        '''
+        returns a list of tuples (vrf, afi, cli), in the order the cli are sent.
+
+        If self.vrfs is empty, one "vrf all" cli is generated per afi.
+        Else, one cli is generated per vrf, per afi.
+        '''
+        _vrfs = self.vrfs
+        if len(_vrfs) == 0:
+            _vrfs = ['all']
+        _cli_list = list()
+        for _afi in self.afis:
+            for _vrf in _vrfs:
+                _cli_list.append((_vrf, _afi, self.afi_cli[_afi].format(_vrf)))
+        return _cli_list
+
+    def refresh(self):
+        _cli_list = self.make_cli_list()
+        self.cli = ' ; '.join([_item[2] for _item in _cli_list])
+        self.show(self.cli)
+        self.log.debug(f"{self.log_prefix} {self.hostname} self.cli {self.cli}")
+        self.make_info_dict(_cli_list)
+
+    def make_info_dict(self, _cli_list):
+        '''
+        populates the following dictionaries from self.body:
+
+        self.info[(vrf, afi, peer)] = ROW_neighbor dict() for peer
+        self.saf_info[(vrf, afi)] = ROW_saf dict(), minus TABLE_neighbor
+        self.vrf_index[vrf] = list of (vrf, afi, peer) keys within vrf
+        self.afi_index[afi] = list of (vrf, afi, peer) keys within afi
+        self.peer_index[peer] = list of (vrf, afi, peer) keys for peer
+
+        self.body contains one entry per cli in _cli_list, in the same order.
+        '''
+        self._info = dict()
+        self._saf_info = dict()
+        self._vrf_index = dict()
+        self._afi_index = dict()
+        self._peer_index = dict()
+        if self.body_length != len(_cli_list):
+            msg = f"{self.log_prefix} {self.hostname} early return:"
+            msg += f" expected body_length {len(_cli_list)}."
+            msg += f" Got {self.body_length}"
+            self.log.error(msg)
+            return
+        for _body, (_vrf_requested, _afi, _cli) in zip(self.body, _cli_list):
+            if len(_body) == 0:
+                msg = f"{self.log_prefix} {self.hostname} skipping."
+                msg += f" No output for cli {_cli}"
+                self.log.debug(msg)
+                continue
+            _vrf_list = self._get_table_row('vrf', _body)
+            if _vrf_list == False:
+                continue
+            for _vrf_dict in _vrf_list:
+                self._add_vrf(_afi, _vrf_dict)
+
+    def _add_vrf(self, _afi, _vrf_dict):
+        if 'vrf-name-out' not in _vrf_dict:
+            msg = f"{self.log_prefix} {self.hostname} skipping."
+            msg += f" [vrf-name-out] not in _vrf_dict {_vrf_dict}"
+            self.log.debug(msg)
+            return
+        _vrf = _vrf_dict['vrf-name-out']
+        _af_list = self._get_table_row('af', _vrf_dict)
+        if _af_list == False:
+            return
+        for _af_dict in _af_list:
+            _saf_list = self._get_table_row('saf', _af_dict)
+            if _saf_list == False:
+                continue
+            for _saf_dict in _saf_list:
+                self._add_saf(_vrf, _afi, _saf_dict)
+
+    def _add_saf(self, _vrf, _afi, _saf_dict):
+        _saf_info = dict()
+        for _key in _saf_dict:
+            if 'TABLE_' in _key:
+                continue
+            _saf_info[_key] = _saf_dict[_key]
+        self._saf_info[(_vrf, _afi)] = _saf_info
+        if 'TABLE_neighbor' not in _saf_dict:
+            # vrf/afi is configured, but has no neighbors
+            return
+        _neighbor_list = self._get_table_row('neighbor', _saf_dict)
+        if _neighbor_list == False:
+            return
+        for _neighbor_dict in _neighbor_list:
+            if 'neighborid' not in _neighbor_dict:
+                msg = f"{self.log_prefix} {self.hostname} skipping."
+                msg += f" [neighborid] not in _neighbor_dict {_neighbor_dict}"
+                self.log.debug(msg)
+                continue
+            _peer = _neighbor_dict['neighborid']
+            _key = (_vrf, _afi, _peer)
+            self._info[_key] = _neighbor_dict
+            self._vrf_index.setdefault(_vrf, list()).append(_key)
+            self._afi_index.setdefault(_afi, list()).append(_key)
+            self._peer_index.setdefault(_peer, list()).append(_key)
+
+    def lookup(self, _vrf, _afi, _peer):
+        '''
+        return the ROW_neighbor dict() for (_vrf, _afi, _peer), or an empty dict()
+        '''
+        return self._info.get((_vrf, _afi, _peer), dict())
+
+    @property
+    def afis(self):
+        return self._afis
+    @afis.setter
+    def afis(self, _x):
+        if not self.verify.is_list(_x):
+            msg = f"{self.log_prefix} {self.hostname} Exiting."
+            msg += f" Expected a python list for afis. Got {_x}"
+            self.log.error(msg)
+            exit(1)
+        for _afi in _x:
+            if _afi not in self.afi_cli:
+                msg = f"{self.log_prefix} {self.hostname} Exiting."
+                msg += f" Unknown afi {_afi}. Expected one of {list(self.afi_cli.keys())}"
+                self.log.error(msg)
+                exit(1)
+        self._afis = _x
+
+    @property
+    def vrfs(self):
+        return self._vrfs
+    @vrfs.setter
+    def vrfs(self, _x):
+        '''
+        Optional list of vrfs to query.  If empty (the default), "vrf all" is used.
+        '''
+        if not self.verify.is_list(_x):
+            msg = f"{self.log_prefix} {self.hostname} Exiting."
+            msg += f" Expected a python list for vrfs. Got {_x}"
+            self.log.error(msg)
+            exit(1)
+        self._vrfs = _x
+
+    @property
+    def key(self):
+        return self._key
+    @key.setter
+    def key(self, _x):
+        '''
+        key is a tuple (vrf, afi, peer) and is used by the
+        convenience properties below to index into self.info
+        '''
+        if not self.verify.is_tuple(_x) or len(_x) != 3:
+            msg = f"{self.log_prefix} {self.hostname} ignored."
+            msg += f" Expected tuple (vrf, afi, peer) for key. Got {_x}"
+            self.log.debug(msg)
+            return
+        self._key = _x
+
+    @property
+    def info(self):
+        return self._info
+
+    @property
+    def saf_info(self):
+        return self._saf_info
+
+    @property
+    def vrf_index(self):
+        return self._vrf_index
+
+    @property
+    def afi_index(self):
+        return self._afi_index
+
+    @property
+    def peer_index(self):
+        return self._peer_index
+
+    @property
+    def vrf_names(self):
+        return sorted({_vrf for (_vrf, _afi) in self._saf_info})
+
+    @property
+    def vrf_name(self):
+        try:
+            return self.key[0]
+        except:
+            return 'na'
+    @property
+    def afi_name(self):
+        try:
+            return self.key[1]
+        except:
+            return 'na'
+    @property
+    def peer(self):
+        try:
+            return self.key[2]
+        except:
+            return 'na'
+
+    @property
+    def neighborversion(self):
+        try:
+            return self.info[self.key]['neighborversion']
+        except:
+            return 'na'
+    @property
+    def msgrecvd(self):
+        try:
+            return self.info[self.key]['msgrecvd']
+        except:
+            return 'na'
+    @property
+    def msgsent(self):
+        try:
+            return self.info[self.key]['msgsent']
+        except:
+            return 'na'
+    @property
+    def neighbortableversion(self):
+        try:
+            return self.info[self.key]['neighbortableversion']
+        except:
+            return 'na'
+    @property
+    def inq(self):
+        try:
+            return self.info[self.key]['inq']
+        except:
+            return 'na'
+    @property
+    def outq(self):
+        try:
+            return self.info[self.key]['outq']
+        except:
+            return 'na'
+    @property
+    def neighboras(self):
+        try:
+            return self.info[self.key]['neighboras']
+        except:
+            return 'na'
+    @property
+    def time(self):
+        try:
+            return self.info[self.key]['time']
+        except:
+            return 'na'
+    @property
+    def state(self):
+        try:
+            return self.info[self.key]['state']
+        except:
+            return 'na'
+    @property
+    def prefixreceived(self):
+        try:
+            return self.info[self.key]['prefixreceived']
+        except:
+            return 'na'
@@ -24,14 +24,71 @@ cfg.append('interface Eth1/1')
 cfg.append(' ip address 1.1.1.1/24')
 c.config_list = cfg
 c.commit_list()
+
+Large configs:
+
+commit_list() sends config_list in a single request, which risks HTTP 413
+(request entity too large) for large configs.  commit_chunks() sends
+config_list in chunks of at most max_chunk_commands lines and
+max_chunk_length characters.  Chunks are split only before lines that are
+not indented, so that sub-mode lines (e.g. ' ip address 1.1.1.1/24' under
+'interface Eth1/1') are sent in the same request as their parent.  If a chunk
+fails, the remaining chunks are not sent.
+
+The result of each line is recorded in self.line_results, in config_list order:
+
+    {
+        'line': <1-based index of the line in config_list>,
+        'cli': <the line>,
+        'code': <int() NXAPI result code, or HTTP status code if the request failed, or -1 if not sent>,
+        'msg': <NXAPI msg>,
+        'clierror': <NXAPI clierror, if any>
+    }
+
+c = NxapiConfig('myusername','mypassword','myip', log)
+c.config_file = '/tmp/myconfig.cfg'
+c.max_chunk_commands = 200
+if not c.commit_chunks():
+    for result in c.failed_lines:
+        print(result['line'], result['cli'], result['code'], result['clierror'])
+
+Many switches:
+
+NxapiConfigFleet() pushes a config (per-device, or the same config to all
+devices) to many switches concurrently with NxapiConfig.commit_chunks(),
+with at most max_workers switches in flight.  If stop_on_failure is True,
+the first failed switch stops the push: switches not yet started are
+skipped, and switches in progress send no further chunks.
+
+fleet = NxapiConfigFleet('myusername','mypassword', log)
+fleet.max_workers = 50
+fleet.stop_on_failure = True
+fleet.add_device('leaf_1', '192.168.1.1', cfg)
+fleet.add_device('leaf_2', '192.168.1.2', cfg)
+if not fleet.push():
+    for device, result in fleet.results.items():
+        print(device, result['status'], result['failed_lines'])
 '''
-our_version = 111
+our_version = 113
 
+# standard libraries
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+# local libraries
+from nxapi_netbox.general.util import file2list
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
 class NxapiConfig(NxapiBase):
     def __init__(self, username, password, mgmt_ip, _log):
         super().__init__(username, password, mgmt_ip, _log)
+        self.lib_name = 'NxapiConfig'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.max_chunk_commands = 200
+        self.max_chunk_length = 16384
+        self.line_results = list()
+        # number of chunks in the last commit_chunks()
+        self.chunk_count = 0
     def commit_file(self):
         '''
         configure dut from a file containing config commands
@@ -62,3 +119,216 @@ class NxapiConfig(NxapiBase):
                 self.result_code))
             return False
         return True
+
+    def make_blocks(self, config_list):
+        '''
+        return a list of blocks.  Each block is a list of tuples (line, cli),
+        starting with a line that is not indented, followed by the indented
+        lines under it.  Empty lines and comments are skipped.
+        '''
+        _blocks = list()
+        for _line, _cli in enumerate(config_list, 1):
+            if self._is_empty_or_comment(_cli):
+                continue
+            if len(_blocks) == 0 or not _cli[0].isspace():
+                _blocks.append(list())
+            _blocks[-1].append((_line, _cli))
+        return _blocks
+
+    def make_chunks(self, config_list):
+        '''
+        return a list of chunks.  Each chunk is a list of tuples (line, cli)
+        sent in a single request.  See the library header.
+        '''
+        _chunks = list()
+        _chunk = list()
+        _length = 0
+        for _block in self.make_blocks(config_list):
+            _block_length = sum([len(_cli) + len(' ; ') for _line, _cli in _block])
+            if len(_block) > self.max_chunk_commands or _block_length > self.max_chunk_length:
+                msg = f"{self.log_prefix} {self.hostname} block starting at line {_block[0][0]}"
+                msg += f" ({len(_block)} lines, {_block_length} characters) exceeds"
+                msg += f" max_chunk_commands {self.max_chunk_commands} or max_chunk_length {self.max_chunk_length}."
+                msg += " Sending it as a single chunk."
+                self.log.warning(msg)
+            if len(_chunk) != 0 and (
+                len(_chunk) + len(_block) > self.max_chunk_commands
+                or _length + _block_length > self.max_chunk_length
+            ):
+                _chunks.append(_chunk)
+                _chunk = list()
+                _length = 0
+            _chunk.extend(_block)
+            _length += _block_length
+        if len(_chunk) != 0:
+            _chunks.append(_chunk)
+        return _chunks
+
+    def _outputs(self):
+        try:
+            return self._convert_to_list(self.op['ins_api']['outputs']['output'])
+        except:
+            return list()
+
+    def _send_chunk(self, _chunk):
+        '''
+        send one chunk and append a result to self.line_results for each line in the chunk.
+        returns True if all lines in the chunk succeeded, else False
+        '''
+        self.op = dict()
+        self.result_codes = list()
+        self.config_file = None
+        self.config_list = [_cli for _line, _cli in _chunk]
+        _http_code = self.na_int
+        try:
+            self.conf()
+        except SystemExit:
+            # _send_nxapi() exits on non-200 responses, e.g. 413 for a chunk that is too large
+            try:
+                _http_code = self.response.status_code
+            except:
+                pass
+        _outputs = self._outputs()
+        _success = True
+        for _index, (_line, _cli) in enumerate(_chunk):
+            _result = {'line': _line, 'cli': _cli, 'code': _http_code, 'msg': 'na', 'clierror': ''}
+            if _index < len(self.result_codes) and _index < len(_outputs):
+                _result['code'] = self.result_codes[_index]
+                _result['msg'] = _outputs[_index].get('msg', 'na')
+                _result['clierror'] = _outputs[_index].get('clierror', '')
+            elif _http_code != self.na_int:
+                _result['msg'] = 'request failed'
+            else:
+                _result['code'] = self.RC_NOT_RETURNED_BY_DEVICE
+                _result['msg'] = 'no result returned by device'
+            if _result['code'] != self.RC_200_SUCCESS:
+                _success = False
+            self.line_results.append(_result)
+        return _success
+
+    def commit_chunks(self, stop_event=None):
+        '''
+        configure dut from self.config_list (or self.config_file, if set), in chunks.
+        See the library header.
+
+        stop_event, if not None, is a threading.Event().  Once it is set,
+        the remaining chunks are not sent.
+
+        returns True if all lines succeeded, else False
+        '''
+        if self.config_file != None:
+            self.config_list = file2list(self.config_file)
+        if not self.verify.is_list(self.config_list):
+            msg = f"{self.log_prefix} {self.hostname} Exiting:"
+            msg += f" Expected a python list. Got {self.config_list}"
+            self.log.error(msg)
+            exit(1)
+        _config_list = self.config_list
+        self.line_results = list()
+        _chunks = self.make_chunks(_config_list)
+        self.chunk_count = len(_chunks)
+        self.result_code = self.RC_200_SUCCESS
+        _success = True
+        for _chunk_number, _chunk in enumerate(_chunks, 1):
+            if not _success or (stop_event is not None and stop_event.is_set()):
+                for _line, _cli in _chunk:
+                    self.line_results.append({'line': _line, 'cli': _cli, 'code': self.na_int, 'msg': 'not sent', 'clierror': ''})
+                continue
+            self.log.debug(f"{self.log_prefix} {self.hostname} sending chunk {_chunk_number} of {len(_chunks)}, {len(_chunk)} lines")
+            if not self._send_chunk(_chunk):
+                _success = False
+        self.config_list = _config_list
+        for _result in self.failed_lines:
+            if _result['code'] == self.na_int and _result['msg'] == 'not sent':
+                continue
+            self.result_code = _result['code']
+            msg = f"{self.log_prefix} {self.mgmt_ip} {self.hostname} Error during conf:"
+            msg += f" line {_result['line']} cli {_result['cli']}"
+            msg += f" result code: {_result['code']} msg: {_result['msg']} {_result['clierror']}"
+            self.log.warning(msg)
+        return _success
+
+    @property
+    def failed_lines(self):
+        '''
+        results in self.line_results whose code is not 200, including lines that were not sent
+        '''
+        return [_result for _result in self.line_results if _result['code'] != self.RC_200_SUCCESS]
+
+
+class NxapiConfigFleet(object):
+    '''
+    Push configs to many switches concurrently.  See the library header.
+    '''
+    def __init__(self, username, password, log, argparse_instance=None):
+        self.lib_name = 'NxapiConfigFleet'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.log = log
+        self.username = username
+        self.password = password
+        # used to set the cookie and urllib prefs of each NxapiConfig() instance
+        self.argparse_instance = argparse_instance
+        self.max_workers = 20
+        self.stop_on_failure = False
+        self.max_chunk_commands = 200
+        self.max_chunk_length = 16384
+        self.timeout = 30
+        # device -> dict() with keys ip, config_list
+        self.devices = dict()
+        # device -> dict() with keys status, chunks, line_results, failed_lines
+        # status is one of success, failed, skipped
+        self.results = dict()
+        self._stop = Event()
+
+    def add_device(self, device, ip, config_list):
+        self.devices[device] = {'ip': ip, 'config_list': config_list}
+
+    def _result(self, status, chunks=0, line_results=None):
+        if line_results is None:
+            line_results = list()
+        _result = dict()
+        _result['status'] = status
+        _result['chunks'] = chunks
+        _result['line_results'] = line_results
+        _result['failed_lines'] = [_line for _line in line_results if _line['code'] != 200]
+        return _result
+
+    def push_device(self, device):
+        if self._stop.is_set():
+            return self._result('skipped')
+        c = NxapiConfig(self.username, self.password, self.devices[device]['ip'], self.log)
+        if self.argparse_instance != None:
+            c.set_cookie_prefs(self.argparse_instance)
+            c.set_urllib_prefs(self.argparse_instance)
+        c.load_cookies()
+        # avoid the extra request made by nxapi_init() to get the hostname
+        c.hostname = device
+        c.timeout = self.timeout
+        c.max_chunk_commands = self.max_chunk_commands
+        c.max_chunk_length = self.max_chunk_length
+        c.config_list = self.devices[device]['config_list']
+        try:
+            _success = c.commit_chunks(self._stop)
+        except Exception as e:
+            self.log.error(f"{self.log_prefix} {device} unable to push config. Exception: {e}")
+            _success = False
+        if not _success and self.stop_on_failure:
+            self._stop.set()
+        return self._result('success' if _success else 'failed', c.chunk_count, c.line_results)
+
+    def push(self):
+        '''
+        push to all devices.  returns True if all lines succeeded on all devices, else False
+        '''
+        self._stop.clear()
+        self.results = dict()
+        _devices = sorted(self.devices.keys())
+        if len(_devices) == 0:
+            return True
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(_devices))) as executor:
+            _results = list(executor.map(self.push_device, _devices))
+        self.results = dict(zip(_devices, _results))
+        if self._stop.is_set():
+            self.log.error(f"{self.log_prefix} push stopped after first failure")
+        return all([_result['status'] == 'success' for _result in self.results.values()])
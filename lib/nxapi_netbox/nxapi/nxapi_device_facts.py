@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+'''
+Name: nxapi_device_facts.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Collect static device facts (version, boot, modules, license host-id, system mode, inventory)
+             in one request per device, and serve them from a cache until the device reloads
+
+NxapiDeviceFacts() sends the following cli in a single NXAPI request:
+
+    show version ; show boot ; show module ; show license host-id ; show system mode ; show inventory
+
+and parses each output with the library that normally collects it.  The parsed
+facts are available as instances of those libraries, e.g.:
+
+    nx.version          NxapiVersion()          e.g. nx.version.nxos_ver_str
+    nx.boot             NxapiBoot()             e.g. nx.boot.sup_instance = 1; nx.boot.current_image
+    nx.module_info      NxapiModuleInfo()       e.g. nx.module_info.module = 1; nx.module_info.model
+    nx.license_hostid   NxapiLicenseHostid()    e.g. nx.license_hostid.host_id
+    nx.system_mode      NxapiSystemMode()       e.g. nx.system_mode.system_mode
+    nx.inventory        NxapiInventory()        e.g. nx.inventory.info
+
+If nx.cache is set to a DeviceFactsCache() (general/device_facts_cache.py),
+refresh() first sends only "show version", and derives the device's boot time
+from its uptime.  If the cache holds facts collected since that boot time,
+they are served from the cache (nx.from_cache == True), except the version
+fact, which is taken from the fresh "show version" body.  Otherwise (the device
+has reloaded since the facts were collected, or the device is not in the
+cache) the full request is sent and the cache is updated.  Devices not in the
+cache are collected with the full request directly, without the
+"show version" probe.
+
+Note that facts that change without a reload (e.g. the startup boot variable,
+or system mode) are served stale until the device reloads, unless
+cache.max_age is set.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.device_facts_cache import DeviceFactsCache
+from nxapi_netbox.nxapi.nxapi_device_facts import NxapiDeviceFacts
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+cache = DeviceFactsCache(log)
+cache.cache_file = '/tmp/device_facts.json'
+cache.load()
+nx = NxapiDeviceFacts('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+nx.cache = cache
+nx.refresh()
+print(nx.from_cache, nx.uptime, nx.version.nxos_ver_str, nx.license_hostid.host_id, nx.system_mode.system_mode)
+cache.save()
+
+See also: scripts/device_facts.py
+'''
+our_version = 101
+
+# standard libraries
+import time
+# local libraries
+from nxapi_netbox.nxapi.nxapi_base import NxapiBase
+from nxapi_netbox.nxapi.nxapi_boot import NxapiBoot
+from nxapi_netbox.nxapi.nxapi_inventory import NxapiInventory
+from nxapi_netbox.nxapi.nxapi_license_hostid import NxapiLicenseHostid
+from nxapi_netbox.nxapi.nxapi_module_info import NxapiModuleInfo
+from nxapi_netbox.nxapi.nxapi_system_mode import NxapiSystemMode
+from nxapi_netbox.nxapi.nxapi_version import NxapiVersion
+
+class NxapiDeviceFacts(NxapiBase):
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiDeviceFacts'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.timeout = 30
+        # list of tuples (fact name, cli), in the order the cli are sent
+        self.facts_cli = [
+            ('version', 'show version'),
+            ('boot', 'show boot'),
+            ('module_info', 'show module'),
+            ('license_hostid', 'show license host-id'),
+            ('system_mode', 'show system mode'),
+            ('inventory', 'show inventory'),
+        ]
+        # DeviceFactsCache() instance, or None
+        self.cache = None
+        # key of this device in self.cache
+        self.cache_key = mgmt_ip
+        # fact name -> body
+        self.bodies = dict()
+        self.from_cache = False
+        self.boot_time = -1
+        # show version body returned by probe_boot_time()
+        self.probe_body = None
+        self.version = NxapiVersion(username, password, mgmt_ip, _log)
+        self.boot = NxapiBoot(username, password, mgmt_ip, _log)
+        self.module_info = NxapiModuleInfo(username, password, mgmt_ip, _log)
+        self.license_hostid = NxapiLicenseHostid(username, password, mgmt_ip, _log)
+        self.system_mode = NxapiSystemMode(username, password, mgmt_ip, _log)
+        self.inventory = NxapiInventory(username, password, mgmt_ip, _log)
+
+    def _uptime_from_body(self, _body):
+        '''
+        seconds since the device booted, from a show version body, or -1
+        '''
+        try:
+            _uptime = int(_body['kern_uptm_days']) * 86400
+            _uptime += int(_body['kern_uptm_hrs']) * 3600
+            _uptime += int(_body['kern_uptm_mins']) * 60
+            _uptime += int(_body['kern_uptm_secs'])
+            return _uptime
+        except:
+            return -1
+
+    def _boot_time_from_body(self, _body):
+        _uptime = self._uptime_from_body(_body)
+        if _uptime == -1:
+            return -1
+        return time.time() - _uptime
+
+    def probe_boot_time(self):
+        '''
+        returns the device's boot time, from show version, or -1.
+        The show version body is kept in self.probe_body, or None
+        '''
+        self.probe_body = None
+        self.show('show version')
+        if not self._verify_body_length():
+            return -1
+        self.probe_body = self.body[0]
+        return self._boot_time_from_body(self.probe_body)
+
+    def collect(self):
+        '''
+        send the full request and populate self.bodies.  returns True on success
+        '''
+        self.cli = ' ; '.join([_cli for _name, _cli in self.facts_cli])
+        self.show(self.cli)
+        if self.body_length != len(self.facts_cli):
+            msg = f"{self.log_prefix} {self.hostname} early return:"
+            msg += f" expected body_length {len(self.facts_cli)}."
+            msg += f" Got {self.body_length}."
+            self.log.error(msg)
+            return False
+        self.bodies = dict()
+        for (_name, _cli), _body in zip(self.facts_cli, self.body):
+            self.bodies[_name] = _body
+        self.boot_time = self._boot_time_from_body(self.bodies['version'])
+        return True
+
+    def refresh(self):
+        self.from_cache = False
+        if self.cache is not None and self.cache.get(self.cache_key) is not None:
+            _boot_time = self.probe_boot_time()
+            if _boot_time != -1 and self.cache.valid(self.cache_key, _boot_time):
+                _entry = self.cache.get(self.cache_key)
+                self.bodies = dict(_entry['bodies'])
+                # show version changes without a reload (e.g. uptime), so serve the probe's body
+                self.bodies['version'] = self.probe_body
+                self.boot_time = _entry['boot_time']
+                self.from_cache = True
+                self.log.debug(f"{self.log_prefix} {self.hostname} serving facts from cache")
+                self.make_facts()
+                return
+        if not self.collect():
+            return
+        if self.cache is not None and self.boot_time != -1:
+            self.cache.put(self.cache_key, self.boot_time, self.bodies)
+        self.make_facts()
+
+    def make_facts(self):
+        '''
+        parse self.bodies with each fact's library
+        '''
+        for _name, _cli in self.facts_cli:
+            _nx = getattr(self, _name)
+            _nx.hostname = self.hostname
+            _nx.cli = _cli
+            _nx.body = [self.bodies.get(_name, dict())]
+        self.version.make_info_dict()
+        self.boot.make_info_dict()
+        self.module_info.make_modinfo()
+        self.module_info.make_modwwninfo()
+        self.module_info.make_modmacinfo()
+        self.module_info.make_moddiaginfo()
+        self.module_info.refreshed = True
+        self.license_hostid.make_info_dict()
+        self.system_mode.make_info_dict()
+        self.inventory.make_info_dict()
+        self.inventory.refreshed = True
+
+    @property
+    def uptime(self):
+        '''
+        seconds since the device booted, as of the last refresh(), or -1
+        '''
+        if self.boot_time == -1:
+            return -1
+        return int(time.time() - self.boot_time)
@@ -31,8 +31,18 @@ d.nxapi_init(cfg)
 d.refresh()
 print_dict(d.info, d.hostname)
 
+NxapiDirTargets() lists several targets with a single request:
+
+d = NxapiDirTargets('my_username', 'my_password', mgmt_ip, log)
+d.nxapi_init(cfg)
+d.targets = ['bootflash:', 'bootflash:/scripts', 'logflash:']
+d.refresh()
+for target in d.targets_info:
+    d.select(target)
+    print(target, d.free, len(d.files))
+
 '''
-our_version = 106
+our_version = 107
 
 # standard libraries
 # local libraries
@@ -156,7 +166,16 @@ class NxapiDir(NxapiBase):
 
         if not self._verify_body_length():
             return
-        _list = self._get_table_row('dir', self.body[0])
+        self.make_info_dict_from_body(self.body[0])
+
+    def make_info_dict_from_body(self, _body):
+        '''
+        populate self.info (see make_info_dict()) from _body, the JSON returned by one 'dir <target>'
+        '''
+        self.info = dict()
+        self.info['files'] = dict()
+        self.info['stats'] = dict()
+        _list = self._get_table_row('dir', _body)
         if _list == False:
             return
         for _dict in _list:
@@ -169,12 +188,12 @@ class NxapiDir(NxapiBase):
                 continue
             self.info['files'][_dict['fname']] = _dict
 
-        for _key in self.body[0]:
+        for _key in _body:
             if 'TABLE' in _key:
-                self.log.debug('skipping _key {} from self.body[0]'.format(_key))
+                self.log.debug('skipping _key {} from _body'.format(_key))
                 continue
-            self.log.debug('adding _key {} value {} from self.body[0]'.format(_key, self.body[0][_key]))
-            self.info['stats'][_key] = self.body[0][_key]
+            self.log.debug('adding _key {} value {} from _body'.format(_key, _body[_key]))
+            self.info['stats'][_key] = _body[_key]
 
 
     @property
@@ -224,3 +243,41 @@ class NxapiDir(NxapiBase):
     def target(self, _x):
         self._target = _x
 
+
+class NxapiDirTargets(NxapiDir):
+    '''
+    List several targets (flash devices or directories) with one request:
+
+    dir <target1> ; dir <target2> ; etc
+
+    Populates self.targets_info, keyed on target, whose values have the same
+    structure as NxapiDir().info.  Use select(target) to point self.info (and so
+    the files, stats, free, used, and total properties) at one target.
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.targets = ['bootflash:']
+        self.targets_info = dict()
+
+    def refresh(self):
+        self.targets_info = dict()
+        _cli_list = ['dir {}'.format(_target) for _target in self.targets]
+        self.cli = ' ; '.join(_cli_list)
+        self.show(self.cli)
+        if self.body_length != len(_cli_list):
+            self.log.error('{} early return: expected body_length {}. Got {}'.format(self.hostname, len(_cli_list), self.body_length))
+            return
+        for _target, _body in zip(self.targets, self.body):
+            self.make_info_dict_from_body(_body)
+            self.targets_info[_target] = self.info
+        self.refreshed = True
+
+    def select(self, target):
+        '''
+        point self.info at the info for target
+        '''
+        if target not in self.targets_info:
+            self.log.error('exiting. target {} not in self.targets_info. Expected one of {}'.format(target, list(self.targets_info.keys())))
+            exit(1)
+        self.target = target
+        self.info = self.targets_info[target]
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+'''
+Name: nxapi_evpn_overlay.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Collect nve peers, nve interface, and bgp l2vpn evpn summary in one request per VTEP,
+             and join the results across VTEPs into an overlay graph.
+
+NxapiEvpnOverlay() sends the following cli in a single NXAPI request:
+
+    show nve peers ; show nve interface nve1 detail ; show bgp l2vpn evpn summary
+
+and parses each body with the same structure documented in nxapi_nve.py and
+nxapi_bgp_l2vpn_evpn_summary.py.
+
+EvpnOverlayGraph() takes any number of refreshed NxapiEvpnOverlay() instances
+and builds the overlay adjacency using set operations:
+
+    - vteps: hostname -> set of VTEP addresses (nve primary-ip, and secondary-ip if vpc)
+    - owner: VTEP address -> set of hostnames (vpc VTEPs share their secondary-ip)
+    - edges: set of (hostname, hostname) for which hostname[0] lists one of hostname[1]'s
+             addresses as an nve peer
+    - one_sided(): edges whose reverse edge is missing, among VTEPs that were collected
+    - unknown_peers(): nve peers that do not belong to any collected VTEP
+    - missing_peers(): collected VTEPs that a VTEP does not list as nve peers.  Hosts
+                       without a VTEP address (e.g. spines) are ignored, and vpc peers
+                       (which share VTEP addresses) are not expected to peer with each other
+    - peers_not_up(): nve peers whose peer-state is not Up
+    - evpn_sessions_not_established(): bgp l2vpn evpn sessions not in Established state
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.nxapi.nxapi_evpn_overlay import NxapiEvpnOverlay, EvpnOverlayGraph
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+graph = EvpnOverlayGraph(log)
+for ip in ['192.168.1.1', '192.168.1.2']:
+    nx = NxapiEvpnOverlay('admin', 'mypassword', ip, log)
+    nx.nxapi_init()
+    nx.refresh()
+    graph.add(nx)
+graph.build()
+for edge in graph.one_sided():
+    print('one-sided', edge)
+
+See also: scripts/evpn_overlay.py
+'''
+our_version = 101
+
+# standard libraries
+# local libraries
+from nxapi_netbox.nxapi.nxapi_base import NxapiBase
+
+class NxapiEvpnOverlay(NxapiBase):
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiEvpnOverlay'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.nve_interface = 'nve1'
+        self.bgp_afi = '25'
+        self.bgp_safi = '70'
+        self._nve_peers = dict()
+        self._nve_interface_info = dict()
+        self._evpn_neighbors = dict()
+
+    def refresh(self):
+        _cli_list = list()
+        _cli_list.append('show nve peers')
+        _cli_list.append(f"show nve interface {self.nve_interface} detail")
+        _cli_list.append('show bgp l2vpn evpn summary')
+        self.cli = ' ; '.join(_cli_list)
+        self.show(self.cli)
+        self._nve_peers = dict()
+        self._nve_interface_info = dict()
+        self._evpn_neighbors = dict()
+        if self.body_length != len(_cli_list):
+            msg = f"{self.log_prefix} {self.hostname} early return:"
+            msg += f" expected body_length {len(_cli_list)}."
+            msg += f" Got {self.body_length}"
+            self.log.error(msg)
+            return
+        self.make_nve_peers_dict(self.body[0])
+        self.make_nve_interface_dict(self.body[1])
+        self.make_evpn_neighbors_dict(self.body[2])
+
+    def make_nve_peers_dict(self, _body):
+        '''
+        self.nve_peers[peer_ip] = ROW_nve_peers dict()
+
+        peer_ip is taken from peer-ip (ipv4 VTEP) or peer-ipv6 (ipv6 VTEP)
+        '''
+        if 'TABLE_nve_peers' not in _body:
+            self.log.debug(f"{self.log_prefix} {self.hostname} no nve peers")
+            return
+        _list = self._get_table_row('nve_peers', _body)
+        if _list == False:
+            return
+        for _dict in _list:
+            _peer = _dict.get('peer-ip', _dict.get('peer-ipv6'))
+            if _peer is None:
+                msg = f"{self.log_prefix} {self.hostname} skipping."
+                msg += f" peer-ip/peer-ipv6 key not in _dict {_dict}"
+                self.log.debug(msg)
+                continue
+            self._nve_peers[_peer] = _dict
+
+    def make_nve_interface_dict(self, _body):
+        '''
+        self.nve_interface_info = ROW_nve_if dict() for self.nve_interface
+        '''
+        if 'TABLE_nve_if' not in _body:
+            self.log.debug(f"{self.log_prefix} {self.hostname} no TABLE_nve_if")
+            return
+        _list = self._get_table_row('nve_if', _body)
+        if _list == False:
+            return
+        for _dict in _list:
+            if _dict.get('if-name', '').lower() == self.nve_interface.lower():
+                self._nve_interface_info = _dict
+                return
+
+    def make_evpn_neighbors_dict(self, _body):
+        '''
+        self.evpn_neighbors[neighborid] = ROW_neighbor dict() from the default vrf l2vpn evpn summary
+        '''
+        _vrf_list = self._get_table_row('vrf', _body)
+        if _vrf_list == False:
+            return
+        for _vrf_dict in _vrf_list:
+            _af_list = self._get_table_row('af', _vrf_dict)
+            if _af_list == False:
+                continue
+            for _af_dict in _af_list:
+                if str(_af_dict.get('af-id')) != self.bgp_afi:
+                    continue
+                _saf_list = self._get_table_row('saf', _af_dict)
+                if _saf_list == False:
+                    continue
+                for _saf_dict in _saf_list:
+                    if str(_saf_dict.get('safi')) != self.bgp_safi:
+                        continue
+                    if 'TABLE_neighbor' not in _saf_dict:
+                        continue
+                    _neighbor_list = self._get_table_row('neighbor', _saf_dict)
+                    if _neighbor_list == False:
+                        continue
+                    for _neighbor_dict in _neighbor_list:
+                        if 'neighborid' not in _neighbor_dict:
+                            continue
+                        self._evpn_neighbors[_neighbor_dict['neighborid']] = _neighbor_dict
+
+    @property
+    def nve_peers(self):
+        return self._nve_peers
+
+    @property
+    def nve_interface_info(self):
+        return self._nve_interface_info
+
+    @property
+    def evpn_neighbors(self):
+        return self._evpn_neighbors
+
+    @property
+    def vtep_addresses(self):
+        '''
+        set of addresses that other VTEPs use to reach this VTEP
+        (nve source-interface primary-ip and, for vpc VTEPs, secondary-ip)
+        '''
+        _addresses = set()
+        for _key in ['primary-ip', 'secondary-ip']:
+            _address = self._nve_interface_info.get(_key)
+            if _address in [None, '', '0.0.0.0', 'n/a']:
+                continue
+            _addresses.add(_address)
+        return _addresses
+
+    @property
+    def nve_if_state(self):
+        try:
+            return self._nve_interface_info['if-state']
+        except:
+            return 'na'
+
+
+class EvpnOverlayGraph(object):
+    '''
+    Join refreshed NxapiEvpnOverlay() instances into a fabric-wide overlay view.
+    See the library header for the structures provided.
+    '''
+    def __init__(self, log):
+        self.lib_name = 'EvpnOverlayGraph'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.log = log
+        self.collectors = dict()
+        self.vteps = dict()
+        self.owner = dict()
+        self.edges = set()
+
+    def add(self, nx):
+        '''
+        add a refreshed NxapiEvpnOverlay() instance
+        '''
+        self.collectors[nx.hostname] = nx
+
+    def build(self):
+        self.vteps = dict()
+        self.owner = dict()
+        self.edges = set()
+        for _hostname, _nx in self.collectors.items():
+            self.vteps[_hostname] = _nx.vtep_addresses
+            for _address in self.vteps[_hostname]:
+                self.owner.setdefault(_address, set()).add(_hostname)
+        for _hostname, _nx in self.collectors.items():
+            for _peer in _nx.nve_peers.keys() & self.owner.keys():
+                for _remote in self.owner[_peer] - {_hostname}:
+                    self.edges.add((_hostname, _remote))
+        msg = f"{self.log_prefix} vteps {len(self.vteps)}"
+        msg += f" addresses {len(self.owner)} edges {len(self.edges)}"
+        self.log.debug(msg)
+
+    def one_sided(self):
+        '''
+        set of (hostname, remote_hostname) where hostname sees remote_hostname as an nve peer,
+        but remote_hostname does not see hostname.
+        '''
+        _reverse = {(_b, _a) for (_a, _b) in self.edges}
+        return self.edges - _reverse
+
+    def unknown_peers(self):
+        '''
+        dict() keyed on hostname. Value is the set of nve peers that are not
+        addresses of any collected VTEP.
+        '''
+        _result = dict()
+        _known = self.owner.keys()
+        for _hostname, _nx in self.collectors.items():
+            _unknown = _nx.nve_peers.keys() - _known
+            if len(_unknown) != 0:
+                _result[_hostname] = _unknown
+        return _result
+
+    def missing_peers(self):
+        '''
+        dict() keyed on hostname. Value is the set of collected VTEP hostnames that
+        hostname does not list as nve peers.
+
+        Only hosts with at least one VTEP address are considered, and hosts whose
+        VTEP addresses overlap (vpc peers sharing the anycast secondary-ip) are not
+        expected to list each other.
+        '''
+        _result = dict()
+        _vteps = {_h: _a for _h, _a in self.vteps.items() if len(_a) != 0}
+        _adjacent = dict()
+        for (_a, _b) in self.edges:
+            _adjacent.setdefault(_a, set()).add(_b)
+        for _hostname, _addresses in _vteps.items():
+            _expected = {
+                _remote for _remote, _remote_addresses in _vteps.items()
+                if _remote != _hostname and _addresses.isdisjoint(_remote_addresses)
+            }
+            _missing = _expected - _adjacent.get(_hostname, set())
+            if len(_missing) != 0:
+                _result[_hostname] = _missing
+        return _result
+
+    def peers_not_up(self):
+        '''
+        list of tuples (hostname, peer, peer-state) for nve peers whose peer-state is not Up
+        '''
+        _result = list()
+        for _hostname, _nx in self.collectors.items():
+            for _peer, _dict in _nx.nve_peers.items():
+                if _dict.get('peer-state', 'na') != 'Up':
+                    _result.append((_hostname, _peer, _dict.get('peer-state', 'na')))
+        return _result
+
+    def evpn_sessions_not_established(self):
+        '''
+        list of tuples (hostname, neighborid, state) for bgp l2vpn evpn sessions not in Established state
+        '''
+        _result = list()
+        for _hostname, _nx in self.collectors.items():
+            for _neighbor, _dict in _nx.evpn_neighbors.items():
+                if _dict.get('state', 'na') != 'Established':
+                    _result.append((_hostname, _neighbor, _dict.get('state', 'na')))
+        return _result
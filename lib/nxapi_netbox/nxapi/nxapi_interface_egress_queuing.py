@@ -3,12 +3,20 @@
 Name: nxapi_interface_egress_queuing.py
 Author: Allen Robel (arobel@cisco.com)
 Description: Class for retrieving interface queuing counters
+
+NxapiInterfaceEgressQueuing() retrieves counters for one interface per request.
+
+NxapiInterfaceEgressQueuingBulk() retrieves counters for all interfaces with one
+request, or for a list of interfaces in batched requests.  See its docstring.
 '''
-our_version = 105
+our_version = 107
 
 # standard libraries
+from array import array
 from copy import deepcopy
+import time
 # local libraries
+from nxapi_netbox.general.util import batch_cli
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
 class NxapiInterfaceEgressQueuing(NxapiBase):
@@ -298,3 +306,191 @@ class NxapiInterfaceEgressQueuing(NxapiBase):
         return self.get_counter('wred_afd_tail_drop')
 
     
+
+
+class NxapiInterfaceEgressQueuingBulk(NxapiInterfaceEgressQueuing):
+    '''
+    Retrieve egress queuing counters for many interfaces per request.
+
+    If self.interfaces is None (the default), 'show queuing interface' is sent once,
+    which returns all interfaces.  Else, 'show queuing interface <interface>' is sent
+    for each interface in self.interfaces, batched with batch_cli() so that each
+    request contains at most self.max_batch_commands cli and self.max_batch_length
+    characters.
+
+    Each interface is identified by if_name_str in its ROW_queuing_interface:
+
+    switch# show queuing interface | json-pretty
+    {
+        "TABLE_module": {
+            "ROW_module": {
+                "module_number": "1",
+                "TABLE_queuing_interface": {
+                    "ROW_queuing_interface": [
+                        {
+                            "if_name_str": "Ethernet1/1",
+                            "TABLE_qosgrp_egress_stats": {
+                                etc...
+                            }
+                        },
+                        etc...
+                    ]
+                }
+            }
+        }
+    }
+
+    Counters are stored as a numeric table with one row per (interface, qos_group):
+
+        self.rows           list of (interface, qos_group), in the order returned by the switch
+        self.row_index      dict() (interface, qos_group) -> row
+        self.columns        list of column names, '<stat_type>_<unit>_<protocol>' e.g. tail_drop_packets_uc
+        self.values         dict() column -> array('d'), one value per row.  Missing values are NaN
+        self.timestamp      time.time() of the last refresh()
+
+    deltas() returns the per-interval change in each column since the previous
+    refresh() (or since a snapshot()).  Cumulative counters that decreased (cleared
+    or wrapped) are reported as their current value.  q_depth is a gauge, so its
+    delta is the change in queue depth over the interval.
+
+    Synopsis:
+
+    nx = NxapiInterfaceEgressQueuingBulk('admin', 'mypassword', '192.168.1.1', log)
+    nx.nxapi_init()
+    nx.refresh()
+    time.sleep(10)
+    nx.refresh()
+    interval, deltas = nx.deltas()
+    for row, (interface, qos_group) in enumerate(nx.rows):
+        print(interface, qos_group, deltas['tail_drop_packets_uc'][row])
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_name = 'NxapiInterfaceEgressQueuingBulk'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.interfaces = None
+        self.max_batch_commands = 10
+        self.max_batch_length = 4096
+        self.gauges = set(['q_depth'])
+        self.columns = list()
+        # column -> stat_type
+        self.column_stat_type = dict()
+        for stat_type in self.stat_types:
+            for unit in self.units:
+                for protocol in self.protocols:
+                    column = f"{stat_type}_{unit}_{protocol}"
+                    self.columns.append(column)
+                    self.column_stat_type[column] = stat_type
+        self._previous = None
+        self._clear()
+
+    def _clear(self):
+        self.rows = list()
+        self.row_index = dict()
+        self.values = dict()
+        for column in self.columns:
+            self.values[column] = array('d')
+        self.timestamp = None
+
+    def snapshot(self):
+        '''
+        return the current table as a tuple (timestamp, row_index, values)
+        '''
+        return (self.timestamp, self.row_index, self.values)
+
+    def make_cli_list(self):
+        if self.interfaces is None:
+            return ['show queuing interface']
+        return [f"show queuing interface {interface}" for interface in self.interfaces]
+
+    def refresh(self):
+        if self.timestamp is not None:
+            self._previous = self.snapshot()
+        self._clear()
+        self.timestamp = time.time()
+        for batch in batch_cli(self.make_cli_list(), self.max_batch_commands, self.max_batch_length):
+            self.cli = ' ; '.join(batch)
+            self.show(self.cli)
+            if self.body_length != len(batch):
+                msg = f"{self.log_prefix} {self.hostname} skipping batch:"
+                msg += f" expected body_length {len(batch)}."
+                msg += f" Got {self.body_length}"
+                self.log.error(msg)
+                continue
+            for body in self.body:
+                self.make_rows(body)
+
+    def make_rows(self, body):
+        '''
+        append one row per (interface, qos_group) in body, across all modules
+        '''
+        module_list = self._get_table_row('module', body)
+        if module_list == False:
+            return
+        for module_dict in module_list:
+            interface_list = self._get_table_row('queuing_interface', module_dict)
+            if interface_list == False:
+                continue
+            for interface_dict in interface_list:
+                if 'if_name_str' not in interface_dict:
+                    self.log.debug(f"{self.log_prefix} {self.hostname} skipping. if_name_str not found in {list(interface_dict.keys())}")
+                    continue
+                interface = interface_dict['if_name_str']
+                self._queuing_interface_dict = interface_dict
+                self._get_qosgrp_egress_stats_from_queuing_interface_dict()
+                for qos_group, stats in self._qosgrp_egress_stats_dict.items():
+                    self.add_row(interface, qos_group, stats)
+
+    def _to_float(self, x):
+        try:
+            return float(x)
+        except:
+            return float('nan')
+
+    def add_row(self, interface, qos_group, stats):
+        key = (interface, qos_group)
+        if key in self.row_index:
+            return
+        self.row_index[key] = len(self.rows)
+        self.rows.append(key)
+        for stat_type in self.stat_types:
+            for unit in self.units:
+                for protocol in self.protocols:
+                    try:
+                        value = stats[stat_type][unit][protocol]
+                    except:
+                        value = 'na'
+                    self.values[f"{stat_type}_{unit}_{protocol}"].append(self._to_float(value))
+
+    def deltas(self, previous=None):
+        '''
+        return a tuple (interval, deltas), where interval is the number of seconds
+        between previous (a tuple returned by snapshot()) and the current table, and
+        deltas is a dict() column -> array('d') aligned with self.rows.
+
+        If previous is None, the table from the prior refresh() is used.
+        Rows not present in previous are NaN.  Returns (0.0, dict()) if there is no previous table.
+        '''
+        if previous is None:
+            previous = self._previous
+        if previous is None:
+            return (0.0, dict())
+        _timestamp, _row_index, _values = previous
+        _old_rows = [_row_index.get(key, -1) for key in self.rows]
+        _deltas = dict()
+        for column in self.columns:
+            _gauge = self.column_stat_type[column] in self.gauges
+            _new = self.values[column]
+            _old = _values[column]
+            _delta = array('d')
+            for row, old_row in enumerate(_old_rows):
+                if old_row == -1:
+                    _delta.append(float('nan'))
+                    continue
+                _value = _new[row] - _old[old_row]
+                if _value < 0 and not _gauge:
+                    _value = _new[row]
+                _delta.append(_value)
+            _deltas[column] = _delta
+        return (self.timestamp - _timestamp, _deltas)
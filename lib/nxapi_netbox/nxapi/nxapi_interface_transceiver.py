@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-our_version = 101
+our_version = 103
 '''
 Name: nxapi_interface_transceiver.py
 Author: Allen Robel (arobel@cisco.com)
@@ -47,9 +47,62 @@ switch# show interface transceiver | json-pretty
         ]
     }
 }
+
+NxapiInterfaceTransceiverDetails() sends the following in a single request:
+
+    show interface transceiver ; show interface transceiver details
+
+and stores the digital optical monitoring (DOM) values and thresholds from the
+second body as numeric arrays, one row per (interface, lane).  Single-lane
+optics report these keys in ROW_interface.  Multi-lane optics report them in
+TABLE_lane/ROW_lane:
+
+    {
+        "interface": "Ethernet1/49",
+        "sfp": "present",
+        "TABLE_lane": {
+            "ROW_lane": [
+                {
+                    "lane_number": "1",
+                    "temperature": "33.63",
+                    "temp_alrm_hi": "75.00",
+                    "temp_alrm_lo": "-5.00",
+                    "temp_warn_hi": "70.00",
+                    "temp_warn_lo": "0.00",
+                    "voltage": "3.25",
+                    "volt_alrm_hi": "3.63",
+                    etc...
+                    "current": "6.60",
+                    "current_alrm_hi": "10.00",
+                    etc...
+                    "tx_pwr": "0.62",
+                    "tx_pwr_alrm_hi": "3.50",
+                    etc...
+                    "rx_pwr": "-1.54",
+                    "rx_pwr_alrm_hi": "3.50",
+                    etc...
+                },
+                etc...
+            ]
+        }
+    }
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.nxapi.nxapi_interface_transceiver import NxapiInterfaceTransceiverDetails
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+nx = NxapiInterfaceTransceiverDetails('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+nx.refresh()
+for interface, lane, metric, value, severity, threshold in nx.out_of_range():
+    print(interface, lane, metric, value, severity, threshold)
 '''
 # standard library
+from array import array
 from copy import deepcopy
+import math
 #local libraries
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
@@ -243,3 +296,154 @@ class NxapiInterfaceTransceiver(NxapiBase):
             return self.properties['info'][self.interface]['serialnum']
         except:
             return 'na'
+
+
+class NxapiInterfaceTransceiverDetails(NxapiBase):
+    '''
+    DOM values and thresholds for all transceivers on a switch.
+    See the library header for the JSON that is parsed.
+
+    self.rows     list of (interface, lane), one per row of the arrays below
+    self.values[metric]   array('d') of values
+    self.alarm_hi[metric], self.alarm_lo[metric], self.warn_hi[metric], self.warn_lo[metric]
+                  array('d') of thresholds
+
+    Missing or non-numeric values (e.g. "N/A") are stored as NaN, and are never out of range.
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiInterfaceTransceiverDetails'
+        self.log_prefix = f"{self.lib_name}_v{self.lib_version}"
+        # metric -> (value key, threshold key prefix)
+        self.metric_keys = dict()
+        self.metric_keys['temperature'] = ('temperature', 'temp')
+        self.metric_keys['voltage'] = ('voltage', 'volt')
+        self.metric_keys['current'] = ('current', 'current')
+        self.metric_keys['tx_pwr'] = ('tx_pwr', 'tx_pwr')
+        self.metric_keys['rx_pwr'] = ('rx_pwr', 'rx_pwr')
+        self.identity = dict()
+        self._clear()
+
+    def _clear(self):
+        self.rows = list()
+        self.values = dict()
+        self.alarm_hi = dict()
+        self.alarm_lo = dict()
+        self.warn_hi = dict()
+        self.warn_lo = dict()
+        for _metric in self.metric_keys:
+            self.values[_metric] = array('d')
+            self.alarm_hi[_metric] = array('d')
+            self.alarm_lo[_metric] = array('d')
+            self.warn_hi[_metric] = array('d')
+            self.warn_lo[_metric] = array('d')
+
+    def _to_float(self, x):
+        try:
+            return float(x)
+        except (TypeError, ValueError):
+            return math.nan
+
+    def refresh(self):
+        self.cli = 'show interface transceiver ; show interface transceiver details'
+        self.show(self.cli)
+        self.identity = dict()
+        self._clear()
+        if self.body_length != 2:
+            msg = f"{self.log_prefix} {self.hostname} early return:"
+            msg += f" expected body_length 2. Got {self.body_length}"
+            self.log.error(msg)
+            return
+        self.make_identity_dict(self.body[0])
+        self.make_arrays(self.body[1])
+
+    def make_identity_dict(self, _body):
+        '''
+        self.identity[interface] = ROW_interface dict() from "show interface transceiver",
+        for interfaces with a transceiver present
+        '''
+        _list = self._get_table_row('interface', _body)
+        if _list == False:
+            return
+        for _dict in _list:
+            if _dict.get('sfp') != 'present' or 'interface' not in _dict:
+                continue
+            self.identity[_dict['interface']] = _dict
+
+    def _add_row(self, _interface, _lane, _dict):
+        self.rows.append((_interface, _lane))
+        for _metric, (_value_key, _prefix) in self.metric_keys.items():
+            self.values[_metric].append(self._to_float(_dict.get(_value_key)))
+            self.alarm_hi[_metric].append(self._to_float(_dict.get(f"{_prefix}_alrm_hi")))
+            self.alarm_lo[_metric].append(self._to_float(_dict.get(f"{_prefix}_alrm_lo")))
+            self.warn_hi[_metric].append(self._to_float(_dict.get(f"{_prefix}_warn_hi")))
+            self.warn_lo[_metric].append(self._to_float(_dict.get(f"{_prefix}_warn_lo")))
+
+    def make_arrays(self, _body):
+        _list = self._get_table_row('interface', _body)
+        if _list == False:
+            return
+        for _dict in _list:
+            if _dict.get('sfp') != 'present' or 'interface' not in _dict:
+                continue
+            _interface = _dict['interface']
+            if 'TABLE_lane' not in _dict:
+                self._add_row(_interface, 1, _dict)
+                continue
+            _lane_list = self._get_table_row('lane', _dict)
+            if _lane_list == False:
+                continue
+            for _lane_dict in _lane_list:
+                _lane = self._to_float(_lane_dict.get('lane_number', 1))
+                if math.isnan(_lane):
+                    self.log.debug(f"{self.log_prefix} {self.hostname} {_interface} invalid lane_number {_lane_dict.get('lane_number')}. Using lane 1")
+                    _lane = 1
+                self._add_row(_interface, int(_lane), _lane_dict)
+
+    def out_of_range(self, level='warning', metrics=None):
+        '''
+        return a list of tuples (interface, lane, metric, value, severity, threshold)
+        for values outside their alarm thresholds (severity 'alarm') or, if level is
+        'warning', outside their warning thresholds (severity 'warning').
+
+        metrics is an optional list of metrics to evaluate (default: all)
+        '''
+        if level not in ['alarm', 'warning']:
+            msg = f"{self.log_prefix} {self.hostname} exiting."
+            msg += f" level must be one of alarm, warning. Got {level}"
+            self.log.error(msg)
+            exit(1)
+        if metrics is None:
+            metrics = list(self.metric_keys.keys())
+        _result = list()
+        for _metric in metrics:
+            # comparisons with NaN are False, so missing values and
+            # missing thresholds are never out of range
+            _columns = zip(
+                self.values[_metric],
+                self.alarm_hi[_metric],
+                self.alarm_lo[_metric],
+                self.warn_hi[_metric],
+                self.warn_lo[_metric],
+            )
+            for _row, (_value, _ahi, _alo, _whi, _wlo) in enumerate(_columns):
+                if _value > _ahi:
+                    _severity, _threshold = 'alarm', _ahi
+                elif _value < _alo:
+                    _severity, _threshold = 'alarm', _alo
+                elif level == 'alarm':
+                    continue
+                elif _value > _whi:
+                    _severity, _threshold = 'warning', _whi
+                elif _value < _wlo:
+                    _severity, _threshold = 'warning', _wlo
+                else:
+                    continue
+                _interface, _lane = self.rows[_row]
+                _result.append((_interface, _lane, _metric, _value, _severity, _threshold))
+        return _result
+
+    @property
+    def optics_count(self):
+        return len(self.identity)
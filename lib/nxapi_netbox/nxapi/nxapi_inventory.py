@@ -119,11 +119,11 @@ ip           hostname           serial       name            product_id
 192.168.1.1  cvd-1311-leaf      N/A          Fan 3           NXA-FAN-30CFM-B    Nexus9000 C93180YC-EX chassis Fan Module
 192.168.1.1  cvd-1311-leaf      N/A          Fan 4           NXA-FAN-30CFM-B    Nexus9000 C93180YC-EX chassis Fan Module
 '''
-our_version = 105
+our_version = 106
 
 # standard libraries
-import re
 # local libraries
+from nxapi_netbox.general.util import strip_nxos_quoting, strip_nxos_quoting_dict
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
 class NxapiInventory(NxapiBase):
@@ -137,16 +137,9 @@ class NxapiInventory(NxapiBase):
         self.refreshed = False
 
     def clean_value(self,v):
-        v = re.sub("'", '', v)
-        v = re.sub('"', '', v)
-        return v
+        return strip_nxos_quoting(v)
     def clean_dict(self, d):
-        new_dict = dict()
-        for key in d:
-            new_key = re.sub("'", '', key)
-            new_key = re.sub('"', '', key)
-            new_dict[new_key] = self.clean_value(d[key])
-        return new_dict
+        return strip_nxos_quoting_dict(d)
 
     def make_info_dict(self):
         '''
@@ -27,11 +27,26 @@ for neighbor in nx.info:
         nx.mac,
         nx.pref,
         nx.owner))
+
+NxapiIpv6NeighborTable() parses "show ipv6 neighbor vrf all" (same JSON structure
+as above, with one ROW_vrf per vrf) into a compact AddressTable()
+(see general/address_table.py), which can be looked up by address, subnet,
+mac, or interface with a binary search.  Addresses are not validated with
+VerifyTypes() (they are packed with socket.inet_pton() instead), and no
+per-address dict() is kept.
+
+from nxapi_netbox.nxapi.nxapi_ipv6_nd import NxapiIpv6NeighborTable
+nx = NxapiIpv6NeighborTable('myusername', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+nx.refresh()
+for entry in nx.table.lookup_mac('00f2.8bfd.4ebf'):
+    print(entry['address'], entry['vrf'], entry['interface'])
 '''
-our_version = 103
+our_version = 104
 
 # standard libraries
 # local libraries
+from nxapi_netbox.general.address_table import AddressTable
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
 class NxapiIpv6Neighbor(NxapiBase):
@@ -249,3 +264,62 @@ class NxapiIpv6Neighbor(NxapiBase):
             self.log.error('early return: ipv6_addr must be a valid ipv6 address.  Got {}'.format(x))
             return
         self._ipv6_addr = x
+
+
+class NxapiIpv6NeighborTable(NxapiBase):
+    '''
+    Parse "show ipv6 neighbor vrf all" (or "show ipv6 neighbor vrf <self.vrf>" if
+    self.vrf_all is False) into self.table, an AddressTable().
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiIpv6NeighborTable'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.vrf_all = True
+        self.table = AddressTable(self.log, 6)
+
+    def refresh(self):
+        if self.vrf_all:
+            self.cli = 'show ipv6 neighbor vrf all'
+        else:
+            self.cli = f"show ipv6 neighbor vrf {self.vrf}"
+        self.show(self.cli)
+        self.make_table()
+
+    def make_table(self):
+        self.table.clear()
+        if not self._verify_body_length():
+            return
+        _vrf_list = self._get_table_row('vrf', self.body[0])
+        if _vrf_list == False:
+            return
+        for _vrf_dict in _vrf_list:
+            if 'vrf-name-out' not in _vrf_dict:
+                continue
+            if 'TABLE_afi' not in _vrf_dict:
+                continue
+            _afi_list = self._get_table_row('afi', _vrf_dict)
+            if _afi_list == False:
+                continue
+            for _afi_dict in _afi_list:
+                if _afi_dict.get('afi') != 'ipv6':
+                    continue
+                if 'TABLE_adj' not in _afi_dict:
+                    continue
+                _adj_list = self._get_table_row('adj', _afi_dict)
+                if _adj_list == False:
+                    continue
+                for _adj_dict in _adj_list:
+                    if not self.table.add(
+                        _adj_dict.get('ipv6-addr'),
+                        _vrf_dict['vrf-name-out'],
+                        _adj_dict.get('mac'),
+                        _adj_dict.get('intf-out', 'na'),
+                    ):
+                        self.log.debug(f"{self.log_prefix} {self.hostname} skipping {_adj_dict}")
+        self.table.build()
+
+    @property
+    def entry_count(self):
+        return len(self.table)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # Nxapi() = nxapi_json.py
-our_version = 143
+our_version = 145
 '''
 Name: nxapi_json.py
 Author: Allen Robel (arobel@cisco.com)
@@ -43,6 +43,8 @@ class Nxapi(object):
         self.verify = VerifyTypes(self.log)
 
         self._https_server_port = 443
+        # set on first access of self.url, reset if dut or https_server_port change
+        self._url = None
         self.properties = dict()
         self.properties['config_list'] = None
         self.properties['config_file'] = None
@@ -139,6 +141,7 @@ class Nxapi(object):
             self.log.error('exiting. expected int() for https_server_port. Got {}.'.format(x))
             exit(1)
         self._https_server_port = x
+        self._url = None
 
     @property
     def config_list(self):
@@ -161,6 +164,20 @@ class Nxapi(object):
         call this prior to calling nxapi_init() to change dut
         '''
         self._dut = x
+        self._url = None
+
+    @property
+    def url(self):
+        '''
+        NXAPI url for self.dut.  Whether dut is an ipv4 address (or hostname)
+        or an ipv6 address is decided once per instance, rather than per request.
+        '''
+        if self._url is None:
+            if self.verify.is_ipv6_address(self.dut):
+                self._url = 'https://[{}]:{}/ins'.format(self.dut, self.https_server_port)
+            else:
+                self._url = 'https://{}:{}/ins'.format(self.dut, self.https_server_port)
+        return self._url
 
     def nxapi_init(self, argparse_instance=None):
         '''
@@ -374,10 +391,6 @@ class Nxapi(object):
         headers={'content-type':'application/{}'.format(self.payload_type)}
         try:
             self.log.debug('POST with self.cookies {}'.format(self.cookies))
-            if self.verify.is_ipv4_address(self.dut):
-                self.url = 'https://{}:{}/ins'.format(self.dut, self.https_server_port)
-            else:
-                self.url = 'https://[{}]:{}/ins'.format(self.dut, self.https_server_port)
 
             self.response = self.session.post(
                                                 self.url,
@@ -565,6 +578,87 @@ class Nxapi(object):
         self.log.debug('sending nxapi for _cmd {}.  Payload {}'.format(_cmd, self.payload))
         self._send_nxapi()
 
+    def show_chunked(self, _cmd=None, max_chunks=1000):
+        '''
+        show_chunked() is an alternative to show() for cli with very large output
+        (e.g. show mac address-table on a large fabric).
+
+        NXAPI is asked to return the output in chunks (chunk = 1).  Each response
+        contains a partial JSON document in body, and a sid which is sent in the
+        next request to retrieve the next chunk.  The final chunk carries sid "eoc".
+        The chunks are joined and decoded, so that self.body has the same structure
+        as after show().
+
+        Only a single cli is supported (NXAPI does not chunk multi-command input).
+        '''
+        _method_name = 'show_chunked'
+        if _cmd == None:
+            _cmd = self.cli
+        if type(_cmd) != type(str()):
+            self.log.error('{}.{}: Exiting. _cmd must be type str(). Got: type {} for _cmd {}'.format(
+                self.lib_name,
+                _method_name,
+                type(_cmd),
+                _cmd))
+            exit(1)
+        _chunks = list()
+        _sid = "1"
+        for _chunk_num in range(max_chunks):
+            self.payload = {
+                "ins_api": {
+                    "version": "1.0",
+                    "type": "cli_show",
+                    "chunk": "1",       # chunk results
+                    "sid": _sid,        # session ID, updated from each response
+                    "input": _cmd,
+                    "output_format": "json"
+                }
+            }
+            self.payload_type = self.PAYLOAD_JSON
+            self.log.debug('{}.{}: sending chunk {} sid {} for _cmd {}'.format(
+                self.lib_name,
+                _method_name,
+                _chunk_num,
+                _sid,
+                _cmd))
+            self.body = list()
+            self._send_nxapi()
+            if len(self.body) != 1:
+                self.log.warning('{}.{}: {} early return. Expected one body per chunk. Got {}'.format(
+                    self.lib_name,
+                    _method_name,
+                    self.hostname,
+                    len(self.body)))
+                self.body = [dict()]
+                return
+            if type(self.body[0]) != type(str()):
+                # the device returned the complete (unchunked) output
+                return
+            _chunks.append(self.body[0])
+            _sid = self.op['ins_api'].get('sid', 'eoc')
+            if _sid == 'eoc':
+                break
+        else:
+            self.log.warning('{}.{}: {} output truncated. Reached max_chunks {}'.format(
+                self.lib_name,
+                _method_name,
+                self.hostname,
+                max_chunks))
+        _text = ''.join(_chunks)
+        if _text.strip() == '':
+            self.body = [dict()]
+            return
+        try:
+            self.body = [json.loads(_text)]
+        except Exception as e:
+            self.log.warning('{}.{}: {} unable to decode {} chunks. Error: {}'.format(
+                self.lib_name,
+                _method_name,
+                self.hostname,
+                len(_chunks),
+                e))
+            self.body = [dict()]
+
     def conf(self):
         '''
         conf() is the main user-facing method for issuing configuration cli and getting response(s)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+'''
+Name: nxapi_lldp_topology.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Build a fabric-wide lldp adjacency graph from NxapiLldpNeighbors() sweeps
+
+LldpTopology() merges the per-switch NxapiLldpNeighbors().info dictionaries
+into a single adjacency dict() keyed on (device, port):
+
+    topology.adjacency[(device, port)] = {
+        'remote_device': <device name, or None if chassis_id/mgmt_addr could not be resolved>,
+        'remote_port': <remote port>,
+        'chassis_id': <chassis_id as advertised by the neighbor>,
+        'mgmt_addr': <mgmt_addr as advertised by the neighbor>
+    }
+
+Ports are normalized to their long form (e.g. Eth1/1 -> Ethernet1/1) so that the
+local (l_port_id) and remote (port_id) names compare equal.
+
+Neighbor resolution uses an index built once from netbox for all devices with
+add_netbox_devices() (see get_devices() in netbox/netbox_session.py), keyed on
+the device name, primary ip, serial number and, if defined in netbox, the
+hostname (with and without domain).  The index is persisted with the graph, so
+it does not need to be rebuilt on each run.
+
+add_device() records each swept device.  The NX-OS hostname learned from the
+sweep is added to the index only for devices that netbox does not know (e.g.
+devices added to netbox after the index was built), and never overrides a
+netbox-derived key.
+
+Link symmetry is checked with a hash join: each (device, port) -> (remote_device, remote_port)
+entry is looked up in reverse in adjacency, which is O(1) per link.
+
+The graph, and the device index, can be persisted to a JSON file.  On update(), a digest of the device's
+lldp neighbors is compared with the persisted digest, and devices whose neighbors
+have not changed are skipped.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import get_devices
+from nxapi_netbox.nxapi.nxapi_lldp import NxapiLldpNeighbors
+from nxapi_netbox.nxapi.nxapi_lldp_topology import LldpTopology
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+# nb is a pynetbox instance, see netbox/netbox_session.py
+topology = LldpTopology(log)
+topology.cache_file = '/tmp/lldp_topology.json'
+topology.load()
+if len(topology.netbox_devices) == 0:
+    topology.add_netbox_devices(get_devices(nb))
+for device, ip in [('leaf_1', '192.168.1.1'), ('spine_1', '192.168.1.2')]:
+    lldp = NxapiLldpNeighbors('admin', 'mypassword', ip, log)
+    lldp.nxapi_init()
+    lldp.refresh()
+    topology.add_device(device, ip, lldp.hostname)
+    topology.update(device, lldp.info)
+topology.save()
+for (device, port), remote in topology.asymmetric_links().items():
+    print(device, port, remote)
+
+See also: scripts/lldp_topology.py
+'''
+our_version = 101
+
+# standard libraries
+import hashlib
+import json
+import re
+# local libraries
+from nxapi_netbox.general.util import file_exists
+
+class LldpTopology(object):
+    def __init__(self, log):
+        self.lib_name = 'LldpTopology'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.log = log
+        self.cache_file = None
+        # (device, port) -> dict(), see library header
+        self.adjacency = dict()
+        # device -> digest of the lldp neighbors last merged for device
+        self.digests = dict()
+        # device -> mgmt_ip
+        self.devices = dict()
+        # device name, mgmt ip, serial, hostname, short hostname -> device name
+        self.device_index = dict()
+        # devices whose index keys were built from netbox
+        self.netbox_devices = set()
+        self.re_eth = re.compile(r'^(?:Eth|Ethernet)(\d.*)$', re.IGNORECASE)
+
+    def normalize_port(self, port):
+        '''
+        return port in its long form, e.g. Eth1/1 -> Ethernet1/1
+        '''
+        match = self.re_eth.search(str(port))
+        if match:
+            return f"Ethernet{match.group(1)}"
+        return port
+
+    def _index_key(self, x):
+        return str(x).lower()
+
+    def _index_keys(self, device, mgmt_ip, hostname=None, serial=None):
+        _keys = [device]
+        for _key in [mgmt_ip, serial]:
+            if _key is not None:
+                _keys.append(_key)
+        if hostname is not None:
+            _keys.append(hostname)
+            _keys.append(str(hostname).split('.')[0])
+        return _keys
+
+    def add_netbox_devices(self, devices):
+        '''
+        (re)build the index used to resolve lldp chassis_id/mgmt_addr to a device name
+        from devices, a dict() as returned by netbox_session.get_devices()
+        '''
+        self.device_index = dict()
+        self.netbox_devices = set()
+        for _device, _item in devices.items():
+            _keys = self._index_keys(_device, _item.get('mgmt_ip'), _item.get('hostname'), _item.get('serial'))
+            for _key in _keys:
+                self.device_index[self._index_key(_key)] = _device
+            self.netbox_devices.add(_device)
+        self.log.debug(f"{self.log_prefix} indexed {len(self.netbox_devices)} netbox devices")
+
+    def add_device(self, device, mgmt_ip, hostname=None):
+        '''
+        record a swept device.  If netbox does not know device, add its name, mgmt_ip
+        and hostname to the index, without overriding keys built from netbox.
+        '''
+        self.devices[device] = mgmt_ip
+        if device in self.netbox_devices:
+            return
+        self.log.debug(f"{self.log_prefix} {device} not in netbox index. indexing swept hostname {hostname}")
+        for _key in self._index_keys(device, mgmt_ip, hostname):
+            self.device_index.setdefault(self._index_key(_key), device)
+
+    def resolve(self, chassis_id, mgmt_addr):
+        '''
+        return the device name for a neighbor advertising chassis_id and mgmt_addr, or None
+        '''
+        for _key in [chassis_id, str(chassis_id).split('.')[0], mgmt_addr]:
+            _device = self.device_index.get(self._index_key(_key))
+            if _device is not None:
+                return _device
+        return None
+
+    def digest(self, info):
+        '''
+        return a digest of an NxapiLldpNeighbors().info dict()
+        '''
+        _rows = sorted(
+            (str(_port), str(info[_port].get('chassis_id')), str(info[_port].get('port_id')), str(info[_port].get('mgmt_addr')))
+            for _port in info
+        )
+        return hashlib.sha1(json.dumps(_rows).encode('utf-8')).hexdigest()
+
+    def update(self, device, info):
+        '''
+        merge NxapiLldpNeighbors().info for device into self.adjacency.
+
+        returns True if device's adjacencies changed, False if the device was skipped
+        because its lldp neighbors have not changed since the last update().
+        '''
+        _digest = self.digest(info)
+        if self.digests.get(device) == _digest:
+            self.log.debug(f"{self.log_prefix} {device} unchanged. skipping.")
+            return False
+        for _key in [_key for _key in self.adjacency if _key[0] == device]:
+            del self.adjacency[_key]
+        for _port in info:
+            _chassis_id = info[_port].get('chassis_id', 'na')
+            _mgmt_addr = info[_port].get('mgmt_addr', 'na')
+            self.adjacency[(device, self.normalize_port(_port))] = {
+                'remote_device': self.resolve(_chassis_id, _mgmt_addr),
+                'remote_port': self.normalize_port(info[_port].get('port_id', 'na')),
+                'chassis_id': _chassis_id,
+                'mgmt_addr': _mgmt_addr,
+            }
+        self.digests[device] = _digest
+        return True
+
+    def reresolve(self):
+        '''
+        re-resolve remote_device for all adjacencies, e.g. after the index was
+        rebuilt with add_netbox_devices(), or after add_device() was called for
+        devices that were not in the index when the cache was built.
+        '''
+        for _remote in self.adjacency.values():
+            _remote['remote_device'] = self.resolve(_remote['chassis_id'], _remote['mgmt_addr'])
+
+    def links(self):
+        '''
+        return a set of links, each link a frozenset({(device, port), (remote_device, remote_port)}),
+        for adjacencies whose remote_device is resolved.
+        '''
+        _links = set()
+        for _key, _remote in self.adjacency.items():
+            if _remote['remote_device'] is None:
+                continue
+            _links.add(frozenset([_key, (_remote['remote_device'], _remote['remote_port'])]))
+        return _links
+
+    def asymmetric_links(self):
+        '''
+        return a dict() of adjacencies whose resolved remote (device, port) was swept,
+        but does not point back to (device, port).
+
+        Keyed on (device, port).  Value is the adjacency dict() for (device, port)
+        plus key 'reverse', the adjacency dict() of the remote (device, port), or None.
+        '''
+        _asymmetric = dict()
+        for _key, _remote in self.adjacency.items():
+            _remote_device = _remote['remote_device']
+            if _remote_device is None or _remote_device not in self.digests:
+                continue
+            _reverse = self.adjacency.get((_remote_device, _remote['remote_port']))
+            if _reverse is not None and _reverse['remote_device'] == _key[0] and _reverse['remote_port'] == _key[1]:
+                continue
+            _asymmetric[_key] = dict(_remote, reverse=_reverse)
+        return _asymmetric
+
+    def unresolved(self):
+        '''
+        return a dict() of adjacencies whose chassis_id/mgmt_addr could not be resolved to a device
+        '''
+        return {_key: _remote for _key, _remote in self.adjacency.items() if _remote['remote_device'] is None}
+
+    def save(self):
+        if self.cache_file is None:
+            return
+        _cache = dict()
+        _cache['version'] = self.lib_version
+        _cache['digests'] = self.digests
+        _cache['devices'] = self.devices
+        _cache['device_index'] = self.device_index
+        _cache['netbox_devices'] = sorted(self.netbox_devices)
+        _cache['adjacency'] = [[_key[0], _key[1], _remote] for _key, _remote in self.adjacency.items()]
+        with open(self.cache_file, 'w') as fh:
+            json.dump(_cache, fh)
+
+    def load(self):
+        if self.cache_file is None or not file_exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r') as fh:
+                _cache = json.load(fh)
+            if _cache['version'] < 101:
+                # the device index of versions < 101 was built from swept hostnames only
+                self.log.info(f"{self.log_prefix} ignoring cache_file {self.cache_file} from version {_cache['version']}")
+                return
+            self.netbox_devices = set(_cache['netbox_devices'])
+            self.digests = _cache['digests']
+            self.devices.update(_cache['devices'])
+            self.device_index.update(_cache['device_index'])
+            self.adjacency = {(_device, _port): _remote for _device, _port, _remote in _cache['adjacency']}
+        except Exception as e:
+            msg = f"{self.log_prefix} ignoring unreadable cache_file {self.cache_file}."
+            msg += f" Exception: {e}"
+            self.log.warning(msg)
+            self.digests = dict()
+            self.adjacency = dict()
+            self.netbox_devices = set()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 '''
-Name: nxapi_locator_led_status.py
+Name: nxapi_locator_led.py
 Author: Allen Robel (arobel@cisco.com)
 Summary: Classes containing methods for retrieving locator-led status
 
@@ -81,9 +81,50 @@ Description:
     }
     switch# 
 
+Setting and clearing beacons:
+
+NxapiLocatorLed() sets and clears the chassis, module and fan locator-leds,
+and interface beacons, of one switch with a single cli_conf request, e.g.:
+
+    locator-led chassis
+    no locator-led module 2
+    interface Ethernet1/1
+     beacon
+
+and verify_status() reads the result back with a single request:
+
+    show locator-led status ; show interface Ethernet1/1, Ethernet1/2
+
+nx = NxapiLocatorLed('myusername','mypassword','myip', log)
+nx.nxapi_init()
+nx.set_chassis(True)
+nx.set_module(1, False)
+nx.set_interface('Ethernet1/1', True)
+if nx.apply() and nx.verify_status():
+    print('done')
+for component, expected, actual in nx.mismatches:
+    print(component, expected, actual)
+
+NxapiLocatorLedFleet() does the same on many switches concurrently, with at
+most max_workers switches in flight.  run() yields (device, result) as each
+switch finishes, where result is a dict() with keys:
+
+    status:     one of success (applied and verified), unverified (applied, but
+                verify_status() found mismatches), failed (apply failed or device unreachable)
+    mismatches: list of tuples (component, expected, actual)
+
+fleet = NxapiLocatorLedFleet('myusername','mypassword', log, cfg)
+nx = fleet.add_device('leaf_1', '192.168.1.1')
+nx.set_chassis(True)
+nx = fleet.add_device('leaf_2', '192.168.1.2')
+nx.set_interface('Ethernet1/49', True)
+for device, result in fleet.run():
+    print(device, result['status'])
 '''
-our_version = 104
+our_version = 105
 
+# standard libraries
+from concurrent.futures import ThreadPoolExecutor, as_completed
 # local libraries
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
@@ -223,3 +264,198 @@ class NxapiLocatorLedStatus(NxapiBase):
             return self._info['fan_{}'.format(self.fan)]
         except:
             return -1
+
+class NxapiLocatorLed(NxapiBase):
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_name = 'NxapiLocatorLed'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        # component -> desired state (True is on).  component is one of chassis, module_<n>, fan_<n>
+        self.leds = dict()
+        # interface -> desired state (True is on)
+        self.beacons = dict()
+        # interface -> beacon status (on, off), as of the last verify_status()
+        self.beacon_status = dict()
+        # list of tuples (component, expected, actual), as of the last verify_status()
+        self.mismatches = list()
+        self.status = NxapiLocatorLedStatus(username, password, mgmt_ip, _log)
+
+    def _verify_state(self, _state):
+        if not self.verify.is_boolean(_state):
+            self.log.error(f"{self.log_prefix} {self.hostname} Exiting. Expected boolean for state.  Got {_state}")
+            exit(1)
+
+    def _verify_int(self, _name, _x):
+        if not self.verify.is_digits(_x):
+            self.log.error(f"{self.log_prefix} {self.hostname} Exiting. Expected int() for {_name}.  Got {_x}")
+            exit(1)
+        return int(_x)
+
+    def set_chassis(self, state=True):
+        self._verify_state(state)
+        self.leds['chassis'] = state
+
+    def set_module(self, module, state=True):
+        self._verify_state(state)
+        self.leds[f"module_{self._verify_int('module', module)}"] = state
+
+    def set_fan(self, fan, state=True):
+        self._verify_state(state)
+        self.leds[f"fan_{self._verify_int('fan', fan)}"] = state
+
+    def set_interface(self, interface, state=True):
+        self._verify_state(state)
+        self.beacons[interface] = state
+
+    def make_config_list(self):
+        _list = list()
+        for _component in sorted(self.leds):
+            _cli = 'locator-led {}'.format(_component.replace('_', ' '))
+            if not self.leds[_component]:
+                _cli = 'no {}'.format(_cli)
+            _list.append(_cli)
+        for _interface in sorted(self.beacons):
+            _list.append(f"interface {_interface}")
+            _list.append(' beacon' if self.beacons[_interface] else ' no beacon')
+        return _list
+
+    def apply(self):
+        '''
+        send all locator-led and beacon cli in a single request.
+        returns True if every cli succeeded
+        '''
+        _list = self.make_config_list()
+        if len(_list) == 0:
+            return True
+        self.config_list = _list
+        self.configure_from_list()
+        return self.result_code == self.RC_200_SUCCESS
+
+    def _expected(self, _state):
+        return 'on' if _state else 'off'
+
+    def verify_status(self):
+        '''
+        read locator-led and beacon status with a single request and compare
+        with the desired state.  Populates self.mismatches.
+        returns True if all components are in their desired state
+        '''
+        self.mismatches = list()
+        self.beacon_status = dict()
+        _cli = ['show locator-led status']
+        if len(self.beacons) != 0:
+            _cli.append('show interface {}'.format(', '.join(sorted(self.beacons))))
+        self.cli = ' ; '.join(_cli)
+        self.show(self.cli)
+        if self.body_length != len(_cli):
+            self.log.error(f"{self.log_prefix} {self.hostname} early return: expected body_length {len(_cli)}. Got {self.body_length}.")
+            for _component in sorted(self.leds):
+                self.mismatches.append((_component, self._expected(self.leds[_component]), 'na'))
+            for _interface in sorted(self.beacons):
+                self.mismatches.append((_interface, self._expected(self.beacons[_interface]), 'na'))
+            return False
+        self.status.hostname = self.hostname
+        self.status.body = [self.body[0]]
+        self.status.make_info_dict()
+        for _component in sorted(self.leds):
+            _actual = str(self.status.info.get(_component, 'na')).lower()
+            _expected = self._expected(self.leds[_component])
+            if _actual != _expected:
+                self.mismatches.append((_component, _expected, _actual))
+        if len(self.beacons) != 0:
+            _rows = self._get_table_row('interface', self.body[1])
+            if _rows == False:
+                _rows = list()
+            for _row in _rows:
+                if 'interface' in _row:
+                    self.beacon_status[_row['interface']] = _row.get('eth_beacon', 'na')
+        # the user may abbreviate interface names e.g. eth1/1, so match on the lowercase
+        # interface name, and on the lowercase interface name with the type abbreviated
+        _status = dict()
+        for _interface, _beacon in self.beacon_status.items():
+            _status[_interface.lower()] = _beacon
+            _status[_interface.lower().replace('ethernet', 'eth')] = _beacon
+        for _interface in sorted(self.beacons):
+            _actual = _status.get(_interface.lower(), 'na')
+            _expected = self._expected(self.beacons[_interface])
+            if _actual != _expected:
+                self.mismatches.append((_interface, _expected, _actual))
+        return len(self.mismatches) == 0
+
+
+class NxapiLocatorLedFleet(object):
+    '''
+    Set and clear locator-leds and beacons on many switches concurrently.  See the library header.
+    '''
+    def __init__(self, username, password, log, argparse_instance=None):
+        self.lib_name = 'NxapiLocatorLedFleet'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.log = log
+        self.username = username
+        self.password = password
+        # used to set the cookie and urllib prefs of each NxapiLocatorLed() instance
+        self.argparse_instance = argparse_instance
+        self.max_workers = 20
+        self.timeout = 30
+        # device -> NxapiLocatorLed() instance
+        self.devices = dict()
+        # device -> dict() with keys status, mismatches
+        self.results = dict()
+
+    def add_device(self, device, ip):
+        '''
+        returns the device's NxapiLocatorLed() instance, on which to call set_chassis(), set_interface(), etc
+        '''
+        nx = NxapiLocatorLed(self.username, self.password, ip, self.log)
+        if self.argparse_instance != None:
+            nx.set_cookie_prefs(self.argparse_instance)
+            nx.set_urllib_prefs(self.argparse_instance)
+        # avoid the extra request made by nxapi_init() to get the hostname
+        nx.hostname = device
+        nx.timeout = self.timeout
+        self.devices[device] = nx
+        return nx
+
+    def _result(self, status, mismatches=None):
+        _result = dict()
+        _result['status'] = status
+        _result['mismatches'] = list() if mismatches is None else mismatches
+        return _result
+
+    def apply_device(self, device):
+        nx = self.devices[device]
+        try:
+            nx.load_cookies()
+            if not nx.apply():
+                return self._result('failed')
+            if not nx.verify_status():
+                return self._result('unverified', nx.mismatches)
+        except (Exception, SystemExit) as e:
+            self.log.error(f"{self.log_prefix} {device} unable to set locator-led. Exception: {e}")
+            return self._result('failed')
+        return self._result('success')
+
+    def run(self):
+        '''
+        generator.  apply and verify all devices, yielding (device, result) as each device finishes
+        '''
+        self.results = dict()
+        _devices = sorted(self.devices.keys())
+        if len(_devices) == 0:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(_devices))) as executor:
+            _futures = {executor.submit(self.apply_device, _device): _device for _device in _devices}
+            for _future in as_completed(_futures):
+                _device = _futures[_future]
+                self.results[_device] = _future.result()
+                yield _device, self.results[_device]
+
+    def apply(self):
+        '''
+        apply and verify all devices.  returns True if all devices succeeded, else False
+        '''
+        for _device, _result in self.run():
+            pass
+        return all([_result['status'] == 'success' for _result in self.results.values()])
@@ -62,10 +62,61 @@ print(fmt.format(
     nx.rvtep_static_cnt,
     mac.static_cnt,
     mac.secure_cnt))
+
+NxapiMacAddressTable() corresponds to the output provided by the following cli:
+
+show mac address-table
+
+switch# show mac address-table | json-pretty
+{
+    "TABLE_mac_address": {
+        "ROW_mac_address": [
+            {
+                "disp_mac_addr": "0000.1111.2222",
+                "disp_type": "* ",
+                "disp_vlan": "10",
+                "disp_is_static": "disabled",
+                "disp_age": "0",
+                "disp_is_secure": "disabled",
+                "disp_is_ntfy": "disabled",
+                "disp_port": "Ethernet1/1"
+            },
+            etc...
+        ]
+    }
+}
+
+The output is retrieved with Nxapi().show_chunked() and stored as parallel,
+compact arrays rather than one dict() per entry:
+
+    nx.macs   array('Q')  mac address as a 48-bit int
+    nx.vlans  array('H')  vlan
+    nx.port_indexes  array('I')  index into nx.ports
+    nx.type_indexes  array('B')  index into nx.types (dynamic, static, secure)
+
+Per-vlan, per-port and per-type counts are computed by counting over these
+arrays (collections.Counter), and mac moves between the previous and the
+current refresh() are found by joining on (mac, vlan).
+
+Synopsis:
+
+from nxapi_netbox.nxapi.nxapi_mac_address_table import NxapiMacAddressTable
+
+nx = NxapiMacAddressTable('myusername', 'mypassword', ip, log)
+nx.nxapi_init()
+nx.refresh()
+for vlan, count in sorted(nx.vlan_counts().items()):
+    print(vlan, count)
+time.sleep(60)
+nx.refresh()
+for mac, vlan, old_port, new_port in nx.mac_moves():
+    print(mac, vlan, old_port, new_port)
 '''
-our_version = 110
+our_version = 111
 
 # standard libraries
+from array import array
+from collections import Counter
 # local libraries
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
@@ -243,3 +294,157 @@ class NxapiMacCount(NxapiBase):
             return self.info['secure_cnt']
         except:
             return -1
+
+
+class NxapiMacAddressTable(NxapiBase):
+    '''
+    Methods for parsing the JSON for "show mac address-table".
+    See the library header for the structures provided.
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiMacAddressTable'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.types = ['dynamic', 'static', 'secure']
+        self._vlan = 0
+        self.chunked = True
+        self._clear()
+        self._previous = None
+
+    def _clear(self):
+        self.macs = array('Q')
+        self.vlans = array('H')
+        self.port_indexes = array('I')
+        self.type_indexes = array('B')
+        self.ports = list()
+        self._port_index = dict()
+
+    def refresh(self):
+        if self.vlan == 0:
+            self.cli = 'show mac address-table'
+        else:
+            self.cli = f"show mac address-table vlan {self.vlan}"
+        if self.chunked:
+            self.show_chunked(self.cli)
+        else:
+            self.show(self.cli)
+        self._previous = self.snapshot()
+        self.make_arrays()
+
+    def snapshot(self):
+        '''
+        return the current table as a tuple (macs, vlans, port_indexes, ports)
+        '''
+        return (self.macs, self.vlans, self.port_indexes, self.ports)
+
+    def mac_to_int(self, mac):
+        return int(mac.replace('.', '').replace(':', ''), 16)
+
+    def int_to_mac(self, x):
+        _hex = f"{x:012x}"
+        return f"{_hex[0:4]}.{_hex[4:8]}.{_hex[8:12]}"
+
+    def make_arrays(self):
+        '''
+        populate the arrays described in the library header from self.body[0]
+        '''
+        self._clear()
+        if self.body_length != 1:
+            msg = f"{self.log_prefix} {self.hostname} early return:"
+            msg += f" unexpected body_length {self.body_length}"
+            self.log.error(msg)
+            return
+        if 'TABLE_mac_address' not in self.body[0]:
+            self.log.debug(f"{self.log_prefix} {self.hostname} no mac address-table entries")
+            return
+        _list = self._get_table_row('mac_address', self.body[0])
+        if _list == False:
+            return
+        for _dict in _list:
+            try:
+                _mac = self.mac_to_int(_dict['disp_mac_addr'])
+                _vlan = int(_dict['disp_vlan'])
+                _port = _dict['disp_port']
+            except (KeyError, ValueError):
+                # e.g. vlan "-" for router/gateway macs
+                msg = f"{self.log_prefix} {self.hostname} skipping."
+                msg += f" unable to parse {_dict}"
+                self.log.debug(msg)
+                continue
+            if _port not in self._port_index:
+                self._port_index[_port] = len(self.ports)
+                self.ports.append(_port)
+            if _dict.get('disp_is_secure') == 'enabled':
+                _type = 2
+            elif _dict.get('disp_is_static') == 'enabled':
+                _type = 1
+            else:
+                _type = 0
+            self.macs.append(_mac)
+            self.vlans.append(_vlan)
+            self.port_indexes.append(self._port_index[_port])
+            self.type_indexes.append(_type)
+
+    def vlan_counts(self):
+        '''
+        return a dict() of mac count, keyed on vlan
+        '''
+        return dict(Counter(self.vlans))
+
+    def port_counts(self):
+        '''
+        return a dict() of mac count, keyed on port
+        '''
+        return {self.ports[_index]: _count for _index, _count in Counter(self.port_indexes).items()}
+
+    def type_counts(self):
+        '''
+        return a dict() of mac count, keyed on type (dynamic, static, secure)
+        '''
+        _counts = Counter(self.type_indexes)
+        return {_type: _counts.get(_index, 0) for _index, _type in enumerate(self.types)}
+
+    def vlan_port_counts(self):
+        '''
+        return a dict() of mac count, keyed on (vlan, port)
+        '''
+        _counts = Counter(zip(self.vlans, self.port_indexes))
+        return {(_vlan, self.ports[_index]): _count for (_vlan, _index), _count in _counts.items()}
+
+    def mac_moves(self, previous=None):
+        '''
+        return a list of tuples (mac, vlan, old_port, new_port) for macs whose port
+        changed between previous (a tuple returned by snapshot()) and the current table.
+
+        If previous is None, the table from the prior refresh() is used.
+        '''
+        if previous is None:
+            previous = self._previous
+        if previous is None:
+            return list()
+        _macs, _vlans, _port_indexes, _ports = previous
+        _old = dict(zip(zip(_macs, _vlans), _port_indexes))
+        _moves = list()
+        for _key, _index in zip(zip(self.macs, self.vlans), self.port_indexes):
+            _old_index = _old.get(_key)
+            if _old_index is None:
+                continue
+            if _ports[_old_index] == self.ports[_index]:
+                continue
+            _moves.append((self.int_to_mac(_key[0]), _key[1], _ports[_old_index], self.ports[_index]))
+        return _moves
+
+    @property
+    def vlan(self):
+        return self._vlan
+    @vlan.setter
+    def vlan(self, _x):
+        if not self.verify.is_digits(_x):
+            self.log.error(f"{self.log_prefix} Exiting.  vlan must be digits. Got {_x}.")
+            exit(1)
+        self._vlan = int(_x)
+
+    @property
+    def entries(self):
+        return len(self.macs)
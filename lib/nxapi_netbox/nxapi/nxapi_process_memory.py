@@ -1,12 +1,11 @@
 '''
-Name: nxapi_vpc.py
+Name: nxapi_process_memory.py
 Author: Allen Robel (arobel@cisco.com)
 Description: methods which collect/return information about system processes memory
 '''
-import re
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
-our_version = 100
+our_version = 102
 
 class NxapiProcessMemoryPhysical(NxapiBase):
     '''
@@ -14,8 +13,10 @@ class NxapiProcessMemoryPhysical(NxapiBase):
 
         We populate two dict():
             self.info - keyed on processname.  Since there can be more than one process with the 
-                same name, we sum the memory used by all such processes and provide a comma-separated
-                list of process IDs that comprise the summed process memory stats.
+                same name, we sum the memory used by all such processes and provide a list
+                (processids), and a comma-separated list (processid), of process IDs that
+                comprise the summed process memory stats.  For single-instance processes,
+                processid is the process ID as returned by NXAPI.
             self.info_by_processid - keyed on processid.  This can be used to retrieve memory stats
                 for each of the processes above that had the same name.
 
@@ -112,6 +113,11 @@ class NxapiProcessMemoryPhysical(NxapiBase):
         self.verify_ready()
         return self.info[self.process]['processid']
 
+    @property
+    def processids(self):
+        self.verify_ready()
+        return self.info[self.process]['processids']
+
     @property
     def processname(self):
         self.verify_ready()
@@ -135,9 +141,19 @@ class NxapiProcessMemoryPhysical(NxapiBase):
 
     def make_info_dict(self):
         '''
-        from self.body[0] populate self.info
+        from self.body[0] populate self.info and self.info_by_processid
+
+        memory values (physical, rss, virtual) are converted to int() once, in
+        self.info_by_processid, and summed per processname into self.info.
+        self.info[process]['processids'] is a list of the process IDs that
+        comprise the summed stats.  self.info[process]['processid'] is the
+        process ID, as returned by NXAPI, for single-instance processes, and
+        the same list, comma-separated, for processes with more than one instance.
         '''
         self.info = dict()
+        self.info_by_processid = dict()
+        self.properties['process_names'] = set()
+        self.properties['process_ids'] = set()
         self.error = dict()
         self.error_reason = None
 
@@ -151,49 +167,59 @@ class NxapiProcessMemoryPhysical(NxapiBase):
             for item in _list:
                 # There can be more than one instance of a process.
                 # All instances of a process have the same name, so for these processes,
-                # we sum the total memory used by all of them and provide a comma-separated list of
+                # we sum the total memory used by all of them and provide a list of
                 # process IDs, which the user can use to query self.info_by_processid, if desired.
 
-                # Intermittenty, we get one or more processes with blank ("") names. 
-                # Provide a "best guess" name for these.
-                if item['processname'] == "":
-                    item['processname'] = 'unknown_likely_spurious'
-
                 # 1. processname is not stripped in the NXAPI output.
                 #    (it IS stripped in the CLI | json-pretty output, go figure)
                 #    Here's an example of NXAPI output as of 10.2(3).
                 #    Notice the trailing spaces in the processname value.
                 #    {'processid': 8640, 'virtual': 3216, 'physical': 310, 'rss': 2392, 'processname': 'rpc.statd               '}
-                process = item['processname'].strip()
-
                 # 2. dcos_sshd process name contains a colon (:). We strip that so that users can
                 #    retrieve the process stats using the bare name.
                 #    Here's an example as of 10.2(3)
                 #    {'processid': 30345, 'virtual': 392424, 'physical': 5436, 'rss': 52856, 'processname': 'dcos_sshd:              '}
-                process = re.sub(':', '', process)
+                process = item['processname'].strip().replace(':', '')
+
+                # Intermittenty, we get one or more processes with blank ("") names.
+                # Provide a "best guess" name for these.
+                if process == "":
+                    process = 'unknown_likely_spurious'
+
                 processid = item['processid']
+                physical = int(item['physical'])
+                rss = int(item['rss'])
+                virtual = int(item['virtual'])
 
                 self.properties['process_names'].add(process)
                 self.properties['process_ids'].add(processid)
                 item['processname'] = process
+                item['physical'] = physical
+                item['rss'] = rss
+                item['virtual'] = virtual
                 self.info_by_processid[processid] = item
-                if process not in self.info:
-                    self.info[process] = dict()
-                    self.info[process]['processname'] = process
-                    self.info[process]['processid'] = ""
-                    self.info[process]['physical'] = 0
-                    self.info[process]['rss'] = 0
-                    self.info[process]['virtual'] = 0
-                    self.info[process]['instances'] = 0
-
-                self.info[process]['instances'] += 1
-                if self.info[process]['processid'] != "":
-                    self.info[process]['processid'] = '{},{}'.format(self.info[process]['processid'], item['processid'])
+
+                _dict = self.info.get(process)
+                if _dict is None:
+                    _dict = {
+                        'processname': process,
+                        'processids': list(),
+                        'physical': 0,
+                        'rss': 0,
+                        'virtual': 0,
+                        'instances': 0,
+                    }
+                    self.info[process] = _dict
+                _dict['instances'] += 1
+                _dict['processids'].append(processid)
+                _dict['physical'] += physical
+                _dict['rss'] += rss
+                _dict['virtual'] += virtual
+            for _dict in self.info.values():
+                if _dict['instances'] == 1:
+                    _dict['processid'] = _dict['processids'][0]
                 else:
-                    self.info[process]['processid'] = item['processid']
-                self.info[process]['physical'] += int(item['physical'])
-                self.info[process]['rss'] += int(item['rss'])
-                self.info[process]['virtual'] += int(item['virtual'])
+                    _dict['processid'] = ','.join([str(x) for x in _dict['processids']])
         except:
             self.log.error('{} {} early return. self.info {}'.format(self.class_name, self.hostname, self.info))
             self.error_reason = '{} {} unable to process output of {}'.format(self.class_name, self.hostname, self.cli)
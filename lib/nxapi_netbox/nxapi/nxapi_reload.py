@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+'''
+Name: nxapi_reload.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Reload (or install reset) switches in waves, with vpc-pair and role awareness and health gating
+
+NxapiReloadProbe() sends the following cli in a single NXAPI request:
+
+    show version ; show system mode
+
+and provides reachable, uptime (seconds), and system_mode.  Connection failures
+and errors returned by a rebooting switch are reported as reachable == False
+rather than exiting.
+
+If probe_vpc is True, a reachable switch is then sent a second request:
+
+    show vpc ; show vpc role
+
+which provides the vpc domain id and system mac of the switch.  If the switch
+returns an error for these cli (e.g. feature vpc is not enabled, as on spines),
+the switch has no vpc (vpc_known is True, vpc_peer_key is None).  If the request
+itself fails (timeout, non-200 response, unexpected number of bodies), the vpc
+state is unknown (vpc_known is False).  plan() probes vpc; the health polls do not.
+
+ReloadOrchestrator() reloads a set of devices in waves:
+
+    - plan() probes all devices concurrently, then assigns devices to waves such that:
+        - a wave contains at most self.wave_size devices
+        - a wave never contains both peers of a vpc domain (peers are matched on
+          vpc domain id and vpc system mac)
+        - a wave contains at most self.max_per_role devices of each role (0 = no limit)
+      If the vpc state of any device is unknown (including devices not reachable
+      during plan()), plan() exits, unless self.force is True, in which case each
+      such device is placed in a wave of its own.
+    - run() reloads each wave concurrently (at most self.max_workers at a time) with
+      NxapiConfig.commit_list(), waits self.settle seconds, then polls every device
+      in the wave concurrently, with exponential backoff, until each is reachable,
+      its uptime shows that it has reloaded, and its system mode is Normal.
+      If any device fails to reload, or is not healthy within self.poll_timeout
+      seconds, run() stops and does not start the next wave.
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.nxapi.nxapi_reload import ReloadOrchestrator
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+orchestrator = ReloadOrchestrator('admin', 'mypassword', log)
+orchestrator.wave_size = 4
+orchestrator.max_per_role = 1
+orchestrator.add_device('leaf_1', '192.168.1.1', 'leaf')
+orchestrator.add_device('leaf_2', '192.168.1.2', 'leaf')
+orchestrator.add_device('spine_1', '192.168.1.3', 'spine')
+orchestrator.plan()
+for wave in orchestrator.waves:
+    print(wave)
+if not orchestrator.run():
+    print(orchestrator.results)
+
+See also: scripts/switch_reload.py
+'''
+our_version = 102
+
+# standard libraries
+from concurrent.futures import ThreadPoolExecutor
+import time
+# local libraries
+from nxapi_netbox.nxapi.nxapi_base import NxapiBase
+from nxapi_netbox.nxapi.nxapi_config import NxapiConfig
+
+class NxapiReloadProbe(NxapiBase):
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiReloadProbe'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.cli_list = ['show version', 'show system mode']
+        self.vpc_cli_list = ['show vpc', 'show vpc role']
+        self.probe_vpc = False
+        self._clear()
+
+    def _clear(self):
+        self.version = dict()
+        self.mode = dict()
+        self.vpc = dict()
+        self.vpc_role_info = dict()
+        self.reachable = False
+        # True once the vpc state (configured, or not) of the switch is known
+        self.vpc_known = False
+
+    def _show_list(self, _cli_list):
+        '''
+        send _cli_list in a single request.  returns the list of bodies, or None on failure
+        '''
+        self.body = list()
+        self.cli = ' ; '.join(_cli_list)
+        try:
+            self.show(self.cli)
+        except SystemExit:
+            # NxapiJson exits on non-200 responses, e.g. while NXAPI is starting
+            self.log.debug(f"{self.log_prefix} {self.mgmt_ip} {self.cli} failed. non-200 response")
+            return None
+        except Exception as e:
+            self.log.debug(f"{self.log_prefix} {self.mgmt_ip} {self.cli} failed. Exception: {e}")
+            return None
+        if self.body_length != len(_cli_list):
+            self.log.debug(f"{self.log_prefix} {self.mgmt_ip} {self.cli} failed. body_length {self.body_length}")
+            return None
+        return self.body
+
+    def refresh(self):
+        self._clear()
+        _bodies = self._show_list(self.cli_list)
+        if _bodies is None:
+            return
+        self.version, self.mode = _bodies
+        self.reachable = len(self.version) != 0
+        if not self.reachable or not self.probe_vpc:
+            return
+        _bodies = self._show_list(self.vpc_cli_list)
+        if _bodies is None:
+            self.log.warning(f"{self.log_prefix} {self.mgmt_ip} vpc state unknown")
+            return
+        # cli errors (e.g. feature vpc not enabled) return empty bodies, i.e. no vpc
+        self.vpc, self.vpc_role_info = _bodies
+        self.vpc_known = True
+
+    @property
+    def uptime(self):
+        '''
+        seconds since the switch kernel started, or -1
+        '''
+        try:
+            _uptime = int(self.version['kern_uptm_days']) * 86400
+            _uptime += int(self.version['kern_uptm_hrs']) * 3600
+            _uptime += int(self.version['kern_uptm_mins']) * 60
+            _uptime += int(self.version['kern_uptm_secs'])
+            return _uptime
+        except:
+            return -1
+
+    @property
+    def system_mode(self):
+        try:
+            return self.mode['system_mode']
+        except:
+            return 'na'
+
+    @property
+    def vpc_domain_id(self):
+        try:
+            return self.vpc['vpc-domain-id']
+        except:
+            return 'na'
+
+    @property
+    def vpc_system_mac(self):
+        try:
+            return self.vpc_role_info['vpc-system-mac']
+        except:
+            return 'na'
+
+    @property
+    def vpc_peer_key(self):
+        '''
+        (vpc domain id, vpc system mac), or None if vpc is not configured
+        or if the vpc state is unknown (see vpc_known)
+        '''
+        if self.vpc_domain_id in ['na', 'not configured']:
+            return None
+        return (self.vpc_domain_id, self.vpc_system_mac)
+
+
+class ReloadOrchestrator(object):
+    '''
+    Reload devices in waves.  See the library header for details.
+    '''
+    def __init__(self, username, password, log, argparse_instance=None):
+        self.lib_name = 'ReloadOrchestrator'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.log = log
+        self.username = username
+        self.password = password
+        # passed to nxapi_init() of the NxapiConfig/NxapiReloadProbe instances
+        self.argparse_instance = argparse_instance
+        self.wave_size = 1
+        self.max_workers = 10
+        self.max_per_role = 0
+        self.reload_cli = ['reload in 5']
+        # seconds to wait after reloading a wave, before polling it
+        self.settle = 120
+        # seconds after which a device that is not healthy fails the wave
+        self.poll_timeout = 1800
+        # initial and maximum seconds between polls of a device
+        self.backoff_initial = 5
+        self.backoff_max = 60
+        self.probe_timeout = 10
+        self.reload_timeout = 5
+        # if True, plan() places devices whose vpc state is unknown in waves of their own,
+        # rather than exiting
+        self.force = False
+        # device -> dict() with keys ip, role, vpc_peer_key, vpc_known
+        self.devices = dict()
+        # list of lists of device names
+        self.waves = list()
+        # device -> dict() with keys wave, reloaded, healthy, detail
+        self.results = dict()
+
+    def add_device(self, device, ip, role='na'):
+        self.devices[device] = {'ip': ip, 'role': role, 'vpc_peer_key': None, 'vpc_known': False}
+
+    def probe(self, device, vpc=False):
+        '''
+        return a refreshed NxapiReloadProbe() for device.  hostname is not
+        retrieved (nxapi_init() is not called), since the device may be down.
+        If vpc is True, the device's vpc domain is also probed.
+        '''
+        nx = NxapiReloadProbe(self.username, self.password, self.devices[device]['ip'], self.log)
+        if self.argparse_instance != None:
+            nx.set_cookie_prefs(self.argparse_instance)
+            nx.set_urllib_prefs(self.argparse_instance)
+        nx.timeout = self.probe_timeout
+        nx.hostname = device
+        nx.probe_vpc = vpc
+        nx.refresh()
+        return nx
+
+    def probe_with_vpc(self, device):
+        return self.probe(device, vpc=True)
+
+    def _map(self, function, devices):
+        '''
+        return a dict() device -> function(device), calling function concurrently
+        '''
+        if len(devices) == 0:
+            return dict()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(devices))) as executor:
+            _results = list(executor.map(function, devices))
+        return dict(zip(devices, _results))
+
+    def plan(self):
+        '''
+        probe all devices and populate self.waves
+        '''
+        _probes = self._map(self.probe_with_vpc, list(self.devices.keys()))
+        for _device, _nx in _probes.items():
+            if not _nx.reachable:
+                self.log.warning(f"{self.log_prefix} {_device} not reachable during plan(). vpc peer unknown.")
+            self.devices[_device]['vpc_peer_key'] = _nx.vpc_peer_key
+            self.devices[_device]['vpc_known'] = _nx.vpc_known
+        _unknown = sorted([_device for _device in self.devices if not self.devices[_device]['vpc_known']])
+        if len(_unknown) != 0 and not self.force:
+            msg = f"{self.log_prefix} exiting. vpc state unknown for {','.join(_unknown)}."
+            msg += " Their vpc peers could be reloaded in the same wave."
+            msg += " Set force to place each of them in a wave of its own."
+            self.log.error(msg)
+            exit(1)
+        self.waves = list()
+        _wave_peer_keys = list()
+        _wave_roles = list()
+        for _device in sorted(self.devices, key=lambda x: (self.devices[x]['role'], x)):
+            if _device in _unknown:
+                continue
+            _role = self.devices[_device]['role']
+            _peer_key = self.devices[_device]['vpc_peer_key']
+            for _index, _wave in enumerate(self.waves):
+                if len(_wave) >= self.wave_size:
+                    continue
+                if _peer_key is not None and _peer_key in _wave_peer_keys[_index]:
+                    continue
+                if self.max_per_role != 0 and _wave_roles[_index].count(_role) >= self.max_per_role:
+                    continue
+                break
+            else:
+                self.waves.append(list())
+                _wave_peer_keys.append(set())
+                _wave_roles.append(list())
+                _index = len(self.waves) - 1
+            self.waves[_index].append(_device)
+            _wave_roles[_index].append(_role)
+            if _peer_key is not None:
+                _wave_peer_keys[_index].add(_peer_key)
+        for _device in _unknown:
+            self.log.warning(f"{self.log_prefix} {_device} vpc state unknown. Reloading it in a wave of its own.")
+            self.waves.append([_device])
+        self.log.info(f"{self.log_prefix} {len(self.devices)} devices in {len(self.waves)} waves")
+
+    def reload(self, device):
+        '''
+        returns True if the reload cli was accepted, else False
+        '''
+        c = NxapiConfig(self.username, self.password, self.devices[device]['ip'], self.log)
+        try:
+            c.nxapi_init(self.argparse_instance)
+            c.timeout = self.reload_timeout
+            c.config_list = self.reload_cli
+            return c.commit_list()
+        except SystemExit:
+            return False
+        except Exception as e:
+            self.log.error(f"{self.log_prefix} {device} unable to reload. Exception: {e}")
+            return False
+
+    def wait_healthy(self, device, reload_time):
+        '''
+        poll device, with exponential backoff, until it is reachable, its uptime
+        is less than the time since reload_time, and its system mode is Normal
+        (or 'na' on platforms that do not support show system mode).
+
+        returns a tuple (healthy, detail)
+        '''
+        _deadline = reload_time + self.poll_timeout
+        _delay = self.backoff_initial
+        _detail = 'not polled'
+        while True:
+            _nx = self.probe(device)
+            if not _nx.reachable:
+                _detail = 'not reachable'
+            elif _nx.uptime < 0 or _nx.uptime > time.time() - reload_time:
+                _detail = f"not reloaded. uptime {_nx.uptime}"
+            elif _nx.system_mode not in ['Normal', 'na']:
+                _detail = f"system mode {_nx.system_mode}"
+            else:
+                return (True, f"uptime {_nx.uptime}")
+            if time.time() + _delay > _deadline:
+                return (False, f"timeout after {self.poll_timeout} seconds. {_detail}")
+            self.log.debug(f"{self.log_prefix} {device} {_detail}. polling again in {_delay} seconds")
+            time.sleep(_delay)
+            _delay = min(_delay * 2, self.backoff_max)
+
+    def run_wave(self, wave_number, wave):
+        '''
+        reload and health-gate one wave.  returns True if all devices in the wave are healthy.
+        '''
+        self.log.info(f"{self.log_prefix} wave {wave_number} reloading {wave}")
+        _reload_time = time.time()
+        _reloaded = self._map(self.reload, wave)
+        for _device in wave:
+            self.results[_device] = {
+                'wave': wave_number,
+                'reloaded': _reloaded[_device],
+                'healthy': False,
+                'detail': 'reload failed' if not _reloaded[_device] else 'na',
+            }
+        _pending = [_device for _device in wave if _reloaded[_device]]
+        if len(_pending) == 0:
+            return False
+        time.sleep(self.settle)
+        _health = self._map(lambda _device: self.wait_healthy(_device, _reload_time), _pending)
+        for _device, (_healthy, _detail) in _health.items():
+            self.results[_device]['healthy'] = _healthy
+            self.results[_device]['detail'] = _detail
+        return all(self.results[_device]['healthy'] for _device in wave)
+
+    def run(self):
+        '''
+        reload all waves in order.  returns True if all devices were reloaded and are healthy.
+        stops at the first wave that contains a failed or unhealthy device.
+        '''
+        if len(self.waves) == 0:
+            self.plan()
+        self.results = dict()
+        for _wave_number, _wave in enumerate(self.waves, 1):
+            if not self.run_wave(_wave_number, _wave):
+                msg = f"{self.log_prefix} wave {_wave_number} failed."
+                msg += f" Not starting the remaining {len(self.waves) - _wave_number} waves."
+                self.log.error(msg)
+                return False
+            self.log.info(f"{self.log_prefix} wave {_wave_number} healthy")
+        return True
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
-our_version = 112
+our_version = 113
 '''
 Name: nxapi_system_internal_access_list_resource_utilization.py
 Author: Allen Robel (arobel@cisco.com)
 Description: Classes for retrieving acl tcam utilization via NXAPI 
+
+NxapiAccessListResourceUtilization() retrieves utilization for one module per request.
+
+NxapiAccessListResourceUtilizationModules() retrieves utilization for all line cards
+(or the modules in self.modules) with one request.  See its docstring.
 '''
 
 # standard libraries
@@ -566,3 +571,132 @@ class NxapiAccessListResourceUtilization(NxapiAccessList):
     @property
     def features(self):
         return sorted(self.hdr_to_key.values())
+
+
+class NxapiAccessListResourceUtilizationModules(NxapiAccessList):
+    '''
+    Retrieve ACL TCAM utilization for multiple modules with a single request:
+
+    show system internal access-list resource utilization module X ; show system internal access-list resource utilization module Y ; etc
+
+    If self.modules is not set before refresh(), the line cards are discovered with
+    'show module' (modules whose modtype is not a supervisor, fabric, or system controller,
+    and whose status is active/ok) and cached in self.modules, so subsequent refresh()
+    calls cost one request.  Alternatively, set self.modules from a refreshed
+    NxapiModuleInfo() instance with:
+
+        nx.modules_from_module_info(nx_module_info)
+
+    Populates self.info with the following structure:
+
+        self.info[module][inst][feature]['used']
+        self.info[module][inst][feature]['free']
+        self.info[module][inst][feature]['percent']
+        self.info[module][inst][feature]['title']
+
+    where feature is a value in self.hdr_to_key (e.g. egress_racl).
+
+    self.table is a flattened list() of tuples, sorted on (module, feature, inst):
+
+        (module, feature, inst, used, free, percent)
+
+    Synopsis:
+
+    nx = NxapiAccessListResourceUtilizationModules('admin', 'mypassword', '192.168.1.1', log)
+    nx.nxapi_init()
+    nx.refresh()
+    for module, feature, inst, used, free, percent in nx.table:
+        print(nx.hostname, module, feature, inst, used, free, percent)
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_name = 'NxapiAccessListResourceUtilizationModules'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.modules = None
+        self.info = dict()
+        self.table = list()
+        self._resource_util_info_dict = dict()
+        self._instance_dict = dict()
+        self._module_dict = dict()
+        # modtype substrings of modules that do not have ACL TCAM
+        self.non_linecard_modtypes = ['Supervisor', 'Fabric', 'System Controller']
+        self.linecard_status = ['active', 'active *', 'ok']
+
+    def _is_linecard(self, _dict):
+        for _modtype in self.non_linecard_modtypes:
+            if _modtype in _dict.get('modtype', ''):
+                return False
+        if _dict.get('status', '') not in self.linecard_status:
+            return False
+        return True
+
+    def modules_from_module_info(self, nx_module_info):
+        '''
+        set self.modules from NxapiModuleInfo().modinfo, populated by NxapiModuleInfo().refresh()
+        '''
+        self.modules = list()
+        for _module in sorted(nx_module_info.modinfo):
+            if self._is_linecard(nx_module_info.modinfo[_module]):
+                self.modules.append(_module)
+
+    def discover_modules(self):
+        self.modules = list()
+        self.show('show module')
+        if not self._verify_body_length():
+            return
+        _list = self._get_table_row('modinfo', self.body[0])
+        if _list == False:
+            return
+        for _dict in _list:
+            if not self._is_linecard(_dict):
+                continue
+            try:
+                self.modules.append(int(_dict['modinf']))
+            except:
+                self.log.debug(f"{self.log_prefix} {self.hostname} skipping. Unexpected modinf in {_dict}")
+        self.log.debug(f"{self.log_prefix} {self.hostname} discovered modules {self.modules}")
+
+    def refresh(self):
+        self.info = dict()
+        self.table = list()
+        if self.modules == None:
+            self.discover_modules()
+        if len(self.modules) == 0:
+            self.log.warning(f"{self.log_prefix} {self.hostname} early return. No modules to query.")
+            return
+        _cli_list = [f"show system internal access-list resource utilization module {_module}" for _module in self.modules]
+        self.cli = ' ; '.join(_cli_list)
+        self.show(self.cli)
+        if self.body_length != len(_cli_list):
+            msg = f"{self.log_prefix} {self.hostname} early return:"
+            msg += f" expected body_length {len(_cli_list)}."
+            msg += f" Got {self.body_length}"
+            self.log.error(msg)
+            return
+        for _module, _body in zip(self.modules, self.body):
+            self.make_module_info(_module, _body)
+        for _module in sorted(self.info):
+            for _inst in sorted(self.info[_module]):
+                for _feature, _d in self.info[_module][_inst].items():
+                    self.table.append((_module, _feature, _inst, _d['used'], _d['free'], _d['percent']))
+        self.table.sort()
+
+    def make_module_info(self, _module, _body):
+        self._module = _module
+        self._module_dict = dict()
+        self._instance_dict = dict()
+        self._resource_util_info_dict = dict()
+        _module_list = self._get_table_row('module', _body)
+        if _module_list == False:
+            return
+        for _dict in _module_list:
+            if _dict.get('module_number') == str(_module):
+                self._module_dict = _dict
+                break
+        if len(self._module_dict) == 0:
+            self.log.warning(f"{self.log_prefix} {self.hostname} skipping. module {_module} not found")
+            return
+        self._get_instance_dict_from_module_dict()
+        self._get_resource_util_info_dict_from_instance_dict()
+        self.info[_module] = self._resource_util_info_dict
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 '''
-Name: nxapi_vrf.py
+Name: nxapi_vlan.py
 Author: Allen Robel (arobel@cisco.com)
 Summary: Classes containing methods for retrieving vlan information
 
@@ -50,10 +50,64 @@ print('media_type {}'.format(nx.media_type))
 print('type {}'.format(nx.type))
 print('mode {}'.format(nx.mode))
 
+NxapiVlanTable() collects many vlans in a single request, rather than one
+request per vlan.  If nx.vlans is set (a list of int()), the request is
+"show vlan id <ranges>", with the vlans compressed into ranges e.g.
+"show vlan id 10-20,30".  Otherwise, the request is "show vlan".
+
+The output is parsed in one pass into nx.info, keyed on int() vlan id, with
+keys renamed through map_keys (the same names as NxapiVlanId), plus 'ports',
+the set() of interfaces in the vlan, with NX-OS interface ranges expanded
+(e.g. Ethernet1/1-3 -> Ethernet1/1, Ethernet1/2, Ethernet1/3).  nx.port_vlans
+is the reverse index, interface -> set() of vlan ids.
+
+    switch# show vlan | json-pretty
+    {
+        "TABLE_vlanbrief": {
+            "ROW_vlanbrief": [
+                {
+                    "vlanshowbr-vlanid": "1",
+                    "vlanshowbr-vlanid-utf": "1",
+                    "vlanshowbr-vlanname": "default",
+                    "vlanshowbr-vlanstate": "active",
+                    "vlanshowbr-shutstate": "noshutdown",
+                    "vlanshowplist-ifidx": "Ethernet1/1-3,Ethernet1/53"
+                },
+                etc...
+            ]
+        },
+        "TABLE_mtuinfo": {
+            "ROW_mtuinfo": [
+                {
+                    "vlanshowinfo-vlanid": "1",
+                    "vlanshowinfo-media-type": "enet",
+                    "vlanshowinfo-vlanmode": "ce-vlan"
+                },
+                etc...
+            ]
+        }
+    }
+
+Synopsis:
+
+from nxapi_netbox.nxapi.nxapi_vlan import NxapiVlanTable
+from nxapi_netbox.general.log import get_logger
+
+log = get_logger('my_script_name', 'INFO', 'DEBUG')
+nx = NxapiVlanTable('myusername','mypassword','myip', log)
+nx.nxapi_init()
+nx.vlans = list(range(2, 3001))  # optional.  If not set, all vlans are collected.  If empty, none are
+nx.refresh()
+print('missing vlans {}'.format(nx.missing))
+for vlan in nx.vlan_ids:
+    nx.vlan = vlan
+    print('{} {} {} {}'.format(nx.vlan, nx.name, nx.state, sorted(nx.ports)))
+print('vlans on Ethernet1/1 {}'.format(sorted(nx.port_vlans.get('Ethernet1/1', set()))))
 '''
-our_version = 104
+our_version = 106
 
 # local libraries
+from nxapi_netbox.general.util import expand_interface_ranges, ranges_to_str
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
 class NxapiVlanId(NxapiBase):
@@ -218,3 +272,143 @@ class NxapiVlanId(NxapiBase):
             return self.info['id_utf']
         except:
             return False
+
+
+class NxapiVlanTable(NxapiBase):
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_name = 'NxapiVlanTable'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        # vlan id -> dict(), see library header
+        self.info = dict()
+        # interface -> set() of vlan ids
+        self.port_vlans = dict()
+        # list of int() vlans to collect.  None collects all vlans.  An empty list collects none
+        self.vlans = None
+        self._vlan = None
+        self.map_keys = dict()
+        self.map_keys['vlanshowbr-vlanid'] = 'id'
+        self.map_keys['vlanshowbr-vlanid-utf'] = 'id_utf'
+        self.map_keys['vlanshowbr-vlanname'] = 'name'
+        self.map_keys['vlanshowbr-vlanstate'] = 'state'
+        self.map_keys['vlanshowbr-shutstate'] = 'shut_state'
+        self.map_keys['vlanshowplist-ifidx'] = 'interfaces'
+        self.map_keys['vlanshowinfo-vlanid'] = 'id'
+        self.map_keys['vlanshowinfo-media-type'] = 'media_type'
+        self.map_keys['vlanshowinfo-vlanmode'] = 'mode'
+        # show vlan, show vlan id <ranges>
+        self.tables = [
+            ('TABLE_vlanbrief', 'ROW_vlanbrief', 'vlanshowbr-vlanid'),
+            ('TABLE_vlanbriefid', 'ROW_vlanbriefid', 'vlanshowbr-vlanid'),
+            ('TABLE_mtuinfo', 'ROW_mtuinfo', 'vlanshowinfo-vlanid'),
+            ('TABLE_mtuinfoid', 'ROW_mtuinfoid', 'vlanshowinfo-vlanid'),
+        ]
+
+    def refresh(self):
+        if self.vlans is not None and len(self.vlans) == 0:
+            # "show vlan id " is not a valid cli.  No vlans requested, so return an empty table
+            self.log.debug(f"{self.log_prefix} {self.hostname} self.vlans is empty. Skipping request.")
+            self.info = dict()
+            self.port_vlans = dict()
+            return
+        if self.vlans is None:
+            self.cli = 'show vlan'
+        else:
+            self.cli = 'show vlan id {}'.format(ranges_to_str(self.vlans))
+        self.show(self.cli)
+        self.make_info_dict()
+
+    def _populate_from_rows(self, _rows, _id_key):
+        for _dict in self._convert_to_list(_rows):
+            try:
+                _vlan = int(_dict[_id_key])
+            except:
+                self.log.debug('{} {} skipping. Unable to get int() {} from _dict {}'.format(self.log_prefix, self.hostname, _id_key, _dict))
+                continue
+            if _vlan not in self.info:
+                self.info[_vlan] = dict()
+                self.info[_vlan]['ports'] = set()
+            _info = self.info[_vlan]
+            for _key in _dict:
+                if _key in self.map_keys:
+                    _info[self.map_keys[_key]] = _dict[_key]
+            if 'vlanshowplist-ifidx' not in _dict:
+                continue
+            _info['ports'] = expand_interface_ranges(_dict['vlanshowplist-ifidx'])
+            for _port in _info['ports']:
+                if _port not in self.port_vlans:
+                    self.port_vlans[_port] = set()
+                self.port_vlans[_port].add(_vlan)
+
+    def make_info_dict(self):
+        self.info = dict()
+        self.port_vlans = dict()
+        if not self._verify_body_length():
+            return
+        for _table, _row, _id_key in self.tables:
+            try:
+                _rows = self.body[0][_table][_row]
+            except:
+                continue
+            self._populate_from_rows(_rows, _id_key)
+
+    @property
+    def missing(self):
+        '''
+        sorted list of the vlans in self.vlans that are not present on the switch
+        '''
+        if self.vlans is None:
+            return list()
+        return sorted(set(self.vlans).difference(self.info))
+
+    @property
+    def vlan_ids(self):
+        return sorted(self.info.keys())
+
+    def _get(self, _key, _default=False):
+        try:
+            return self.info[self.vlan][_key]
+        except:
+            return _default
+
+    @property
+    def interfaces(self):
+        return self._get('interfaces')
+
+    @property
+    def media_type(self):
+        return self._get('media_type')
+
+    @property
+    def mode(self):
+        return self._get('mode')
+
+    @property
+    def name(self):
+        return self._get('name')
+
+    @property
+    def ports(self):
+        return self._get('ports', set())
+
+    @property
+    def shut_state(self):
+        return self._get('shut_state')
+
+    @property
+    def state(self):
+        return self._get('state')
+
+    @property
+    def vlan(self):
+        '''
+        the vlan id whose values are returned by the read-only properties
+        '''
+        return self._vlan
+    @vlan.setter
+    def vlan(self, _x):
+        if not self.verify.is_digits(_x):
+            self.log.error('Exiting.  vlan must be digits. Got {}.'.format(_x))
+            exit(1)
+        self._vlan = int(_x)
@@ -4,11 +4,20 @@ Author: Allen Robel (arobel@cisco.com)
 Description: methods which collect/return information about vpc consistency parameters
 
 Example usage:
+
+Bulk per-interface consistency check (all vpc port-channels, batched):
+
+nx = NxapiVpcConsistencyInterfaces('admin', 'mypassword', '192.168.1.1', log)
+nx.nxapi_init()
+nx.refresh()
+for interface, params in nx.inconsistent_params.items():
+    print(interface, params)
 '''
 import re
+from nxapi_netbox.general.util import batch_cli
 from nxapi_netbox.nxapi.nxapi_base import NxapiBase
 
-our_version = 107
+our_version = 108
 
 class NxapiVpcConsistency(NxapiBase):
     '''
@@ -296,3 +305,100 @@ class NxapiVpcConsistencyInterface(NxapiVpcConsistency):
     @interface.setter
     def interface(self, _x):
         self._interface = _x
+
+
+class NxapiVpcConsistencyInterfaces(NxapiVpcConsistency):
+    '''
+    Bulk version of NxapiVpcConsistencyInterface().
+
+    Sends "show vpc consistency-parameters interface <port-channel>" for every
+    port-channel in self.interfaces, batched with batch_cli() so that each request
+    contains at most self.max_batch_commands cli and self.max_batch_length characters.
+
+    If self.interfaces is not set before refresh(), it is populated from "show vpc"
+    (the vpc-ifindex of each ROW_vpc), i.e. all vpc port-channels are checked.
+    Alternatively, set it from a refreshed NxapiVpcStatus() instance with:
+
+        nx.interfaces_from_vpc_status(nx_vpc_status)
+
+    self.info is a dict() keyed on port-channel.  Each value is a list() of
+    ROW_vpc_consistency dict(), with the same structure as NxapiVpcConsistency().info
+
+    self.errors is a dict() keyed on port-channel, for port-channels whose
+    output did not contain TABLE_vpc_consistency.  Value is the error reason.
+
+    inconsistent_params and all_params return dict() keyed on port-channel.
+    '''
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.class_name = 'NxapiVpcConsistencyInterfaces'
+        self.param_type = 'interface'
+        self.interfaces = None
+        self.max_batch_commands = 10
+        self.max_batch_length = 4096
+        self.errors = dict()
+
+    def interfaces_from_vpc_status(self, nx_vpc_status):
+        '''
+        set self.interfaces from NxapiVpcStatus().vpc, populated by NxapiVpcStatus().make_vpc_dict()
+        '''
+        self.interfaces = list()
+        for d in nx_vpc_status.vpc:
+            if 'vpc-ifindex' in d:
+                self.interfaces.append(d['vpc-ifindex'])
+
+    def discover_interfaces(self):
+        self.interfaces = list()
+        self.show('show vpc')
+        if self.body_length != 1:
+            self.log.error('{} early return: unexpected body_length {}'.format(self.hostname, self.body_length))
+            return
+        try:
+            vpc_list = self._convert_to_list(self.body[0]['TABLE_vpc']['ROW_vpc'])
+        except:
+            self.log.debug('{} no vpcs in show vpc'.format(self.hostname))
+            return
+        for d in vpc_list:
+            if 'vpc-ifindex' in d:
+                self.interfaces.append(d['vpc-ifindex'])
+
+    def refresh(self):
+        self.info = dict()
+        self.errors = dict()
+        self.error = dict()
+        self.error_reason = None
+        if self.interfaces == None:
+            self.discover_interfaces()
+        cli_dict = dict()
+        for interface in self.interfaces:
+            cli_dict['show vpc consistency-parameters interface {}'.format(interface)] = interface
+        for batch in batch_cli(list(cli_dict.keys()), self.max_batch_commands, self.max_batch_length):
+            self.cli = ' ; '.join(batch)
+            self.show()
+            if self.body_length != len(batch):
+                self.log.error('{} skipping batch: expected body_length {}. Got {}'.format(self.hostname, len(batch), self.body_length))
+                for cli in batch:
+                    self.errors[cli_dict[cli]] = 'no response'
+                continue
+            for cli, body in zip(batch, self.body):
+                self.make_interface_info(cli_dict[cli], body)
+
+    def make_interface_info(self, interface, body):
+        try:
+            self.info[interface] = self._convert_to_list(body['TABLE_vpc_consistency']['ROW_vpc_consistency'])
+        except:
+            self.errors[interface] = '{} {} is not a vpc port-channel?'.format(self.hostname, interface)
+            self.log.debug(self.errors[interface])
+
+    @property
+    def inconsistent_params(self):
+        self._inconsistent_params = dict()
+        for interface in self.info:
+            for d in self.info[interface]:
+                if d.get('vpc-param-local-val') != d.get('vpc-param-peer-val'):
+                    self._inconsistent_params.setdefault(interface, list()).append(d)
+        return self._inconsistent_params
+
+    @property
+    def all_params(self):
+        return self.info
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+'''
+Name: nxapi_vpc_domain.py
+Author: Allen Robel (arobel@cisco.com)
+Description: Collect vpc status and all vpc consistency-parameter scopes in one request per switch,
+             pair vpc peers, and diff their consistency parameters.
+
+NxapiVpcDomainMember() sends the following cli in a single NXAPI request:
+
+    show vpc ;
+    show vpc role ;
+    show vpc consistency-parameters global ;
+    show vpc consistency-parameters vni ;
+    show vpc consistency-parameters vlans ;
+    show vpc consistency-parameters interface <vpc port-channel> ; (one per vpc)
+
+The vpc port-channels are learned from "show vpc" in the previous refresh().
+On the first refresh() of an instance, they are not yet known, so "show vpc"
+is sent once on its own beforehand (unless vpc_interfaces is set by the caller).
+
+Each scope is parsed into a dict() keyed on (scope, vpc-param-name), where scope
+is 'global', 'vni', or, for interface parameters, 'vpc <vpc id>' (e.g. 'vpc 10').
+Interface parameters are keyed on the vpc id rather than the port-channel,
+since vpc peers can use different port-channel numbers for the same vpc.
+
+    member.params[(scope, name)] = {
+        'type': vpc-param-type,
+        'local': vpc-param-local-val,
+        'peer': vpc-param-peer-val,
+        'interface': the local vpc port-channel (e.g. 'Po10'), or 'na' for global and vni
+    }
+
+VpcDomain() takes any number of refreshed NxapiVpcDomainMember() instances,
+pairs them on (vpc domain id, vpc system mac), and for each pair computes the
+inconsistency set as a keyed diff.  Each key is reported at most once, as the
+first of the following that applies:
+
+    - 'cross-peer'  member A's local value differs from member B's local value
+    - 'local/peer'  a member's local value differs from the value it sees on its peer
+    - 'missing'     the key is present on one member only
+    - 'vlans'       show vpc consistency-parameters vlans reason_code is not SUCCESS
+                    (reported once if both members report the same reason)
+
+Synopsis:
+
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.nxapi.nxapi_vpc_domain import NxapiVpcDomainMember, VpcDomain
+
+log = get_logger('my_script', 'INFO', 'DEBUG')
+domain = VpcDomain(log)
+for ip in ['192.168.1.1', '192.168.1.2']:
+    nx = NxapiVpcDomainMember('admin', 'mypassword', ip, log)
+    nx.nxapi_init()
+    nx.refresh()
+    domain.add(nx)
+domain.build()
+for pair in domain.pairs:
+    for item in domain.inconsistencies(pair):
+        print(pair, item)
+
+See also: scripts/vpc_domain_check.py
+'''
+our_version = 101
+
+# standard libraries
+# local libraries
+from nxapi_netbox.nxapi.nxapi_base import NxapiBase
+
+class NxapiVpcDomainMember(NxapiBase):
+    def __init__(self, username, password, mgmt_ip, _log):
+        super().__init__(username, password, mgmt_ip, _log)
+        self.lib_version = our_version
+        self.lib_name = 'NxapiVpcDomainMember'
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.timeout = 20
+        self.scopes = ['global', 'vni']
+        # list of vpc port-channels, learned from show vpc.  None until known.
+        self.vpc_interfaces = None
+        self._clear()
+
+    def _clear(self):
+        self.status = dict()
+        self.role = dict()
+        self.params = dict()
+        self.vlans = list()
+        self.vpcs = dict()
+
+    def make_cli_list(self):
+        '''
+        returns a list of tuples (scope, cli) in the order the cli are sent
+        '''
+        _cli_list = list()
+        _cli_list.append(('status', 'show vpc'))
+        _cli_list.append(('role', 'show vpc role'))
+        for _scope in self.scopes:
+            _cli_list.append((_scope, f"show vpc consistency-parameters {_scope}"))
+        _cli_list.append(('vlans', 'show vpc consistency-parameters vlans'))
+        for _interface in self.vpc_interfaces or list():
+            _cli_list.append((_interface, f"show vpc consistency-parameters interface {_interface}"))
+        return _cli_list
+
+    def discover_vpc_interfaces(self):
+        self.show('show vpc')
+        if not self._verify_body_length():
+            self.vpc_interfaces = list()
+            return
+        self.vpc_interfaces = self._get_vpc_interfaces(self.body[0])
+
+    def _get_vpc_interfaces(self, _body):
+        if 'TABLE_vpc' not in _body:
+            return list()
+        _list = self._get_table_row('vpc', _body)
+        if _list == False:
+            return list()
+        return [_dict['vpc-ifindex'] for _dict in _list if 'vpc-ifindex' in _dict]
+
+    def refresh(self):
+        if self.vpc_interfaces is None:
+            self.discover_vpc_interfaces()
+        _cli_list = self.make_cli_list()
+        self.cli = ' ; '.join([_item[1] for _item in _cli_list])
+        self.show(self.cli)
+        self._clear()
+        if self.body_length != len(_cli_list):
+            msg = f"{self.log_prefix} {self.hostname} early return:"
+            msg += f" expected body_length {len(_cli_list)}."
+            msg += f" Got {self.body_length}. Is feature vpc enabled?"
+            self.log.error(msg)
+            return
+        for _body, (_scope, _cli) in zip(self.body, _cli_list):
+            if _scope == 'status':
+                self.make_status_dict(_body)
+            elif _scope == 'role':
+                self.role = _body
+            elif _scope == 'vlans':
+                self.make_vlans_list(_body)
+            else:
+                self.make_params_dict(_scope, _body)
+        # pick up vpcs added or removed since the last refresh() next time
+        self.vpc_interfaces = list(self.vpcs.keys())
+
+    def make_status_dict(self, _body):
+        '''
+        self.status = show vpc, minus TABLE_*
+        self.vpcs[vpc-ifindex] = ROW_vpc dict()
+        '''
+        self.status = {_key: _value for _key, _value in _body.items() if not _key.startswith('TABLE_')}
+        if 'TABLE_vpc' not in _body:
+            return
+        _list = self._get_table_row('vpc', _body)
+        if _list == False:
+            return
+        for _dict in _list:
+            if 'vpc-ifindex' in _dict:
+                self.vpcs[_dict['vpc-ifindex']] = _dict
+
+    def make_params_dict(self, _scope, _body):
+        if 'TABLE_vpc_consistency' not in _body:
+            self.log.debug(f"{self.log_prefix} {self.hostname} no consistency parameters for {_scope}")
+            return
+        _list = self._get_table_row('vpc_consistency', _body)
+        if _list == False:
+            return
+        _interface = 'na'
+        if _scope not in self.scopes:
+            # interface scope.  self.vpcs is populated first, since show vpc is sent first
+            _interface = _scope
+            _scope = self.vpc_scope(_interface)
+        for _dict in _list:
+            if 'vpc-param-name' not in _dict:
+                continue
+            self.params[(_scope, _dict['vpc-param-name'])] = {
+                'type': _dict.get('vpc-param-type', 'na'),
+                'local': _dict.get('vpc-param-local-val', 'na'),
+                'peer': _dict.get('vpc-param-peer-val', 'na'),
+                'interface': _interface,
+            }
+
+    def vpc_scope(self, _interface):
+        '''
+        return the params scope of vpc port-channel _interface, i.e. 'vpc <vpc id>',
+        or _interface if its vpc id is not known
+        '''
+        try:
+            return f"vpc {self.vpcs[_interface]['vpc-id']}"
+        except:
+            self.log.debug(f"{self.log_prefix} {self.hostname} vpc id of {_interface} not found")
+            return _interface
+
+    def make_vlans_list(self, _body):
+        if 'TABLE_vpc_consistency' not in _body:
+            return
+        _list = self._get_table_row('vpc_consistency', _body)
+        if _list == False:
+            return
+        self.vlans = _list
+
+    @property
+    def domain_id(self):
+        try:
+            return self.status['vpc-domain-id']
+        except:
+            return 'na'
+
+    @property
+    def system_mac(self):
+        try:
+            return self.role['vpc-system-mac']
+        except:
+            return 'na'
+
+    @property
+    def vpc_role(self):
+        try:
+            return self.role['vpc-current-role']
+        except:
+            try:
+                return self.status['vpc-role']
+            except:
+                return 'na'
+
+    @property
+    def peer_status(self):
+        try:
+            return self.status['vpc-peer-status']
+        except:
+            return 'na'
+
+
+class VpcDomain(object):
+    '''
+    Pair refreshed NxapiVpcDomainMember() instances and diff their consistency parameters.
+    See the library header for details.
+    '''
+    def __init__(self, log):
+        self.lib_name = 'VpcDomain'
+        self.lib_version = our_version
+        self.log_prefix = f"{self.lib_name}_{self.lib_version}"
+        self.log = log
+        self.members = dict()
+        # list of tuples (hostname, hostname), or (hostname, None) if a member's peer was not collected
+        self.pairs = list()
+
+    def add(self, nx):
+        '''
+        add a refreshed NxapiVpcDomainMember() instance
+        '''
+        self.members[nx.hostname] = nx
+
+    def build(self):
+        _domains = dict()
+        for _hostname, _nx in self.members.items():
+            if _nx.domain_id == 'na':
+                self.log.debug(f"{self.log_prefix} {_hostname} skipping. vpc domain not found.")
+                continue
+            _domains.setdefault((_nx.domain_id, _nx.system_mac), list()).append(_hostname)
+        self.pairs = list()
+        for _key, _hostnames in sorted(_domains.items()):
+            _hostnames = sorted(_hostnames)
+            if len(_hostnames) > 2:
+                msg = f"{self.log_prefix} domain {_key} has more than two members {_hostnames}."
+                msg += " Are the same vpc domain id and system mac configured in multiple domains?"
+                self.log.warning(msg)
+            if len(_hostnames) == 1:
+                self.pairs.append((_hostnames[0], None))
+                continue
+            self.pairs.append((_hostnames[0], _hostnames[1]))
+
+    def _vlans_inconsistencies(self, pair):
+        _result = list()
+        _seen = set()
+        for _hostname in pair:
+            if _hostname is None:
+                continue
+            for _dict in self.members[_hostname].vlans:
+                if _dict.get('reason_code', 'SUCCESS') == 'SUCCESS':
+                    continue
+                _item = (_dict.get('vpc-param-name', 'na'), _dict.get('reason_code'), _dict.get('vpc-pass-vlans', 'na'))
+                if _item in _seen:
+                    continue
+                _seen.add(_item)
+                _result.append(('vlans', _hostname, 'vlans') + _item)
+        return _result
+
+    def inconsistencies(self, pair):
+        '''
+        return a list of tuples (kind, hostname, scope, name, value_a, value_b) for pair.
+        See the library header for the values of kind.
+        '''
+        _result = list()
+        _a, _b = pair
+        if _b is None:
+            for (_scope, _name), _param in sorted(self.members[_a].params.items()):
+                if _param['local'] != _param['peer']:
+                    _result.append(('local/peer', _a, _scope, _name, _param['local'], _param['peer']))
+            return _result + self._vlans_inconsistencies(pair)
+        _params_a = self.members[_a].params
+        _params_b = self.members[_b].params
+        for _key in sorted(_params_a.keys() | _params_b.keys()):
+            _scope, _name = _key
+            if _key not in _params_b:
+                _result.append(('missing', _b, _scope, _name, _params_a[_key]['local'], 'na'))
+                continue
+            if _key not in _params_a:
+                _result.append(('missing', _a, _scope, _name, 'na', _params_b[_key]['local']))
+                continue
+            _param_a = _params_a[_key]
+            _param_b = _params_b[_key]
+            if _param_a['local'] != _param_b['local']:
+                _result.append(('cross-peer', f"{_a}/{_b}", _scope, _name, _param_a['local'], _param_b['local']))
+            elif _param_a['local'] != _param_a['peer']:
+                _result.append(('local/peer', _a, _scope, _name, _param_a['local'], _param_a['peer']))
+            elif _param_b['local'] != _param_b['peer']:
+                _result.append(('local/peer', _b, _scope, _name, _param_b['local'], _param_b['peer']))
+        return _result + self._vlans_inconsistencies(pair)
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-our_version = 109
+our_version = 110
 script_name = "acl_utilization"
 """
 Name: acl_utilization.py
@@ -63,7 +63,7 @@ from nxapi_netbox.general.log import get_logger
 from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
 from nxapi_netbox.vault.vault import get_vault
 from nxapi_netbox.nxapi.nxapi_system_internal_access_list_resource_utilization import (
-    NxapiAccessListResourceUtilization,
+    NxapiAccessListResourceUtilizationModules,
 )
 
 
@@ -77,7 +77,7 @@ def get_parser():
     ex_type = "{} --type max_used".format(ex_prefix)
     ex_ge = "{} --ge 3200".format(ex_prefix)
     ex_le = "{} --le 80.40".format(ex_prefix)
-    help_modules = "Comma-separated list of modules/linecards to query."
+    help_modules = "Comma-separated list of modules/linecards to query, or all to query all line cards. All modules are queried in a single request."
     ex_modules = "{} --modules 1,2,3".format(ex_prefix)
 
     parser = argparse.ArgumentParser(
@@ -91,7 +91,7 @@ def get_parser():
         "--modules",
         dest="modules",
         required=False,
-        default=1,
+        default="all",
         help="(default: %(default)s) " + help_modules + ex_modules,
     )
 
@@ -161,33 +161,23 @@ def print_header():
         )
 
 
-def get_item(nx):
-    item = -1
-    if cfg.type == "max_used":
-        item = nx.max_used
-    elif cfg.type == "min_used":
-        item = nx.min_used
-    elif cfg.type == "max_free":
-        item = nx.max_free
-    elif cfg.type == "min_free":
-        item = nx.min_free
-    elif cfg.type == "max_percent":
-        item = nx.max_percent
-    elif cfg.type == "min_percent":
-        item = nx.min_percent
-    elif cfg.type == "all_used":
-        item = nx.all_used
-    elif cfg.type == "all_free":
-        item = nx.all_free
-    elif cfg.type == "all_percent":
-        item = nx.all_percent
-    if item == -1:
+def get_item(instances):
+    """
+    instances is a dict() keyed on tcam instance, whose values are dict() with keys used, free, percent
+    """
+    scope, field = cfg.type.split("_")
+    values = dict()
+    for instance in instances:
+        if instances[instance][field] == -1:
+            return None
+        values[instance] = instances[instance][field]
+    if len(values) == 0:
         return None
-    if isinstance(item, dict):
-        for instance in item:
-            if item[instance] == -1:
-                return None
-    return item
+    if scope == "all":
+        return values
+    if scope == "max":
+        return max(values.values())
+    return min(values.values())
 
 
 def is_within_threshold(item):
@@ -204,62 +194,75 @@ def is_within_threshold(item):
     return False
 
 
-def get_all_type(nx, ip, item):
+def get_all_type(nx, ip, module, feature, item):
     lines = list()
     for instance in item:
         if not is_within_threshold(item[instance]):
             continue
         lines.append(
             "{:<15} {:<20} {:>11} {:>6} {:>8} {:<36}".format(
-                ip, nx.hostname, item[instance], nx.module, instance, nx.feature
+                ip, nx.hostname, item[instance], module, instance, feature
             )
         )
     return lines
 
 
-def get_max_min_type(nx, ip, item):
+def get_max_min_type(nx, ip, module, feature, item):
     lines = list()
     if not is_within_threshold(item):
         return list()
     lines.append(
         "{:<15} {:<20} {:>11} {:>6} {:<36}".format(
-            ip, nx.hostname, item, nx.module, nx.feature
+            ip, nx.hostname, item, module, feature
         )
     )
     return lines
 
 
-def print_item(nx, ip):
-    item = get_item(nx)
+def print_item(nx, ip, module, feature, instances):
+    item = get_item(instances)
     if item == None:
         return list()
     if "all" in cfg.type:
-        return get_all_type(nx, ip, item)
+        return get_all_type(nx, ip, module, feature, item)
     else:
-        return get_max_min_type(nx, ip, item)
-
-
-def get_items(nx, ip, modules):
-    for module in modules:
-        nx.module = module
-        nx.refresh()
-        lines = list()
-        for feature in nx.features:
-            nx.feature = feature
-            lines += print_item(nx, ip)
+        return get_max_min_type(nx, ip, module, feature, item)
+
+
+def get_items(nx, ip):
+    """
+    nx.table is sorted on (module, feature, instance).  Group it on (module, feature)
+    so that max_* and min_* types are computed across tcam instances.
+    """
+    groups = dict()
+    for module, feature, instance, used, free, percent in nx.table:
+        key = (module, feature)
+        if key not in groups:
+            groups[key] = dict()
+        groups[key][instance] = {"used": used, "free": free, "percent": percent}
+    lines = list()
+    for module, feature in sorted(groups):
+        lines += print_item(nx, ip, module, feature, groups[(module, feature)])
     return lines
 
 
 def worker(device, vault, modules):
     ip = get_device_mgmt_ip(nb, device)
-    nx = NxapiAccessListResourceUtilization(
+    nx = NxapiAccessListResourceUtilizationModules(
         vault.nxos_username, vault.nxos_password, ip, log
     )
     nx.nxapi_init(cfg)
-    return get_items(nx, ip, modules)
+    nx.modules = modules
+    nx.refresh()
+    return get_items(nx, ip)
 
 
 def get_modules():
+    """
+    returns None if --modules is all, in which case line cards are discovered per device
+    """
+    if str(cfg.modules) == "all":
+        return None
     modules = list()
     for item in str(cfg.modules).split(","):
         try:
@@ -269,6 +272,7 @@ def get_modules():
             log.error("Usage examples:")
             log.error("    --modules 3")
             log.error("    --modules 1,2,4")
+            log.error("    --modules all")
             exit(1)
     return modules
 
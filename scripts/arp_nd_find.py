@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Name: arp_nd_find.py
+Description: NXAPI: find an ip/ipv6 address, subnet, or mac address in the arp and ipv6 neighbor tables (all vrfs) of --devices
+
+Each switch is queried once per address-family ("show ip arp vrf all",
+"show ipv6 neighbor vrf all"), and entries are stored in compact sorted
+arrays (see general/address_table.py), so lookups are binary searches even
+on switches with 100k+ entries.
+
+Example usage:
+
+./arp_nd_find.py --vault hashicorp --devices cvd_bgw_1,cvd_bgw_2 --address 10.1.1.2
+./arp_nd_find.py --vault hashicorp --devices cvd_bgw_1,cvd_bgw_2 --subnet 10.1.0.0/16 --vrf TENANT1
+./arp_nd_find.py --vault hashicorp --devices cvd_bgw_1,cvd_bgw_2 --mac 0050.56a1.0c2e
+
+Example output:
+
+% ./arp_nd_find.py --vault hashicorp --devices cvd_bgw_1 --mac 0050.56a1.0c2e
+ip              hostname             vrf             address                                  mac             interface
+192.168.11.110  cvd-1111-bgw         TENANT1         10.1.1.2                                 0050.56a1.0c2e  Vlan10
+192.168.11.110  cvd-1111-bgw         TENANT1         2001:10:1:1::2                           0050.56a1.0c2e  Vlan10
+"""
+our_version = 100
+script_name = "arp_nd_find"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import ipaddress
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_arp import NxapiArpTable
+from nxapi_netbox.nxapi.nxapi_ipv6_nd import NxapiIpv6NeighborTable
+
+
+def get_parser():
+    help_address = "ipv4 or ipv6 address to find."
+    help_subnet = "ipv4 or ipv6 prefix. Display all entries within this prefix."
+    help_mac = "mac address to find, in arp and ipv6 neighbor tables."
+    help_all_vrfs = "search all vrfs.  If not present, only --vrf is searched."
+    ex_prefix = "Example: "
+    ex_address = "{} --address 10.1.1.2".format(ex_prefix)
+    ex_subnet = "{} --subnet 2001:10:1:1::/64".format(ex_prefix)
+    ex_mac = "{} --mac 0050.56a1.0c2e".format(ex_prefix)
+    ex_all_vrfs = "{} --all_vrfs".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: find an address, subnet, or mac in the arp and ipv6 neighbor tables of --devices.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+    search = mandatory.add_mutually_exclusive_group(required=True)
+
+    search.add_argument(
+        "--address",
+        dest="address",
+        default=None,
+        help="{} {}".format(help_address, ex_address),
+    )
+    search.add_argument(
+        "--subnet",
+        dest="subnet",
+        default=None,
+        help="{} {}".format(help_subnet, ex_subnet),
+    )
+    search.add_argument(
+        "--mac",
+        dest="mac",
+        default=None,
+        help="{} {}".format(help_mac, ex_mac),
+    )
+    default.add_argument(
+        "--all_vrfs",
+        dest="all_vrfs",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_all_vrfs, ex_all_vrfs),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def get_ip_versions():
+    """
+    return the list of ip versions whose tables need to be queried
+    """
+    try:
+        if cfg.address is not None:
+            return [ipaddress.ip_address(cfg.address).version]
+        if cfg.subnet is not None:
+            return [ipaddress.ip_network(cfg.subnet, strict=False).version]
+    except ValueError as e:
+        log.error("exiting. {}".format(e))
+        exit(1)
+    return [4, 6]
+
+
+def print_output(futures):
+    for future in futures:
+        output = future.result()
+        if output == None:
+            continue
+        for line in output:
+            print(line)
+
+
+def print_header():
+    print(fmt.format("ip", "hostname", "vrf", "address", "mac", "interface"))
+
+
+def search(table):
+    vrf = None
+    if not cfg.all_vrfs:
+        vrf = cfg.vrf
+    if cfg.address is not None:
+        return table.lookup_address(cfg.address, vrf)
+    if cfg.subnet is not None:
+        return table.lookup_subnet(cfg.subnet, vrf)
+    return table.lookup_mac(cfg.mac, vrf)
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    lines = list()
+    for version in ip_versions:
+        if version == 4:
+            nx = NxapiArpTable(vault.nxos_username, vault.nxos_password, ip, log)
+        else:
+            nx = NxapiIpv6NeighborTable(
+                vault.nxos_username, vault.nxos_password, ip, log
+            )
+        nx.nxapi_init(cfg)
+        nx.vrf = cfg.vrf
+        nx.vrf_all = cfg.all_vrfs
+        nx.refresh()
+        for entry in search(nx.table):
+            lines.append(
+                fmt.format(
+                    ip,
+                    nx.hostname,
+                    entry["vrf"],
+                    entry["address"],
+                    entry["mac"],
+                    entry["interface"],
+                )
+            )
+    return lines
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+ip_versions = get_ip_versions()
+
+fmt = "{:<15} {:<20} {:<15} {:<40} {:<15} {:<15}"
+print_header()
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = list()
+for device in devices:
+    args = [device, vault]
+    futures.append(executor.submit(worker, *args))
+print_output(futures)
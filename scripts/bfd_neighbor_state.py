@@ -3,17 +3,24 @@
 Name: bfd_neighbor_state.py
 Description: display bfd neighbor state for all neighbors
 
+ipv4 and ipv6 sessions are retrieved in a single request per device.
+
+If --watch <seconds> is given, the devices are polled every <seconds> and
+only state transitions (including sessions that appear or disappear) are
+displayed.
+
 Example:
 
-watch ./bfd_neighbor_state.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2
+./bfd_neighbor_state.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2
+./bfd_neighbor_state.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2 --watch 0.5
 """
-our_version = 106
+our_version = 108
 script_name = "bfd_neighbor_state"
 
 # standard libraries
 import argparse
 from concurrent.futures import ThreadPoolExecutor
-from gc import collect
+import time
 
 # local libraries
 from nxapi_netbox.args.args_cookie import ArgsCookie
@@ -21,7 +28,8 @@ from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
 from nxapi_netbox.general.log import get_logger
 from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
 from nxapi_netbox.vault.vault import get_vault
-from nxapi_netbox.nxapi.nxapi_bfd import NxapiBfdNeighbors
+from nxapi_netbox.general.util import timestamp
+from nxapi_netbox.nxapi.nxapi_bfd import NxapiBfdNeighborsDualStack
 
 
 def get_parser():
@@ -33,6 +41,17 @@ def get_parser():
     mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
     default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
 
+    help_watch = "If non-zero, poll every --watch seconds and display only bfd state transitions."
+    ex_watch = " Example: --watch 0.5"
+    default.add_argument(
+        "--watch",
+        dest="watch",
+        required=False,
+        type=float,
+        default=0,
+        help="(default: %(default)s) {} {}".format(help_watch, ex_watch),
+    )
+
     parser.add_argument(
         "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
     )
@@ -74,8 +93,8 @@ def collect_info(ip, bfd):
                 bfd.hostname,
                 local_disc,
                 bfd.intf,
-                bfd.src_ip_addr,
-                bfd.dest_ip_addr,
+                bfd.src_addr,
+                bfd.dest_addr,
                 bfd.local_state,
                 bfd.remote_state,
             )
@@ -93,15 +112,69 @@ def print_output(futures):
             print(line)
 
 
-def worker(device, vault):
+def collect_changes(bfd):
+    lines = list()
+    for local_disc, afi, old_state, new_state in bfd.state_changes():
+        # served from the previous poll for sessions that disappeared
+        intf, dest_addr = bfd.session_summary(local_disc)
+        if old_state == None:
+            old_state = ("na", "na")
+        if new_state == None:
+            new_state = ("na", "na")
+        lines.append(
+            fmt_watch.format(
+                timestamp(),
+                bfd.hostname,
+                local_disc,
+                afi,
+                intf,
+                dest_addr,
+                "{}/{}".format(*old_state),
+                "{}/{}".format(*new_state),
+            )
+        )
+    return lines
+
+
+def init_worker(device, vault):
     ip = get_device_mgmt_ip(nb, device)
-    bfd = NxapiBfdNeighbors(vault.nxos_username, vault.nxos_password, ip, log)
+    bfd = NxapiBfdNeighborsDualStack(vault.nxos_username, vault.nxos_password, ip, log)
     bfd.nxapi_init(cfg)
+    return bfd
+
+
+def worker(device, vault):
+    bfd = init_worker(device, vault)
     bfd.refresh()
-    lines = collect_info(ip, bfd)
+    lines = collect_info(bfd.mgmt_ip, bfd)
     return lines
 
 
+def watch_worker(bfd):
+    bfd.refresh()
+    return collect_changes(bfd)
+
+
+def watch(devices):
+    """
+    poll all devices every cfg.watch seconds, printing only state transitions.
+    The first poll prints every session.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(devices))
+    instances = list(executor.map(init_worker, devices, [vault] * len(devices)))
+    print(
+        fmt_watch.format(
+            "time", "DUT", "local_disc", "afi", "intf", "dest_addr", "old_state", "new_state"
+        )
+    )
+    while True:
+        poll_start = time.time()
+        for lines in executor.map(watch_worker, instances):
+            for line in lines:
+                print(line, flush=True)
+        time.sleep(max(0.0, cfg.watch - (time.time() - poll_start)))
+
+
 cfg = get_parser()
 log = get_logger(script_name, cfg.loglevel, "DEBUG")
 vault = get_vault(cfg.vault)
@@ -109,9 +182,14 @@ vault.fetch_data()
 nb = netbox(vault)
 
 fmt = "{:<15} {:<10} {:<15} {:<13} {:<13} {:<12} {:<12}"
+fmt_watch = "{:<17} {:<15} {:<10} {:<4} {:<15} {:<25} {:<11} {:<11}"
 
 devices = get_device_list()
 
+if cfg.watch > 0:
+    watch(devices)
+    exit(0)
+
 print_header()
 executor = ThreadPoolExecutor(max_workers=len(devices))
 futures = list()
@@ -2,8 +2,17 @@
 """
 Name: bgp_neighbor_prefix_received.py
 Description: NXAPI: display bgp neighbor summary info
+
+If --vrf all is specified, the summary for all vrfs is retrieved in a single
+request per device using NxapiBgpSummaryVrfAll(), and a vrf column is added
+to the output.
+
+Example usage:
+
+./bgp_neighbor_prefix_received.py --vault hashicorp --devices cvd_leaf_1 --afi ipv6
+./bgp_neighbor_prefix_received.py --vault hashicorp --devices cvd_leaf_1 --vrf all --nonzero
 """
-our_version = 109
+our_version = 110
 script_name = "bgp_neighbor_prefix_received"
 # standard libraries
 import argparse
@@ -19,6 +28,7 @@ from nxapi_netbox.nxapi.nxapi_bgp_unicast_summary import (
     NxapiBgpUnicastSummaryIpv4,
     NxapiBgpUnicastSummaryIpv6,
 )
+from nxapi_netbox.nxapi.nxapi_bgp_summary_vrf_all import NxapiBgpSummaryVrfAll
 
 
 def get_parser():
@@ -74,6 +84,9 @@ def get_device_list():
 
 
 def print_header():
+    if cfg.vrf == "all":
+        print(fmt.format("ip", "hostname", "vrf", "neighbor", "prefix_rx"))
+        return
     print(fmt.format("ip", "hostname", "neighbor", "prefix_rx"))
 
 
@@ -106,6 +119,28 @@ def collect_prefix_rx(ip, bgp):
     return lines
 
 
+def collect_prefix_rx_vrf_all(ip, bgp):
+    lines = list()
+    for key in bgp.afi_index.get(cfg.afi, list()):
+        bgp.key = key
+        try:
+            prefixreceived = int(bgp.prefixreceived)
+        except:
+            log.warning(
+                "collect_prefix_rx_vrf_all. {} skipping key {}. cannot convert bgp.prefixreceived {} to int()".format(
+                    bgp.hostname, bgp.key, bgp.prefixreceived
+                )
+            )
+            continue
+        if prefixreceived == 0 and cfg.nonzero == True:
+            continue
+        lines.append(
+            fmt.format(ip, bgp.hostname, bgp.vrf_name, bgp.peer, bgp.prefixreceived)
+        )
+    lines.append("")
+    return lines
+
+
 def get_instance(ip, vault):
     """
     return a list of NxapiBgpUnicastSummary*() instances based on cfg.afi
@@ -123,7 +158,18 @@ def get_instance(ip, vault):
         exit(1)
 
 
+def worker_vrf_all(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    instance = NxapiBgpSummaryVrfAll(vault.nxos_username, vault.nxos_password, ip, log)
+    instance.nxapi_init(cfg)
+    instance.afis = [cfg.afi]
+    instance.refresh()
+    return collect_prefix_rx_vrf_all(ip, instance)
+
+
 def worker(device, vault):
+    if cfg.vrf == "all":
+        return worker_vrf_all(device, vault)
     ip = get_device_mgmt_ip(nb, device)
     instance = get_instance(ip, vault)
     instance.nxapi_init(cfg)
@@ -133,8 +179,12 @@ def worker(device, vault):
 
 
 def get_fmt():
-    fmt_ipv6 = "{:<15} {:<18} {:<40} {:>9}"
-    fmt_ipv4 = "{:<15} {:<18} {:<15} {:>9}"
+    if cfg.vrf == "all":
+        fmt_ipv6 = "{:<15} {:<18} {:<20} {:<40} {:>9}"
+        fmt_ipv4 = "{:<15} {:<18} {:<20} {:<15} {:>9}"
+    else:
+        fmt_ipv6 = "{:<15} {:<18} {:<40} {:>9}"
+        fmt_ipv4 = "{:<15} {:<18} {:<15} {:>9}"
     if cfg.afi == "ipv4":
         return fmt_ipv4
     else:
@@ -3,10 +3,17 @@
 Name: bgp_neighbor_state.py
 Description: NXAPI: display bgp neighbor state for all neighbors
 
+If --vrf is other than default, the bgp summary of that vrf (or of all vrfs,
+if --vrf all) is retrieved in a single request per device using
+NxapiBgpSummaryVrfAll(), and a vrf column is added to the output.  The
+summary does not contain sourceif, up or resettime, so these columns are
+replaced with the session uptime.
+
 Example usage:
 
 ./bgp_neighbor_state.py --vault hashicorp --devices cvd_leaf_1
 ./nxapi_bgp_neighbor_state_sid.py --vault hashicorp --devices cvd_leaf_1 --ipv6
+./bgp_neighbor_state.py --vault hashicorp --devices cvd_leaf_1 --vrf all
 
 Example output:
 
@@ -20,7 +27,7 @@ ip                 hostname             peer        state       remote_as
 
 %
 """
-our_version = 106
+our_version = 107
 script_name = "bgp_neighbor_state"
 
 # standard libraries
@@ -37,6 +44,7 @@ from nxapi_netbox.nxapi.nxapi_bgp_neighbors import (
     NxapiBgpNeighborsIpv4,
     NxapiBgpNeighborsIpv6,
 )
+from nxapi_netbox.nxapi.nxapi_bgp_summary_vrf_all import NxapiBgpSummaryVrfAll
 
 
 def get_parser():
@@ -80,6 +88,13 @@ def get_device_list():
 
 
 def print_header():
+    if cfg.vrf != "default":
+        print(
+            fmt.format(
+                "ip", "hostname", "vrf", "peer", "state", "remote_as", "uptime"
+            )
+        )
+        return
     print(
         fmt.format(
             "ip",
@@ -123,7 +138,45 @@ def collect_info(ip, bgp):
     return lines
 
 
-def worker(ip, vault):
+def collect_info_vrf(ip, bgp):
+    lines = list()
+    for key in bgp.afi_index.get(get_afi(), list()):
+        bgp.key = key
+        lines.append(
+            fmt.format(
+                ip,
+                bgp.hostname,
+                bgp.vrf_name,
+                bgp.peer,
+                bgp.state,
+                bgp.neighboras,
+                bgp.time,
+            )
+        )
+    lines.append("")
+    return lines
+
+
+def get_afi():
+    if cfg.ipv6 == True:
+        return "ipv6"
+    return "ipv4"
+
+
+def worker_vrf(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiBgpSummaryVrfAll(vault.nxos_username, vault.nxos_password, ip, log)
+    nx.nxapi_init(cfg)
+    nx.afis = [get_afi()]
+    if cfg.vrf != "all":
+        nx.vrfs = [cfg.vrf]
+    nx.refresh()
+    return collect_info_vrf(ip, nx)
+
+
+def worker(device, vault):
+    if cfg.vrf != "default":
+        return worker_vrf(device, vault)
     ip = get_device_mgmt_ip(nb, device)
     if cfg.ipv6 == True:
         print("worker HERE 1")
@@ -146,7 +199,10 @@ nb = netbox(vault)
 
 devices = get_device_list()
 
-fmt = "{:<18} {:<20} {:<11} {:<11} {:<15} {:<5} {:<10}"
+if cfg.vrf != "default":
+    fmt = "{:<18} {:<20} {:<20} {:<15} {:<11} {:<15} {:<10}"
+else:
+    fmt = "{:<18} {:<20} {:<11} {:<11} {:<15} {:<5} {:<10}"
 print_header()
 
 executor = ThreadPoolExecutor(max_workers=len(devices))
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Name: bgp_peer_flap_tracker.py
+Description: NXAPI: poll bgp summary on an interval and display peers that flapped within --window seconds
+
+Per-peer state, uptime, and prefixes received are kept in memory in
+fixed-size ring buffers (see general/bgp_peer_tracker.py), so each
+poll costs one request per device, and the flap/churn report is
+computed from memory.
+
+Example usage:
+
+./bgp_peer_flap_tracker.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2 --afi l2vpn_evpn --interval 10 --window 3600
+
+Example output:
+
+% ./bgp_peer_flap_tracker.py --vault hashicorp --devices cvd_leaf_1 --afi l2vpn_evpn --iterations 3
+20230419_10:02:11 iteration 3
+hostname             afi          peer                  flaps state       since_change churn/s
+cvd-1311-leaf        l2vpn_evpn   10.239.0.8                1 Established        20.1    0.15
+"""
+our_version = 100
+script_name = "bgp_peer_flap_tracker"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.bgp_peer_tracker import BgpPeerTracker
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.util import timestamp
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_bgp_unicast_summary import (
+    NxapiBgpUnicastSummaryIpv4,
+    NxapiBgpUnicastSummaryIpv6,
+)
+from nxapi_netbox.nxapi.nxapi_bgp_l2vpn_evpn_summary import NxapiBgpL2vpnEvpnSummary
+
+
+def get_parser():
+    help_afi = "address family to track."
+    help_interval = "seconds between polls."
+    help_iterations = "number of polls before exiting.  0 means poll forever."
+    help_qlen = "number of samples kept per peer."
+    help_window = "display peers that flapped within the last --window seconds."
+    help_all = "if specified, display all peers, not only peers that flapped within --window."
+
+    ex_prefix = "Example: "
+    ex_afi = "{} --afi l2vpn_evpn".format(ex_prefix)
+    ex_interval = "{} --interval 30".format(ex_prefix)
+    ex_iterations = "{} --iterations 10".format(ex_prefix)
+    ex_qlen = "{} --qlen 720".format(ex_prefix)
+    ex_window = "{} --window 3600".format(ex_prefix)
+    ex_all = "{} --all".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: poll bgp summary and display peers that flapped within --window seconds.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    default.add_argument(
+        "--afi",
+        dest="afi",
+        required=False,
+        choices=["ipv4", "ipv6", "l2vpn_evpn"],
+        default="l2vpn_evpn",
+        help="(default: %(default)s) {} {}".format(help_afi, ex_afi),
+    )
+    default.add_argument(
+        "--interval",
+        dest="interval",
+        required=False,
+        type=float,
+        default=10.0,
+        help="(default: %(default)s) {} {}".format(help_interval, ex_interval),
+    )
+    default.add_argument(
+        "--iterations",
+        dest="iterations",
+        required=False,
+        type=int,
+        default=0,
+        help="(default: %(default)s) {} {}".format(help_iterations, ex_iterations),
+    )
+    default.add_argument(
+        "--qlen",
+        dest="qlen",
+        required=False,
+        type=int,
+        default=360,
+        help="(default: %(default)s) {} {}".format(help_qlen, ex_qlen),
+    )
+    default.add_argument(
+        "--window",
+        dest="window",
+        required=False,
+        type=float,
+        default=3600.0,
+        help="(default: %(default)s) {} {}".format(help_window, ex_window),
+    )
+    default.add_argument(
+        "--all",
+        dest="all",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_all, ex_all),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def get_instance(ip, vault):
+    """
+    return an NxapiBgp*Summary() instance based on cfg.afi
+    """
+    if cfg.afi == "ipv4":
+        return NxapiBgpUnicastSummaryIpv4(
+            vault.nxos_username, vault.nxos_password, ip, log
+        )
+    if cfg.afi == "ipv6":
+        return NxapiBgpUnicastSummaryIpv6(
+            vault.nxos_username, vault.nxos_password, ip, log
+        )
+    return NxapiBgpL2vpnEvpnSummary(vault.nxos_username, vault.nxos_password, ip, log)
+
+
+def init_worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    instance = get_instance(ip, vault)
+    instance.nxapi_init(cfg)
+    instance.vrf = cfg.vrf
+    return instance
+
+
+def poll_worker(instance):
+    """
+    refresh instance and return (hostname, neighbor_info) so that the
+    tracker is only updated from the main thread.
+    """
+    instance.refresh()
+    return instance.hostname, instance.neighbor_info
+
+
+def print_header():
+    print(
+        fmt.format(
+            "hostname", "afi", "peer", "flaps", "state", "since_change", "churn/s"
+        )
+    )
+
+
+def print_report(iteration):
+    print("{} iteration {}".format(timestamp(), iteration))
+    print_header()
+    if cfg.all:
+        keys = [key for key in tracker.samples if key[1] == cfg.afi]
+    else:
+        keys = tracker.flapped(window=cfg.window, afi=cfg.afi)
+    for key in sorted(keys):
+        hostname, afi, peer = key
+        print(
+            fmt.format(
+                str(hostname),
+                afi,
+                peer,
+                tracker.flaps(key, cfg.window),
+                tracker.last(key)[1],
+                "{:.1f}".format(tracker.time_since_last_change(key)),
+                "{:.2f}".format(tracker.churn_rate(key, cfg.window)),
+            )
+        )
+    print()
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+fmt = "{:<20} {:<12} {:<40} {:>5} {:<11} {:>12} {:>7}"
+tracker = BgpPeerTracker(log, cfg.qlen)
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+instances = list(executor.map(init_worker, devices, [vault] * len(devices)))
+
+iteration = 0
+while True:
+    iteration += 1
+    poll_start = time.time()
+    for hostname, neighbor_info in executor.map(poll_worker, instances):
+        tracker.update(hostname, cfg.afi, neighbor_info)
+    print_report(iteration)
+    if cfg.iterations != 0 and iteration >= cfg.iterations:
+        break
+    time.sleep(max(0.0, cfg.interval - (time.time() - poll_start)))
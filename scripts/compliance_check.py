@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Name: compliance_check.py
+Description: NXAPI: evaluate desired-state rules (NX-OS version, boot variables, system mode) and display only violations
+
+Facts are collected concurrently with one request per device (see
+nxapi/nxapi_device_facts.py), reduced to a few attributes per device, and
+evaluated against the rules in --rules (see general/compliance.py for the
+rules format and the available attributes).  Devices that comply with every
+rule are not displayed.  Devices whose facts cannot be collected are
+displayed with rule "collection".
+
+Rules that use the roles key are matched against each device's netbox role.
+
+Example usage:
+
+./compliance_check.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1 --rules /tmp/rules.yml
+
+With --cache_file, facts are served from a device facts cache and recollected
+only from devices that have reloaded since they were cached.  Note that
+system mode and the startup boot variable can change without a reload, so
+use --max_age to bound how stale they can be.
+
+Example output:
+
+hostname             rule                      attribute                 value                                    expected
+cvd_leaf_2           approved_nxos             nxos_version              9.3(9)                                   ['10.2(5)', '10.3(2)']
+cvd_leaf_2           boot_consistent           boot_consistent           False                                    True
+cvd_spine_1          not_in_maintenance        system_mode               Maintenance                              Normal
+"""
+our_version = 100
+script_name = "compliance_check"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.compliance import ComplianceEngine, device_facts_to_dict
+from nxapi_netbox.general.device_facts_cache import DeviceFactsCache
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import (
+    netbox,
+    get_device_mgmt_ip,
+    get_device_role,
+)
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_device_facts import NxapiDeviceFacts
+
+
+def get_parser():
+    help_rules = "YAML file containing the rules to evaluate.  See lib/nxapi_netbox/general/compliance.py for the format."
+    ex_rules = "Example: --rules /tmp/rules.yml"
+    help_cache_file = "If present, serve facts from this device facts cache file, recollecting only from devices that reloaded."
+    ex_cache_file = "Example: --cache_file /tmp/nxapi_device_facts.json"
+    help_max_age = "With --cache_file, recollect facts older than --max_age seconds, even if the device has not reloaded.  0 is no limit."
+    ex_max_age = "Example: --max_age 3600"
+    help_max_workers = "Maximum number of devices from which facts are collected concurrently."
+    ex_max_workers = "Example: --max_workers 50"
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: evaluate desired-state rules and display only violations",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    mandatory.add_argument(
+        "--rules",
+        dest="rules",
+        required=True,
+        help="{} {}".format(help_rules, ex_rules),
+    )
+    default.add_argument(
+        "--cache_file",
+        dest="cache_file",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_cache_file, ex_cache_file),
+    )
+    default.add_argument(
+        "--max_age",
+        dest="max_age",
+        required=False,
+        type=int,
+        default=0,
+        help="(default: %(default)s) {} {}".format(help_max_age, ex_max_age),
+    )
+    default.add_argument(
+        "--max_workers",
+        dest="max_workers",
+        required=False,
+        type=int,
+        default=100,
+        help="(default: %(default)s) {} {}".format(help_max_workers, ex_max_workers),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def worker(device, vault):
+    """
+    return (facts, error).  Only the flattened facts are returned, so the
+    NxapiDeviceFacts() instance and its bodies are released once the device
+    is collected.
+    """
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiDeviceFacts(vault.nxos_username, vault.nxos_password, ip, log)
+    try:
+        nx.nxapi_init(cfg)
+        nx.cache = cache
+        nx.refresh()
+    except SystemExit:
+        return None, "unreachable"
+    if len(nx.bodies) == 0:
+        return None, "no facts"
+    return device_facts_to_dict(nx), None
+
+
+def print_header():
+    print(fmt.format("hostname", "rule", "attribute", "value", "expected"))
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+engine = ComplianceEngine(log)
+engine.load_rules(cfg.rules)
+
+cache = None
+if cfg.cache_file != None:
+    cache = DeviceFactsCache(log)
+    cache.cache_file = cfg.cache_file
+    cache.max_age = cfg.max_age
+    cache.load()
+
+roles = dict()
+for device in devices:
+    roles[device] = get_device_role(nb, device)
+
+executor = ThreadPoolExecutor(max_workers=min(cfg.max_workers, len(devices)))
+futures = dict()
+for device in devices:
+    futures[executor.submit(worker, device, vault)] = device
+for future in as_completed(futures):
+    device = futures.pop(future)
+    facts, error = future.result()
+    if error != None:
+        engine.add_error(device, error, roles[device])
+    else:
+        engine.add_device(device, facts, roles[device])
+executor.shutdown()
+if cache != None:
+    cache.save()
+
+fmt = "{:<20} {:<25} {:<25} {:<40} {}"
+print_header()
+for device, rule, attribute, value, expected in engine.violations():
+    print(fmt.format(device, rule, attribute, str(value), str(expected)))
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Name: config_push.py
+Description: NXAPI: push a config file, or per-device configs rendered from a template, to --devices concurrently, in chunks, and display per-line failures
+
+--config_file is split into chunks of at most --max_chunk_commands lines and
+--max_chunk_length characters.  Chunks are split only before lines that are
+not indented, so indent sub-mode lines under their parent e.g.:
+
+interface Ethernet1/1
+  description uplink
+  no shutdown
+
+With --template, a config is rendered for each device from a Jinja2 template,
+with the device's Netbox context available as the variable device (see
+lib/nxapi_netbox/general/config_template.py).  Devices are fetched from Netbox
+concurrently, and rendering is done in a pool of --max_processes processes.
+Devices whose template fails to render are not configured.
+
+At most --max_workers devices are configured concurrently.  If --stop_on_failure
+is present, devices not yet started are skipped after the first failure.
+
+Synopsis:
+
+./config_push.py --vault hashicorp --devices leaf_1,leaf_2,leaf_3 --config_file /tmp/ntp.cfg --stop_on_failure
+./config_push.py --vault hashicorp --devices leaf_1,leaf_2,leaf_3 --template /tmp/ntp.j2 --dry_run
+
+Example output:
+
+device   status   chunks lines failed
+leaf_1   success  1      4     0
+leaf_2   failed   1      4     1
+leaf_3   skipped  0      0     0
+
+device   line  code  cli                            error
+leaf_2   3     400   ntp server 10.1.1.1 use-vrf foo  % Invalid vrf
+"""
+our_version = 101
+script_name = "config_push"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.config_template import ConfigTemplate
+from nxapi_netbox.general.util import file2list
+from nxapi_netbox.netbox.netbox_session import (
+    netbox,
+    get_device_mgmt_ip,
+    get_device_context,
+)
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_config import NxapiConfig, NxapiConfigFleet
+
+
+def get_parser():
+    help_config_file = "File containing the configuration to push.  One of --config_file or --template is required."
+    ex_config_file = "Example: --config_file /tmp/ntp.cfg"
+    help_template = "Jinja2 template rendered with each device's Netbox context.  One of --config_file or --template is required."
+    ex_template = "Example: --template /tmp/ntp.j2"
+    help_max_processes = "Maximum number of processes used to render --template."
+    ex_max_processes = "Example: --max_processes 8"
+    help_max_workers = "Maximum number of devices configured concurrently."
+    ex_max_workers = "Example: --max_workers 50"
+    help_max_chunk_commands = "Maximum number of config lines sent in each request."
+    ex_max_chunk_commands = "Example: --max_chunk_commands 100"
+    help_max_chunk_length = "Maximum number of characters sent in each request."
+    ex_max_chunk_length = "Example: --max_chunk_length 8192"
+    help_stop_on_failure = "If present, skip devices not yet started after the first failure."
+    ex_stop_on_failure = "Example: --stop_on_failure"
+    help_dry_run = "If present, display the chunks (or with --template, the rendered configs) that would be sent, but do not configure."
+    ex_dry_run = "Example: --dry_run"
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: push a config file, or per-device configs rendered from a template, to --devices concurrently, in chunks, and display per-line failures",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    optional = parser.add_argument_group(title="OPTIONAL SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    source = mandatory.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--config_file",
+        dest="config_file",
+        required=False,
+        default=None,
+        help="{} {}".format(help_config_file, ex_config_file),
+    )
+    source.add_argument(
+        "--template",
+        dest="template",
+        required=False,
+        default=None,
+        help="{} {}".format(help_template, ex_template),
+    )
+    optional.add_argument(
+        "--max_processes",
+        dest="max_processes",
+        required=False,
+        type=int,
+        default=os.cpu_count() or 1,
+        help="(default: %(default)s) {} {}".format(help_max_processes, ex_max_processes),
+    )
+    optional.add_argument(
+        "--max_workers",
+        dest="max_workers",
+        required=False,
+        type=int,
+        default=20,
+        help="(default: %(default)s) {} {}".format(help_max_workers, ex_max_workers),
+    )
+    optional.add_argument(
+        "--max_chunk_commands",
+        dest="max_chunk_commands",
+        required=False,
+        type=int,
+        default=200,
+        help="(default: %(default)s) {} {}".format(
+            help_max_chunk_commands, ex_max_chunk_commands
+        ),
+    )
+    optional.add_argument(
+        "--max_chunk_length",
+        dest="max_chunk_length",
+        required=False,
+        type=int,
+        default=16384,
+        help="(default: %(default)s) {} {}".format(
+            help_max_chunk_length, ex_max_chunk_length
+        ),
+    )
+    optional.add_argument(
+        "--stop_on_failure",
+        dest="stop_on_failure",
+        required=False,
+        default=False,
+        action="store_true",
+        help="{} {}".format(help_stop_on_failure, ex_stop_on_failure),
+    )
+    optional.add_argument(
+        "--dry_run",
+        dest="dry_run",
+        required=False,
+        default=False,
+        action="store_true",
+        help="{} {}".format(help_dry_run, ex_dry_run),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def verify_args():
+    for arg in ["max_workers", "max_chunk_commands", "max_chunk_length", "max_processes"]:
+        if getattr(cfg, arg) < 1:
+            log.error("exiting. --{} must be >= 1. Got {}".format(arg, getattr(cfg, arg)))
+            exit(1)
+
+
+def print_chunks(config_list):
+    c = NxapiConfig("na", "na", "na", log)
+    c.max_chunk_commands = cfg.max_chunk_commands
+    c.max_chunk_length = cfg.max_chunk_length
+    for chunk_number, chunk in enumerate(c.make_chunks(config_list), 1):
+        print("chunk {} ({} lines)".format(chunk_number, len(chunk)))
+        for line, cli in chunk:
+            print("  {:<5} {}".format(line, cli))
+
+
+def get_contexts():
+    """
+    fetch the netbox context of each device concurrently
+    """
+    executor = ThreadPoolExecutor(max_workers=min(cfg.max_workers, len(devices)))
+    contexts = list(executor.map(lambda device: get_device_context(nb, device), devices))
+    executor.shutdown()
+    return dict(zip(devices, contexts))
+
+
+def get_configs():
+    """
+    returns a tuple (dict() device -> config list, dict() device -> mgmt_ip)
+    """
+    if cfg.config_file is not None:
+        config_list = file2list(cfg.config_file)
+        configs = {device: config_list for device in devices}
+        ips = {device: get_device_mgmt_ip(nb, device) for device in devices}
+        return configs, ips
+    contexts = get_contexts()
+    template = ConfigTemplate(log)
+    template.template_file = cfg.template
+    template.max_processes = cfg.max_processes
+    configs = template.render(contexts)
+    ips = {device: contexts[device]["mgmt_ip"] for device in devices}
+    return configs, ips
+
+
+def print_results():
+    fmt = "{:<20} {:<10} {:<6} {:<5} {:<6}"
+    print(fmt.format("device", "status", "chunks", "lines", "failed"))
+    for device in devices:
+        if device not in fleet.results:
+            print(fmt.format(device, "unrendered", 0, 0, 0))
+            continue
+        result = fleet.results[device]
+        print(
+            fmt.format(
+                device,
+                result["status"],
+                result["chunks"],
+                len(result["line_results"]),
+                len(result["failed_lines"]),
+            )
+        )
+    fmt = "{:<20} {:<5} {:<5} {:<40} {}"
+    lines = list()
+    for device in devices:
+        if device not in fleet.results:
+            continue
+        for failed in fleet.results[device]["failed_lines"]:
+            error = failed["clierror"].strip()
+            if error == "":
+                error = failed["msg"]
+            lines.append(
+                fmt.format(device, failed["line"], failed["code"], failed["cli"], error)
+            )
+    if len(lines) == 0:
+        return
+    print()
+    print(fmt.format("device", "line", "code", "cli", "error"))
+    for line in lines:
+        print(line)
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+verify_args()
+
+if cfg.dry_run == True and cfg.config_file is not None:
+    print_chunks(file2list(cfg.config_file))
+    exit(0)
+
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+configs, ips = get_configs()
+
+if cfg.dry_run == True:
+    for device in devices:
+        if device not in configs:
+            continue
+        print("device {}".format(device))
+        print_chunks(configs[device])
+    exit(0)
+
+fleet = NxapiConfigFleet(vault.nxos_username, vault.nxos_password, log, cfg)
+fleet.max_workers = cfg.max_workers
+fleet.max_chunk_commands = cfg.max_chunk_commands
+fleet.max_chunk_length = cfg.max_chunk_length
+fleet.stop_on_failure = cfg.stop_on_failure
+for device in devices:
+    if device not in configs:
+        continue
+    fleet.add_device(device, ips[device], configs[device])
+
+result = fleet.push()
+print_results()
+if result == False or len(configs) != len(devices):
+    exit(1)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Name: device_facts.py
+Description: NXAPI: display static device facts (version, bootvar, modules, license host-id, system mode), served from a local cache until each device reloads
+
+Facts are collected with one request per device (see nxapi/nxapi_device_facts.py)
+and saved in --cache_file.  On later runs, only "show version" is sent to each
+device, and the cached facts are displayed unless the device has reloaded
+since they were collected (or they are older than --max_age seconds).
+
+Example usage:
+
+./device_facts.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1
+
+Example output:
+
+ip              hostname             source  uptime     nxos_version  chassis                                  serial       host_id      mode     modules
+192.168.11.102  cvd-1311-leaf        cache   15d02h11m  10.2(3)       Nexus9000 C93180YC-EX chassis            FDO21120U8N  FDO21120U8N  Normal   1
+192.168.11.103  cvd-1312-leaf        device  0d00h14m   10.2(3)       Nexus9000 C93180YC-EX chassis            FDO2112189M  FDO2112189M  Normal   1
+"""
+our_version = 100
+script_name = "device_facts"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.device_facts_cache import DeviceFactsCache
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_device_facts import NxapiDeviceFacts
+
+
+def get_parser():
+    help_cache_file = "File in which device facts are cached between runs."
+    ex_cache_file = "Example: --cache_file /tmp/facts.json"
+    help_max_age = "Recollect facts older than --max_age seconds, even if the device has not reloaded.  0 is no limit."
+    ex_max_age = "Example: --max_age 86400"
+    help_refresh = "If present, ignore cached facts and recollect them from every device."
+    ex_refresh = "Example: --refresh"
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: display static device facts, served from a local cache until each device reloads",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    default.add_argument(
+        "--cache_file",
+        dest="cache_file",
+        required=False,
+        default="/tmp/nxapi_device_facts.json",
+        help="(default: %(default)s) {} {}".format(help_cache_file, ex_cache_file),
+    )
+    default.add_argument(
+        "--max_age",
+        dest="max_age",
+        required=False,
+        type=int,
+        default=0,
+        help="(default: %(default)s) {} {}".format(help_max_age, ex_max_age),
+    )
+    default.add_argument(
+        "--refresh",
+        dest="refresh",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_refresh, ex_refresh),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def format_uptime(seconds):
+    if seconds < 0:
+        return "na"
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    return "{}d{:02d}h{:02d}m".format(days, hours, seconds // 60)
+
+
+def print_header():
+    print(
+        fmt.format(
+            "ip",
+            "hostname",
+            "source",
+            "uptime",
+            "nxos_version",
+            "chassis",
+            "serial",
+            "host_id",
+            "mode",
+            "modules",
+        )
+    )
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiDeviceFacts(vault.nxos_username, vault.nxos_password, ip, log)
+    nx.nxapi_init(cfg)
+    if cfg.refresh == True:
+        cache.remove(nx.cache_key)
+    nx.cache = cache
+    nx.refresh()
+    return fmt.format(
+        ip,
+        str(nx.hostname),
+        "cache" if nx.from_cache else "device",
+        format_uptime(nx.uptime),
+        nx.version.nxos_ver_str,
+        nx.version.chassis_id,
+        nx.version.proc_board_id,
+        str(nx.license_hostid.host_id),
+        nx.system_mode.system_mode,
+        len(nx.module_info.modinfo),
+    )
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+cache = DeviceFactsCache(log)
+cache.cache_file = cfg.cache_file
+cache.max_age = cfg.max_age
+cache.load()
+
+fmt = "{:<15} {:<20} {:<7} {:<10} {:<13} {:<40} {:<12} {:<12} {:<8} {:<7}"
+print_header()
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = [executor.submit(worker, device, vault) for device in devices]
+for future in futures:
+    print(future.result())
+executor.shutdown()
+cache.save()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Name: evpn_overlay.py
+Description: NXAPI: display evpn/vxlan overlay problems (one-sided, missing, unknown, down nve peers and non-established bgp l2vpn evpn sessions) across --devices
+
+Each device is queried once, with "show nve peers ; show nve interface nve1 detail ; show bgp l2vpn evpn summary"
+batched into a single request.  The results are joined across devices using set operations.
+
+Example usage:
+
+./evpn_overlay.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_leaf_3,cvd_bgw_1
+
+Example output:
+
+hostname             issue            remote                                   detail
+cvd-1311-leaf        one_sided        cvd-1312-leaf                            cvd-1312-leaf does not list cvd-1311-leaf as an nve peer
+cvd-1312-leaf        missing_peer     cvd-1311-leaf                            not in nve peers
+cvd-1311-leaf        unknown_peer     10.3.0.99                                not an address of any device in --devices
+cvd-1311-leaf        nve_peer_not_up  10.3.0.99                                Down
+cvd-1311-leaf        evpn_session     10.239.0.9                               Idle
+"""
+our_version = 100
+script_name = "evpn_overlay"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_evpn_overlay import NxapiEvpnOverlay, EvpnOverlayGraph
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: display evpn/vxlan overlay problems across --devices",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def print_header():
+    print(fmt.format("hostname", "issue", "remote", "detail"))
+
+
+def print_output(graph):
+    for hostname, remote in sorted(graph.one_sided()):
+        detail = "{} does not list {} as an nve peer".format(remote, hostname)
+        print(fmt.format(hostname, "one_sided", remote, detail))
+    missing = graph.missing_peers()
+    for hostname in sorted(missing):
+        for remote in sorted(missing[hostname]):
+            print(fmt.format(hostname, "missing_peer", remote, "not in nve peers"))
+    unknown = graph.unknown_peers()
+    for hostname in sorted(unknown):
+        for peer in sorted(unknown[hostname]):
+            detail = "not an address of any device in --devices"
+            print(fmt.format(hostname, "unknown_peer", peer, detail))
+    for hostname, peer, state in sorted(graph.peers_not_up()):
+        print(fmt.format(hostname, "nve_peer_not_up", peer, state))
+    for hostname, neighbor, state in sorted(graph.evpn_sessions_not_established()):
+        print(fmt.format(hostname, "evpn_session", neighbor, state))
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiEvpnOverlay(vault.nxos_username, vault.nxos_password, ip, log)
+    nx.nxapi_init(cfg)
+    nx.refresh()
+    return nx
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+fmt = "{:<20} {:<16} {:<40} {}"
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = list()
+for device in devices:
+    args = [device, vault]
+    futures.append(executor.submit(worker, *args))
+
+graph = EvpnOverlayGraph(log)
+for future in futures:
+    graph.add(future.result())
+graph.build()
+
+print_header()
+print_output(graph)
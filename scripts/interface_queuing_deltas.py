@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Name: interface_queuing_deltas.py
+Description: NXAPI: display per-interval egress queuing drop and queue depth deltas for all interfaces across --devices
+
+Queuing counters for all interfaces are retrieved with one request per device
+(or, with --interfaces, in batched requests), and devices are queried in parallel.
+After each --interval, the change in each counter is displayed per (interface, qos_group).
+
+Example usage:
+
+./interface_queuing_deltas.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2 --interval 10 --iterations 3 --non_zero
+
+Example output:
+
+hostname             interface       qos_group  interval stat                                 delta
+cvd-1311-leaf        Ethernet1/49    0              10.0 tail_drop_packets_uc                 1204
+cvd-1312-leaf        Ethernet1/1     3              10.0 q_depth_bytes_uc                   -52224
+"""
+our_version = 100
+script_name = "interface_queuing_deltas"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import math
+import time
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_interface_egress_queuing import (
+    NxapiInterfaceEgressQueuingBulk,
+)
+
+
+def get_parser():
+    help_interfaces = "Comma-separated list of interfaces to monitor. If not specified, all interfaces are monitored."
+    help_interval = "Seconds between samples."
+    help_iterations = "Number of intervals to display."
+    help_non_zero = "If present, display only non-zero deltas."
+    help_stats = "Comma-separated list of stats to display. Each stat is <type>_<unit>_<protocol>, where type is one of ecn, q_depth, tail_drop, tx, wd_tail_drop, wred_afd_tail_drop; unit is one of bytes, packets; protocol is one of mc, uc."
+
+    ex_interfaces = "Example: --interfaces Eth1/1,Eth1/2"
+    ex_interval = "Example: --interval 5"
+    ex_iterations = "Example: --iterations 10"
+    ex_non_zero = "Example: --non_zero"
+    ex_stats = "Example: --stats tail_drop_packets_uc,q_depth_bytes_uc"
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: display per-interval egress queuing drop and queue depth deltas",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    default.add_argument(
+        "--interfaces",
+        dest="interfaces",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_interfaces, ex_interfaces),
+    )
+    default.add_argument(
+        "--interval",
+        dest="interval",
+        required=False,
+        type=float,
+        default=10.0,
+        help="(default: %(default)s) {} {}".format(help_interval, ex_interval),
+    )
+    default.add_argument(
+        "--iterations",
+        dest="iterations",
+        required=False,
+        type=int,
+        default=1,
+        help="(default: %(default)s) {} {}".format(help_iterations, ex_iterations),
+    )
+    default.add_argument(
+        "--non_zero",
+        dest="non_zero",
+        required=False,
+        action="store_true",
+        default=False,
+        help="(default: %(default)s) {} {}".format(help_non_zero, ex_non_zero),
+    )
+    default.add_argument(
+        "--stats",
+        dest="stats",
+        required=False,
+        default="tail_drop_packets_uc,wd_tail_drop_packets_uc,wred_afd_tail_drop_packets_uc,q_depth_bytes_uc",
+        help="(default: %(default)s) {} {}".format(help_stats, ex_stats),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def get_stats(nx):
+    stats = cfg.stats.split(",")
+    for stat in stats:
+        if stat not in nx.columns:
+            log.error(
+                "exiting. Unknown stat {}. Expected one of {}".format(
+                    stat, ",".join(nx.columns)
+                )
+            )
+            exit(1)
+    return stats
+
+
+def print_header():
+    print(fmt.format("hostname", "interface", "qos_group", "interval", "stat", "delta"))
+
+
+def get_lines(nx):
+    lines = list()
+    interval, deltas = nx.deltas()
+    if len(deltas) == 0:
+        return lines
+    for row, (interface, qos_group) in enumerate(nx.rows):
+        for stat in stats:
+            delta = deltas[stat][row]
+            if math.isnan(delta):
+                continue
+            if cfg.non_zero == True and delta == 0:
+                continue
+            lines.append(
+                fmt.format(
+                    nx.hostname,
+                    interface,
+                    qos_group,
+                    round(interval, 1),
+                    stat,
+                    int(delta),
+                )
+            )
+    return lines
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiInterfaceEgressQueuingBulk(
+        vault.nxos_username, vault.nxos_password, ip, log
+    )
+    nx.nxapi_init(cfg)
+    if cfg.interfaces != None:
+        nx.interfaces = cfg.interfaces.split(",")
+    nx.refresh()
+    return nx
+
+
+def refresh_worker(nx):
+    nx.refresh()
+    return get_lines(nx)
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+fmt = "{:<20} {:<15} {:<10} {:>8} {:<30} {:>12}"
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = list()
+for device in devices:
+    args = [device, vault]
+    futures.append(executor.submit(worker, *args))
+collectors = [future.result() for future in futures]
+stats = get_stats(collectors[0])
+
+print_header()
+for iteration in range(cfg.iterations):
+    time.sleep(cfg.interval)
+    futures = [executor.submit(refresh_worker, nx) for nx in collectors]
+    for future in futures:
+        for line in future.result():
+            print(line)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Name: inventory_index.py
+Description: NXAPI: build a local inventory/transceiver index for --devices and search it without querying the switches
+
+With --refresh, "show inventory" and "show interface transceiver" are sent to
+each of --devices (concurrently) and the results are merged into the index
+persisted in --cache_file.  Devices whose inventory and transceivers have not
+changed since the last refresh are skipped.
+
+Without --refresh, searches are answered from --cache_file alone.  Use
+--devices all to search every device in the index.
+
+Example usage:
+
+# build/refresh the index
+./inventory_index.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1 --refresh
+
+# where is serial FIW2229030N?
+./inventory_index.py --devices all --serialnum FIW2229030N --match prefix
+
+Example output:
+
+% ./inventory_index.py --devices all --serialnum FIW2229030N --match prefix
+device          hostname             source       location        serialnum        productid        vendor
+cvd_leaf_3      cvd-1313-leaf        transceiver  Ethernet1/11    FIW2229030N-A    QSFP-100G-AOC1M  CISCO-FINISAR
+%
+"""
+our_version = 101
+script_name = "inventory_index"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.inventory_index import InventoryIndex
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_interface_transceiver import NxapiInterfaceTransceiver
+from nxapi_netbox.nxapi.nxapi_inventory import NxapiInventory
+
+
+def get_parser():
+    help_cache_file = "file in which the inventory index is persisted."
+    help_refresh = "if present, query --devices and update the index before searching."
+    help_match = "how search terms are matched against indexed values (case-insensitive)."
+    help_serialnum = "search for serialnum"
+    help_productid = "search for productid (inventory productid, transceiver cisco_product_id)"
+    help_partnum = "search for partnum (transceivers only)"
+    help_vendor = "search for transceiver vendor (transceiver name)"
+    help_type = "search for type (transceivers only)"
+
+    ex_prefix = " Example: "
+    ex_cache_file = "{} --cache_file /tmp/fabric1_inventory.json".format(ex_prefix)
+    ex_refresh = "{} --refresh".format(ex_prefix)
+    ex_match = "{} --match substring".format(ex_prefix)
+    ex_serialnum = "{} --serialnum FIW2229030N".format(ex_prefix)
+    ex_productid = "{} --productid N9K-C93180YC-EX".format(ex_prefix)
+    ex_partnum = "{} --partnum FCBN425QE1C01-C1".format(ex_prefix)
+    ex_vendor = "{} --vendor CISCO-FINISAR".format(ex_prefix)
+    ex_type = "{} --type QSFP-100G".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: build a local inventory/transceiver index and search it.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+
+    default.add_argument(
+        "--cache_file",
+        dest="cache_file",
+        required=False,
+        default="/tmp/{}.json".format(script_name),
+        help="(default: %(default)s) {} {}".format(help_cache_file, ex_cache_file),
+    )
+    default.add_argument(
+        "--refresh",
+        dest="refresh",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_refresh, ex_refresh),
+    )
+    default.add_argument(
+        "--match",
+        dest="match",
+        required=False,
+        choices=["exact", "prefix", "substring"],
+        default="exact",
+        help="(default: %(default)s) {} {}".format(help_match, ex_match),
+    )
+    for field, help_field, ex_field in [
+        ("serialnum", help_serialnum, ex_serialnum),
+        ("productid", help_productid, ex_productid),
+        ("partnum", help_partnum, ex_partnum),
+        ("vendor", help_vendor, ex_vendor),
+        ("type", help_type, ex_type),
+    ]:
+        default.add_argument(
+            "--{}".format(field),
+            dest=field,
+            required=False,
+            default=None,
+            help="(default: %(default)s) {} {}".format(help_field, ex_field),
+        )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def get_search_terms():
+    """
+    return a list of (field, value) for each search arg that was specified
+    """
+    terms = list()
+    for field in index.fields:
+        value = getattr(cfg, field)
+        if value is not None:
+            terms.append((field, value))
+    return terms
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    inventory = NxapiInventory(vault.nxos_username, vault.nxos_password, ip, log)
+    inventory.nxapi_init(cfg)
+    inventory.refresh()
+    transceiver = NxapiInterfaceTransceiver(
+        vault.nxos_username, vault.nxos_password, ip, log
+    )
+    transceiver.nxapi_init(cfg)
+    transceiver.refresh()
+    return device, ip, inventory.hostname, inventory.info, transceiver.info
+
+
+def refresh_index():
+    executor = ThreadPoolExecutor(max_workers=len(devices))
+    futures = list()
+    for device in devices:
+        args = [device, vault]
+        futures.append(executor.submit(worker, *args))
+    changed = 0
+    for future in futures:
+        device, ip, hostname, inventory_info, transceiver_info = future.result()
+        if index.update_inventory(device, ip, hostname, inventory_info):
+            changed += 1
+        if index.update_transceivers(device, ip, hostname, transceiver_info):
+            changed += 1
+    index.save()
+    log.info("{} of {} device tables changed".format(changed, 2 * len(devices)))
+
+
+def print_header():
+    print(
+        fmt.format(
+            "device", "hostname", "source", "location", "serialnum", "productid", "vendor"
+        )
+    )
+
+
+def print_output():
+    search_devices = None
+    if devices != ["all"]:
+        search_devices = devices
+    keys = set()
+    records = list()
+    for field, value in search_terms:
+        for record in index.search(field, value, cfg.match, search_devices):
+            key = (record["device"], record["source"], record["location"])
+            if key in keys:
+                continue
+            keys.add(key)
+            records.append(record)
+    print_header()
+    for record in records:
+        print(
+            fmt.format(
+                record["device"],
+                str(record["hostname"]),
+                record["source"],
+                record["location"],
+                record["serialnum"],
+                record["productid"],
+                record["vendor"],
+            )
+        )
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+
+devices = get_device_list()
+
+index = InventoryIndex(log)
+index.cache_file = cfg.cache_file
+index.load()
+
+if cfg.refresh:
+    if devices == ["all"]:
+        devices = index.devices
+    if len(devices) == 0:
+        log.error("exiting. --devices all, but {} is empty.".format(cfg.cache_file))
+        exit(1)
+    vault = get_vault(cfg.vault)
+    vault.fetch_data()
+    nb = netbox(vault)
+    refresh_index()
+
+fmt = "{:<15} {:<20} {:<12} {:<15} {:<16} {:<16} {:<16}"
+search_terms = get_search_terms()
+if len(search_terms) != 0:
+    print_output()
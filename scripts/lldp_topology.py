@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Name: lldp_topology.py
+Description: NXAPI: build a fabric-wide lldp adjacency graph for --devices and display links, asymmetric links, and unresolved neighbors
+
+The devices are swept concurrently, one "show lldp neighbors" request each.
+The graph is persisted to --cache_file.  On subsequent runs, only devices whose
+lldp neighbors changed are merged into the graph, and --devices can be a subset
+of the fabric (e.g. a single re-cabled switch) while the graph retains all
+previously swept devices.
+
+Neighbors are resolved to device names with an index built from netbox for
+all devices (name, primary ip, serial, and the hostname custom field if
+defined), with a single netbox query.  The index is persisted to --cache_file
+with the graph, and rebuilt if --refresh_index is given.  The hostnames
+learned from the sweep are used only for devices that netbox does not know.
+
+Example usage:
+
+./lldp_topology.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1
+./lldp_topology.py --vault hashicorp --devices cvd_leaf_2 --cache_file /tmp/fabric1_lldp.json --problems
+
+Example output:
+
+device               port             remote_device        remote_port      status
+cvd_leaf_1           Ethernet1/49     cvd_spine_1          Ethernet1/1      ok
+cvd_leaf_2           Ethernet1/49     cvd_spine_1          Ethernet1/3      asymmetric
+cvd_leaf_2           mgmt0            na                   Ethernet1/47     unresolved (mgmt_vlan_150)
+"""
+our_version = 101
+script_name = "lldp_topology"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip, get_devices
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_lldp import NxapiLldpNeighbors
+from nxapi_netbox.nxapi.nxapi_lldp_topology import LldpTopology
+
+
+def get_parser():
+    help_cache_file = "file in which the lldp adjacency graph is persisted between runs."
+    help_problems = "if present, display only asymmetric and unresolved adjacencies."
+    ex_prefix = " Example: "
+    ex_cache_file = "{} --cache_file /tmp/fabric1_lldp.json".format(ex_prefix)
+    ex_problems = "{} --problems".format(ex_prefix)
+    help_refresh_index = "if present, rebuild the neighbor resolution index from netbox, rather than using the index persisted in --cache_file."
+    ex_refresh_index = "{} --refresh_index".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: build a fabric-wide lldp adjacency graph for --devices.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+
+    default.add_argument(
+        "--cache_file",
+        dest="cache_file",
+        required=False,
+        default="/tmp/{}.json".format(script_name),
+        help="(default: %(default)s) {} {}".format(help_cache_file, ex_cache_file),
+    )
+    default.add_argument(
+        "--problems",
+        dest="problems",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_problems, ex_problems),
+    )
+    default.add_argument(
+        "--refresh_index",
+        dest="refresh_index",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(
+            help_refresh_index, ex_refresh_index
+        ),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def print_header():
+    print(fmt.format("device", "port", "remote_device", "remote_port", "status"))
+
+
+def print_output():
+    asymmetric = topology.asymmetric_links()
+    for key in sorted(topology.adjacency):
+        remote = topology.adjacency[key]
+        if remote["remote_device"] == None:
+            status = "unresolved ({})".format(remote["chassis_id"])
+        elif key in asymmetric:
+            status = "asymmetric"
+        else:
+            status = "ok"
+        if cfg.problems == True and status == "ok":
+            continue
+        print(
+            fmt.format(
+                key[0],
+                key[1],
+                str(remote["remote_device"] or "na"),
+                remote["remote_port"],
+                status,
+            )
+        )
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiLldpNeighbors(vault.nxos_username, vault.nxos_password, ip, log)
+    nx.nxapi_init(cfg)
+    nx.refresh()
+    return device, ip, nx.hostname, nx.info
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+fmt = "{:<20} {:<16} {:<20} {:<16} {}"
+
+topology = LldpTopology(log)
+topology.cache_file = cfg.cache_file
+topology.load()
+if cfg.refresh_index == True or len(topology.netbox_devices) == 0:
+    topology.add_netbox_devices(get_devices(nb))
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = list()
+for device in devices:
+    args = [device, vault]
+    futures.append(executor.submit(worker, *args))
+results = [future.result() for future in futures]
+
+# record all swept devices before merging, so that neighbors among
+# --devices that netbox does not know resolve regardless of completion order
+for device, ip, hostname, info in results:
+    topology.add_device(device, ip, hostname)
+changed = 0
+for device, ip, hostname, info in results:
+    if topology.update(device, info):
+        changed += 1
+topology.reresolve()
+topology.save()
+log.info("{} of {} devices changed".format(changed, len(devices)))
+
+print_header()
+print_output()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Name: locator_led.py
+Description: NXAPI: set or clear chassis, module, fan locator-leds and interface beacons on many switches concurrently
+
+Each switch receives one configuration request (all locator-led and beacon
+cli), followed by one status request to verify the result (see
+NxapiLocatorLedFleet() in nxapi/nxapi_locator_led.py).  A line is printed
+as each switch finishes.
+
+Example usage:
+
+Light the chassis locator-led and the beacons of Ethernet1/1-4 on three switches:
+
+./locator_led.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1 --chassis --interfaces Ethernet1/1-4 --state on
+
+Clear them:
+
+./locator_led.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1 --chassis --interfaces Ethernet1/1-4 --state off
+
+Example output:
+
+device               ip              status       mismatches
+cvd_leaf_2           192.168.11.103  success
+cvd_leaf_1           192.168.11.102  success
+cvd_spine_1          192.168.11.120  unverified   Ethernet1/4 expected on got na
+"""
+our_version = 100
+script_name = "locator_led"
+
+# standard libraries
+import argparse
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.util import expand_interface_ranges, expand_ranges
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_locator_led import NxapiLocatorLedFleet
+
+
+def get_parser():
+    help_state = "state to which the locator-leds and beacons are set."
+    ex_state = "Example: --state off"
+    help_chassis = "If present, set the chassis locator-led."
+    ex_chassis = "Example: --chassis"
+    help_modules = "comma-separated list of modules and module ranges whose locator-led is set."
+    ex_modules = "Example: --modules 1-2,22"
+    help_fans = "comma-separated list of fans and fan ranges whose locator-led is set."
+    ex_fans = "Example: --fans 1-3"
+    help_interfaces = "comma-separated list of interfaces and interface ranges whose beacon is set."
+    ex_interfaces = "Example: --interfaces Ethernet1/1-4,Ethernet1/49"
+    help_max_workers = "Maximum number of switches configured concurrently."
+    ex_max_workers = "Example: --max_workers 50"
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: set or clear locator-leds and interface beacons on many switches concurrently",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    mandatory.add_argument(
+        "--state",
+        dest="state",
+        required=True,
+        choices=["on", "off"],
+        help="{} {}".format(help_state, ex_state),
+    )
+    default.add_argument(
+        "--chassis",
+        dest="chassis",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_chassis, ex_chassis),
+    )
+    default.add_argument(
+        "--modules",
+        dest="modules",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_modules, ex_modules),
+    )
+    default.add_argument(
+        "--fans",
+        dest="fans",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_fans, ex_fans),
+    )
+    default.add_argument(
+        "--interfaces",
+        dest="interfaces",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_interfaces, ex_interfaces),
+    )
+    default.add_argument(
+        "--max_workers",
+        dest="max_workers",
+        required=False,
+        type=int,
+        default=20,
+        help="(default: %(default)s) {} {}".format(help_max_workers, ex_max_workers),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def get_int_list(arg, value):
+    if value == None:
+        return list()
+    try:
+        return expand_ranges(value)
+    except ValueError:
+        log.error(
+            "exiting. Cannot parse --{} {}.  Example usage: --{} 1-2,4".format(
+                arg, value, arg
+            )
+        )
+        exit(1)
+
+
+def get_interface_list():
+    if cfg.interfaces == None:
+        return list()
+    return sorted(expand_interface_ranges(cfg.interfaces))
+
+
+def print_header():
+    print(fmt.format("device", "ip", "status", "mismatches"))
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+
+modules = get_int_list("modules", cfg.modules)
+fans = get_int_list("fans", cfg.fans)
+interfaces = get_interface_list()
+if not cfg.chassis and len(modules + fans + interfaces) == 0:
+    log.error(
+        "exiting. Nothing to do.  Specify one or more of --chassis, --modules, --fans, --interfaces"
+    )
+    exit(1)
+
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+state = cfg.state == "on"
+
+fleet = NxapiLocatorLedFleet(vault.nxos_username, vault.nxos_password, log, cfg)
+fleet.max_workers = cfg.max_workers
+ips = dict()
+for device in devices:
+    ips[device] = get_device_mgmt_ip(nb, device)
+    nx = fleet.add_device(device, ips[device])
+    if cfg.chassis:
+        nx.set_chassis(state)
+    for module in modules:
+        nx.set_module(module, state)
+    for fan in fans:
+        nx.set_fan(fan, state)
+    for interface in interfaces:
+        nx.set_interface(interface, state)
+
+fmt = "{:<20} {:<15} {:<12} {}"
+print_header()
+for device, result in fleet.run():
+    mismatches = ", ".join(
+        [
+            "{} expected {} got {}".format(component, expected, actual)
+            for component, expected, actual in result["mismatches"]
+        ]
+    )
+    print(fmt.format(device, ips[device], result["status"], mismatches))
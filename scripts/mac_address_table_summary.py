@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Name: mac_address_table_summary.py
+Description: NXAPI: display mac address-table counts per vlan, port, or type, and mac moves, from one full-table request per switch
+
+Unlike mac_address_count.py, which needs one request per vlan for a per-vlan
+breakdown, the full mac address-table is retrieved once per switch (in chunks)
+and counted locally.
+
+Example usage:
+
+./mac_address_table_summary.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2 --by vlan
+./mac_address_table_summary.py --vault hashicorp --devices cvd_leaf_1 --by port
+./mac_address_table_summary.py --vault hashicorp --devices cvd_leaf_1 --moves 30
+
+Example output:
+
+% ./mac_address_table_summary.py --vault hashicorp --devices cvd_leaf_1 --by vlan
+ip              hostname           vlan             count
+192.168.11.102  cvd-1311-leaf      10                 312
+192.168.11.102  cvd-1311-leaf      11                  97
+
+% ./mac_address_table_summary.py --vault hashicorp --devices cvd_leaf_1 --moves 30
+ip              hostname           mac             vlan old_port        new_port
+192.168.11.102  cvd-1311-leaf      0050.56a1.0c2e    10 Ethernet1/11    Ethernet1/12
+"""
+our_version = 100
+script_name = "mac_address_table_summary"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_mac_address_table import NxapiMacAddressTable
+
+
+def get_parser():
+    help_by = "aggregate mac counts by vlan, port, or type (dynamic/static/secure)."
+    help_moves = "if non-zero, take two snapshots --moves seconds apart and display macs that moved between ports."
+    ex_prefix = "Example: "
+    ex_by = "{} --by port".format(ex_prefix)
+    ex_moves = "{} --moves 30".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: display mac address-table counts per vlan, port, or type, and mac moves.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    default.add_argument(
+        "--by",
+        dest="by",
+        required=False,
+        choices=["vlan", "port", "type"],
+        default="vlan",
+        help="(default: %(default)s) {} {}".format(help_by, ex_by),
+    )
+    default.add_argument(
+        "--moves",
+        dest="moves",
+        required=False,
+        type=float,
+        default=0,
+        help="(default: %(default)s) {} {}".format(help_moves, ex_moves),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def print_output(futures):
+    for future in futures:
+        output = future.result()
+        if output == None:
+            continue
+        for line in output:
+            print(line)
+
+
+def print_header():
+    if cfg.moves != 0:
+        print(fmt_moves.format("ip", "hostname", "mac", "vlan", "old_port", "new_port"))
+    else:
+        print(fmt.format("ip", "hostname", cfg.by, "count"))
+
+
+def collect_counts(ip, nx):
+    if cfg.by == "port":
+        counts = nx.port_counts()
+    elif cfg.by == "type":
+        counts = nx.type_counts()
+    else:
+        counts = nx.vlan_counts()
+    lines = list()
+    for key in sorted(counts):
+        lines.append(fmt.format(ip, nx.hostname, key, counts[key]))
+    return lines
+
+
+def collect_moves(ip, nx):
+    lines = list()
+    for mac, vlan, old_port, new_port in nx.mac_moves():
+        lines.append(fmt_moves.format(ip, nx.hostname, mac, vlan, old_port, new_port))
+    return lines
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiMacAddressTable(vault.nxos_username, vault.nxos_password, ip, log)
+    nx.nxapi_init(cfg)
+    nx.refresh()
+    if cfg.moves == 0:
+        return collect_counts(ip, nx)
+    time.sleep(cfg.moves)
+    nx.refresh()
+    return collect_moves(ip, nx)
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+fmt = "{:<15} {:<18} {:<15} {:>7}"
+fmt_moves = "{:<15} {:<18} {:<15} {:>4} {:<15} {:<15}"
+print_header()
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = list()
+for device in devices:
+    args = [device, vault]
+    futures.append(executor.submit(worker, *args))
+print_output(futures)
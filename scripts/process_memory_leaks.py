@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Name: process_memory_leaks.py
+Description: NXAPI: poll process memory on an interval and display processes whose memory grows monotonically
+
+Per-process memory (summed across instances of each processname) is kept in
+memory in fixed-size ring buffers (see general/process_memory_tracker.py), so
+each poll costs one request per device, and the growth report is computed
+from memory.
+
+A process is displayed once it has at least --min_samples samples, its
+least-squares slope is at least --min_slope KB per hour, and at least
+--monotonic_ratio of the steps between its samples are non-decreasing.
+
+Example usage:
+
+./process_memory_leaks.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2 --interval 60 --iterations 120
+
+Example output:
+
+20230419_12:02:11 iteration 120
+hostname             process                   metric  samples  KB/hour    growth   first      last       monotonic
+cvd-1311-leaf        bgp                       rss         120    1530.2     3024   71024      74048           1.00
+cvd-1312-leaf        vsh.bin                   rss         118     240.7      480   102096     102576          0.95
+"""
+our_version = 100
+script_name = "process_memory_leaks"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.process_memory_tracker import ProcessMemoryTracker
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.util import timestamp
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_process_memory import NxapiProcessMemoryPhysical
+
+
+def get_parser():
+    help_metric = "memory metric to track."
+    help_interval = "seconds between polls."
+    help_iterations = "number of polls before exiting.  0 means poll forever."
+    help_qlen = "number of samples kept per process."
+    help_min_samples = "minimum number of samples before a process can be displayed."
+    help_min_slope = "minimum growth rate, in KB per hour."
+    help_monotonic_ratio = "minimum fraction of non-decreasing steps between consecutive samples."
+    help_all = "if specified, display all processes with at least --min_samples samples, not only growing processes."
+
+    ex_prefix = "Example: "
+    ex_metric = "{} --metric physical".format(ex_prefix)
+    ex_interval = "{} --interval 300".format(ex_prefix)
+    ex_iterations = "{} --iterations 288".format(ex_prefix)
+    ex_qlen = "{} --qlen 720".format(ex_prefix)
+    ex_min_samples = "{} --min_samples 30".format(ex_prefix)
+    ex_min_slope = "{} --min_slope 100".format(ex_prefix)
+    ex_monotonic_ratio = "{} --monotonic_ratio 1.0".format(ex_prefix)
+    ex_all = "{} --all".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: poll process memory and display processes whose memory grows monotonically.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    default.add_argument(
+        "--metric",
+        dest="metric",
+        required=False,
+        choices=["rss", "physical", "virtual"],
+        default="rss",
+        help="(default: %(default)s) {} {}".format(help_metric, ex_metric),
+    )
+    default.add_argument(
+        "--interval",
+        dest="interval",
+        required=False,
+        type=float,
+        default=60.0,
+        help="(default: %(default)s) {} {}".format(help_interval, ex_interval),
+    )
+    default.add_argument(
+        "--iterations",
+        dest="iterations",
+        required=False,
+        type=int,
+        default=0,
+        help="(default: %(default)s) {} {}".format(help_iterations, ex_iterations),
+    )
+    default.add_argument(
+        "--qlen",
+        dest="qlen",
+        required=False,
+        type=int,
+        default=360,
+        help="(default: %(default)s) {} {}".format(help_qlen, ex_qlen),
+    )
+    default.add_argument(
+        "--min_samples",
+        dest="min_samples",
+        required=False,
+        type=int,
+        default=10,
+        help="(default: %(default)s) {} {}".format(help_min_samples, ex_min_samples),
+    )
+    default.add_argument(
+        "--min_slope",
+        dest="min_slope",
+        required=False,
+        type=float,
+        default=1.0,
+        help="(default: %(default)s) {} {}".format(help_min_slope, ex_min_slope),
+    )
+    default.add_argument(
+        "--monotonic_ratio",
+        dest="monotonic_ratio",
+        required=False,
+        type=float,
+        default=0.9,
+        help="(default: %(default)s) {} {}".format(
+            help_monotonic_ratio, ex_monotonic_ratio
+        ),
+    )
+    default.add_argument(
+        "--all",
+        dest="all",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_all, ex_all),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def init_worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    instance = NxapiProcessMemoryPhysical(
+        vault.nxos_username, vault.nxos_password, ip, log
+    )
+    instance.nxapi_init(cfg)
+    return instance
+
+
+def poll_worker(instance):
+    """
+    refresh instance and return (hostname, info) so that the
+    tracker is only updated from the main thread.
+    """
+    instance.refresh()
+    return instance.hostname, instance.info
+
+
+def print_header():
+    print(
+        fmt.format(
+            "hostname",
+            "process",
+            "metric",
+            "samples",
+            "KB/hour",
+            "growth",
+            "first",
+            "last",
+            "monotonic",
+        )
+    )
+
+
+def print_report(iteration):
+    print("{} iteration {}".format(timestamp(), iteration))
+    print_header()
+    if cfg.all:
+        results = sorted(tracker.slopes(), key=lambda x: (-x["slope"], x["device"], x["process"]))
+    else:
+        results = tracker.growers()
+    for result in results:
+        print(
+            fmt.format(
+                str(result["device"]),
+                result["process"],
+                cfg.metric,
+                result["samples"],
+                "{:.1f}".format(result["slope"]),
+                result["growth"],
+                result["first"],
+                result["last"],
+                "{:.2f}".format(result["monotonic"]),
+            )
+        )
+    print()
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+fmt = "{:<20} {:<25} {:<8} {:>7} {:>9} {:>8}   {:<10} {:<10} {:>9}"
+tracker = ProcessMemoryTracker(log, cfg.qlen)
+tracker.metric = cfg.metric
+tracker.min_samples = cfg.min_samples
+tracker.min_slope = cfg.min_slope
+tracker.monotonic_ratio = cfg.monotonic_ratio
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+instances = list(executor.map(init_worker, devices, [vault] * len(devices)))
+
+iteration = 0
+while True:
+    iteration += 1
+    poll_start = time.time()
+    for hostname, info in executor.map(poll_worker, instances):
+        tracker.update(hostname, info, poll_start)
+    print_report(iteration)
+    if cfg.iterations != 0 and iteration >= cfg.iterations:
+        break
+    time.sleep(max(0.0, cfg.interval - (time.time() - poll_start)))
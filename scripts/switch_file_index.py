@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Name: switch_file_index.py
+Description: NXAPI: build a local index of files (dir --targets) across --devices and search it without querying the switches
+
+With --refresh, "dir <target>" for each of --targets is sent to each of --devices
+in a single request per device (devices are queried concurrently), and the results
+are merged into the index persisted in --cache_file.
+
+Without --refresh, searches and free-space reports are answered from --cache_file alone.
+Use --devices all to search every device in the index.
+
+Example usage:
+
+# build/refresh the index
+./switch_file_index.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1 --targets bootflash:,logflash: --refresh
+
+# which switches still have 9.3 images?
+./switch_file_index.py --devices all --glob "nxos*9.3*.bin"
+
+# which flash devices have less than 4GB free?
+./switch_file_index.py --devices all --free_below 4000000000
+
+Example output:
+
+% ./switch_file_index.py --devices all --find .cfg
+device          target          fname                                            size date
+cvd_leaf_3      bootflash:      arp.cfg                                         16081 Jul 25 23:10:33 2022
+cvd_spine_1     bootflash:      zmi_201.cfg                                     29234 Jul 10 18:47:26 2018
+%
+"""
+our_version = 100
+script_name = "switch_file_index"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.file_index import FileIndex
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_dir import NxapiDirTargets
+
+
+def get_parser():
+    help_cache_file = "file in which the file index is persisted."
+    help_refresh = "if present, query --devices and update the index before searching."
+    help_targets = "comma-separated list of dir targets to index with --refresh, and to limit searches to."
+    help_find = "display files whose name contains this string (case-insensitive)."
+    help_glob = "display files whose name matches this glob pattern (case-insensitive)."
+    help_free_below = "display flash devices/directories with less than this many bytes free."
+
+    ex_prefix = " Example: "
+    ex_cache_file = "{} --cache_file /tmp/fabric1_files.json".format(ex_prefix)
+    ex_refresh = "{} --refresh".format(ex_prefix)
+    ex_targets = "{} --targets bootflash:,logflash:".format(ex_prefix)
+    ex_find = "{} --find .cfg".format(ex_prefix)
+    ex_glob = '{} --glob "nxos*.bin"'.format(ex_prefix)
+    ex_free_below = "{} --free_below 4000000000".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: build a local index of files across --devices and search it.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+
+    default.add_argument(
+        "--cache_file",
+        dest="cache_file",
+        required=False,
+        default="/tmp/{}.json".format(script_name),
+        help="(default: %(default)s) {} {}".format(help_cache_file, ex_cache_file),
+    )
+    default.add_argument(
+        "--refresh",
+        dest="refresh",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_refresh, ex_refresh),
+    )
+    default.add_argument(
+        "--targets",
+        dest="targets",
+        required=False,
+        default="bootflash:",
+        help="(default: %(default)s) {} {}".format(help_targets, ex_targets),
+    )
+    default.add_argument(
+        "--find",
+        dest="find",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_find, ex_find),
+    )
+    default.add_argument(
+        "--glob",
+        dest="glob",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_glob, ex_glob),
+    )
+    default.add_argument(
+        "--free_below",
+        dest="free_below",
+        required=False,
+        type=int,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_free_below, ex_free_below),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    d = NxapiDirTargets(vault.nxos_username, vault.nxos_password, ip, log)
+    d.nxapi_init(cfg)
+    d.targets = targets
+    d.refresh()
+    return device, d
+
+
+def refresh_index():
+    executor = ThreadPoolExecutor(max_workers=len(devices))
+    futures = list()
+    for device in devices:
+        args = [device, vault]
+        futures.append(executor.submit(worker, *args))
+    changed = 0
+    for future in futures:
+        device, d = future.result()
+        for target in d.targets_info:
+            d.select(target)
+            usage = d.stats.get("usage", "na")
+            if index.update(device, target, d.files, d.used, d.free, d.total, usage):
+                changed += 1
+    index.save()
+    log.info("{} of {} device targets changed".format(changed, len(devices) * len(targets)))
+
+
+def print_files(pattern, match):
+    print(fmt_files.format("device", "target", "fname", "size", "date"))
+    for record in index.search(pattern, match, search_devices, targets):
+        print(
+            fmt_files.format(
+                record["device"],
+                record["target"],
+                record["fname"],
+                record["size"],
+                record["timestring"],
+            )
+        )
+
+
+def print_free_space():
+    print(fmt_space.format("device", "target", "free", "used", "total"))
+    for (device, target), space in index.free_space(cfg.free_below, search_devices, targets):
+        print(
+            fmt_space.format(device, target, space["free"], space["used"], space["total"])
+        )
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+
+devices = get_device_list()
+targets = cfg.targets.split(",")
+
+index = FileIndex(log)
+index.cache_file = cfg.cache_file
+index.load()
+
+if cfg.refresh:
+    if devices == ["all"]:
+        devices = index.devices
+    if len(devices) == 0:
+        log.error("exiting. --devices all, but {} is empty.".format(cfg.cache_file))
+        exit(1)
+    vault = get_vault(cfg.vault)
+    vault.fetch_data()
+    nb = netbox(vault)
+    refresh_index()
+
+search_devices = None
+if devices != ["all"]:
+    search_devices = devices
+
+fmt_files = "{:<15} {:<15} {:<40} {:>12} {}"
+fmt_space = "{:<15} {:<15} {:>15} {:>15} {:>15}"
+if cfg.find != None:
+    print_files(cfg.find, "substring")
+if cfg.glob != None:
+    print_files(cfg.glob, "glob")
+if cfg.free_below != None:
+    print_free_space()
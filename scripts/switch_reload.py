@@ -1,33 +1,65 @@
 #!/usr/bin/env python3
 """
 Name: switch_reload.py
-Description: NXAPI: reload (or install reset) one or more NX-OS devices
+Description: NXAPI: reload (or install reset) one or more NX-OS devices, in vpc-pair and role aware waves
+
+Devices are reloaded in waves of at most --wave_size devices.  Both peers of a
+vpc domain are never in the same wave, and --max_per_role limits the number of
+devices of each netbox device role in a wave.  After each wave is reloaded,
+its devices are polled (show version, show system mode) concurrently, with
+backoff, until they are back.  The next wave is not started if any device
+in the current wave fails to reload or does not come back within --poll_timeout.
+
+If the vpc state of a device cannot be determined (e.g. it is unreachable),
+the script exits without reloading, unless --force is given, in which case
+each such device is reloaded in a wave of its own.
+
 Synopsis:
 
-./switch_reload.py --vault hashicorp --device leaf_1,leaf_2
+./switch_reload.py --vault hashicorp --devices leaf_1,leaf_2,leaf_3,leaf_4 --wave_size 2 --max_per_role 1
+
+Example output (--dry_run):
+
+wave  device   role  vpc_domain
+1     leaf_1   leaf  10
+1     spine_1  spine na
+2     leaf_2   leaf  10
 """
-our_version = 106
+our_version = 108
 script_name = "switch_reload.py"
 
 # standard libraries
 import argparse
-from threading import Thread
 
 # local libraries
 from nxapi_netbox.args.args_cookie import ArgsCookie
 from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
 from nxapi_netbox.general.log import get_logger
-from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip, get_device_role
 from nxapi_netbox.vault.vault import get_vault
-from nxapi_netbox.nxapi.nxapi_config import NxapiConfig
+from nxapi_netbox.nxapi.nxapi_reload import ReloadOrchestrator
 
 
 def get_parser():
     help_install_reset = "If present, use install reset, instead of reload.  If not present, the default is to use reload"
     ex_install_reset = "Example: --install_reset"
+    help_wave_size = "Maximum number of devices reloaded in each wave."
+    ex_wave_size = "Example: --wave_size 4"
+    help_max_workers = "Maximum number of devices reloaded, or polled, concurrently."
+    ex_max_workers = "Example: --max_workers 20"
+    help_max_per_role = "Maximum number of devices of each netbox device role in each wave.  0 is no limit."
+    ex_max_per_role = "Example: --max_per_role 1"
+    help_settle = "Seconds to wait after reloading a wave, before polling its devices."
+    ex_settle = "Example: --settle 300"
+    help_poll_timeout = "Seconds, from reload, after which a device that is not back fails its wave."
+    ex_poll_timeout = "Example: --poll_timeout 3600"
+    help_dry_run = "If present, print the waves, but do not reload."
+    ex_dry_run = "Example: --dry_run"
+    help_force = "If present, reload devices whose vpc state could not be determined, each in a wave of its own.  If not present, exit if the vpc state of any device is unknown."
+    ex_force = "Example: --force"
 
     parser = argparse.ArgumentParser(
-        description="DESCRIPTION: NXAPI: reload (or install reset) one or more NX-OS devices",
+        description="DESCRIPTION: NXAPI: reload (or install reset) one or more NX-OS devices, in vpc-pair and role aware waves",
         parents=[ArgsCookie, ArgsNxapiTools],
     )
     optional = parser.add_argument_group(title="OPTIONAL SCRIPT ARGS")
@@ -41,6 +73,62 @@ def get_parser():
         action="store_true",
         help="{} {}".format(help_install_reset, ex_install_reset),
     )
+    optional.add_argument(
+        "--wave_size",
+        dest="wave_size",
+        required=False,
+        type=int,
+        default=1,
+        help="(default: %(default)s) {} {}".format(help_wave_size, ex_wave_size),
+    )
+    optional.add_argument(
+        "--max_workers",
+        dest="max_workers",
+        required=False,
+        type=int,
+        default=10,
+        help="(default: %(default)s) {} {}".format(help_max_workers, ex_max_workers),
+    )
+    optional.add_argument(
+        "--max_per_role",
+        dest="max_per_role",
+        required=False,
+        type=int,
+        default=0,
+        help="(default: %(default)s) {} {}".format(help_max_per_role, ex_max_per_role),
+    )
+    optional.add_argument(
+        "--settle",
+        dest="settle",
+        required=False,
+        type=int,
+        default=120,
+        help="(default: %(default)s) {} {}".format(help_settle, ex_settle),
+    )
+    optional.add_argument(
+        "--poll_timeout",
+        dest="poll_timeout",
+        required=False,
+        type=int,
+        default=1800,
+        help="(default: %(default)s) {} {}".format(help_poll_timeout, ex_poll_timeout),
+    )
+    optional.add_argument(
+        "--dry_run",
+        dest="dry_run",
+        required=False,
+        default=False,
+        action="store_true",
+        help="{} {}".format(help_dry_run, ex_dry_run),
+    )
+    optional.add_argument(
+        "--force",
+        dest="force",
+        required=False,
+        default=False,
+        action="store_true",
+        help="{} {}".format(help_force, ex_force),
+    )
 
     parser.add_argument(
         "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
@@ -60,26 +148,59 @@ def get_device_list():
         exit(1)
 
 
-def worker(device, vault):
-    ip = get_device_mgmt_ip(nb, device)
-    c = NxapiConfig(vault.nxos_username, vault.nxos_password, ip, log)
-    c.nxapi_init(cfg)
-    c.timeout = 5
-    if cfg.install_reset == True:
-        errmsg = "worker. exiting. Unable to install reset hostname {} ip {}".format(
-            c.hostname, ip
-        )
-        c.config_list = ["install reset"]
-    else:
-        errmsg = "worker. exiting. Unable to reload hostname {} ip {}".format(
-            c.hostname, ip
-        )
-        c.config_list = ["reload in 5"]
-    try:
-        c.commit_list()
-    except:
-        log.error(errmsg)
-        exit(1)
+def verify_args():
+    for arg in ["wave_size", "max_workers"]:
+        if getattr(cfg, arg) < 1:
+            log.error("exiting. --{} must be >= 1. Got {}".format(arg, getattr(cfg, arg)))
+            exit(1)
+    for arg in ["max_per_role", "settle", "poll_timeout"]:
+        if getattr(cfg, arg) < 0:
+            log.error("exiting. --{} must be >= 0. Got {}".format(arg, getattr(cfg, arg)))
+            exit(1)
+
+
+def vpc_domain(device):
+    if not orchestrator.devices[device]["vpc_known"]:
+        return "unknown"
+    peer_key = orchestrator.devices[device]["vpc_peer_key"]
+    if peer_key is None:
+        return "na"
+    return peer_key[0]
+
+
+def print_plan():
+    fmt = "{:<5} {:<20} {:<15} {:<10}"
+    print(fmt.format("wave", "device", "role", "vpc_domain"))
+    for wave_number, wave in enumerate(orchestrator.waves, 1):
+        for device in wave:
+            print(
+                fmt.format(
+                    wave_number,
+                    device,
+                    orchestrator.devices[device]["role"],
+                    vpc_domain(device),
+                )
+            )
+
+
+def print_results():
+    fmt = "{:<5} {:<20} {:<9} {:<8} {}"
+    print(fmt.format("wave", "device", "reloaded", "healthy", "detail"))
+    for wave_number, wave in enumerate(orchestrator.waves, 1):
+        for device in wave:
+            if device not in orchestrator.results:
+                print(fmt.format(wave_number, device, "no", "na", "not started"))
+                continue
+            result = orchestrator.results[device]
+            print(
+                fmt.format(
+                    wave_number,
+                    device,
+                    "yes" if result["reloaded"] else "no",
+                    "yes" if result["healthy"] else "no",
+                    result["detail"],
+                )
+            )
 
 
 cfg = get_parser()
@@ -88,8 +209,29 @@ vault = get_vault(cfg.vault)
 vault.fetch_data()
 nb = netbox(vault)
 
+verify_args()
 devices = get_device_list()
 
+orchestrator = ReloadOrchestrator(vault.nxos_username, vault.nxos_password, log, cfg)
+orchestrator.wave_size = cfg.wave_size
+orchestrator.max_workers = cfg.max_workers
+orchestrator.max_per_role = cfg.max_per_role
+orchestrator.settle = cfg.settle
+orchestrator.poll_timeout = cfg.poll_timeout
+orchestrator.force = cfg.force
+if cfg.install_reset == True:
+    orchestrator.reload_cli = ["install reset"]
 for device in devices:
-    t = Thread(target=worker, args=(device, vault))
-    t.start()
+    orchestrator.add_device(
+        device, get_device_mgmt_ip(nb, device), get_device_role(nb, device)
+    )
+
+orchestrator.plan()
+print_plan()
+if cfg.dry_run == True:
+    exit(0)
+print()
+result = orchestrator.run()
+print_results()
+if result == False:
+    exit(1)
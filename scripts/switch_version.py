@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-our_version = 110
+our_version = 112
 script_name = "switch_version"
 """
 Name: switch_version.py
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Name: transceiver_dom_scan.py
+Description: NXAPI: scan transceiver DOM (temperature, voltage, bias current, tx/rx power) across --devices and display only values outside warning/alarm thresholds
+
+One request per switch ("show interface transceiver ; show interface transceiver details").
+
+Example usage:
+
+./transceiver_dom_scan.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_spine_1
+./transceiver_dom_scan.py --vault hashicorp --devices cvd_leaf_1 --level alarm --metrics rx_pwr,tx_pwr
+
+Example output:
+
+% ./transceiver_dom_scan.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2
+ip              hostname             interface      lane metric          value severity  threshold serialnum
+192.168.11.102  cvd-1311-leaf        Ethernet1/49      2 rx_pwr         -9.21 warning       -8.30 FIW202102SX-B
+192.168.11.103  cvd-1312-leaf        Ethernet1/50      1 temperature    71.20 warning       70.00 FIW202003MS-B
+"""
+our_version = 100
+script_name = "transceiver_dom_scan"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_interface_transceiver import (
+    NxapiInterfaceTransceiverDetails,
+)
+
+
+def get_parser():
+    help_level = "display values outside alarm thresholds only, or outside warning thresholds too."
+    help_metrics = "comma-separated list of metrics to evaluate. One or more of: temperature,voltage,current,tx_pwr,rx_pwr"
+    ex_prefix = "Example: "
+    ex_level = "{} --level alarm".format(ex_prefix)
+    ex_metrics = "{} --metrics rx_pwr,tx_pwr".format(ex_prefix)
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: display transceiver DOM values outside warning/alarm thresholds.",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    default.add_argument(
+        "--level",
+        dest="level",
+        required=False,
+        choices=["alarm", "warning"],
+        default="warning",
+        help="(default: %(default)s) {} {}".format(help_level, ex_level),
+    )
+    default.add_argument(
+        "--metrics",
+        dest="metrics",
+        required=False,
+        default="temperature,voltage,current,tx_pwr,rx_pwr",
+        help="(default: %(default)s) {} {}".format(help_metrics, ex_metrics),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def get_metric_list():
+    valid = ["temperature", "voltage", "current", "tx_pwr", "rx_pwr"]
+    metrics = cfg.metrics.split(",")
+    for metric in metrics:
+        if metric not in valid:
+            log.error(
+                "exiting. Unknown metric {} in --metrics. Expected one or more of {}".format(
+                    metric, ",".join(valid)
+                )
+            )
+            exit(1)
+    return metrics
+
+
+def print_output(futures):
+    for future in futures:
+        output = future.result()
+        if output == None:
+            continue
+        for line in output:
+            print(line)
+
+
+def print_header():
+    print(
+        fmt.format(
+            "ip",
+            "hostname",
+            "interface",
+            "lane",
+            "metric",
+            "value",
+            "severity",
+            "threshold",
+            "serialnum",
+        )
+    )
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiInterfaceTransceiverDetails(
+        vault.nxos_username, vault.nxos_password, ip, log
+    )
+    nx.nxapi_init(cfg)
+    nx.refresh()
+    lines = list()
+    for interface, lane, metric, value, severity, threshold in nx.out_of_range(
+        cfg.level, metrics
+    ):
+        lines.append(
+            fmt.format(
+                ip,
+                nx.hostname,
+                interface,
+                lane,
+                metric,
+                "{:.2f}".format(value),
+                severity,
+                "{:.2f}".format(threshold),
+                nx.identity.get(interface, dict()).get("serialnum", "na"),
+            )
+        )
+    return lines
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+metrics = get_metric_list()
+
+fmt = "{:<15} {:<20} {:<14} {:>4} {:<12} {:>8} {:<9} {:>9} {:<15}"
+print_header()
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = list()
+for device in devices:
+    args = [device, vault]
+    futures.append(executor.submit(worker, *args))
+print_output(futures)
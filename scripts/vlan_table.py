@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Name: vlan_table.py
+Description: NXAPI: display vlan presence, state and port membership, with one request per device
+
+Uses NxapiVlanTable() (nxapi/nxapi_vlan.py), which collects all requested
+vlans with a single "show vlan id <ranges>" request (or "show vlan" if
+--vlans is not specified), rather than one request per vlan.
+
+Vlans in --vlans that do not exist on a device are displayed with state
+"missing".
+
+Example usage:
+
+./vlan_table.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2 --vlans 1-10,2000
+
+Example output:
+
+hostname             vlan   name                             state      shut_state   ports  interfaces
+cvd-1311-leaf        1      default                          active     noshutdown       4  Ethernet1/1-3,Ethernet1/53
+cvd-1311-leaf        2      na                               missing    na               0
+cvd-1311-leaf        2000   VLAN2000                         active     noshutdown       1  Ethernet1/53
+"""
+our_version = 100
+script_name = "vlan_table"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.general.util import expand_ranges
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_vlan import NxapiVlanTable
+
+
+def get_parser():
+    help_vlans = "vlans to display, as a comma-separated list of vlans and vlan ranges.  If not specified, all vlans on each device are displayed."
+    ex_vlans = "Example: --vlans 1-10,2000"
+    help_missing = "If present, display only the vlans in --vlans that do not exist on each device."
+    ex_missing = "Example: --missing"
+
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: display vlan presence, state and port membership, with one request per device",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    default.add_argument(
+        "--vlans",
+        dest="vlans",
+        required=False,
+        default=None,
+        help="(default: %(default)s) {} {}".format(help_vlans, ex_vlans),
+    )
+    default.add_argument(
+        "--missing",
+        dest="missing",
+        required=False,
+        default=False,
+        action="store_true",
+        help="(default: %(default)s) {} {}".format(help_missing, ex_missing),
+    )
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def get_vlan_list():
+    if cfg.vlans == None:
+        return None
+    try:
+        vlans = expand_ranges(cfg.vlans)
+    except ValueError:
+        vlans = list()
+    if len(vlans) == 0 or vlans[0] < 1 or vlans[-1] > 4094:
+        log.error(
+            "exiting. Cannot parse --vlans {}.  Example usage: --vlans 1-10,2000".format(
+                cfg.vlans
+            )
+        )
+        exit(1)
+    return vlans
+
+
+def print_header():
+    print(
+        fmt.format(
+            "hostname", "vlan", "name", "state", "shut_state", "ports", "interfaces"
+        )
+    )
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiVlanTable(vault.nxos_username, vault.nxos_password, ip, log)
+    nx.nxapi_init(cfg)
+    nx.vlans = vlans
+    nx.refresh()
+    lines = list()
+    for vlan in nx.missing:
+        lines.append(
+            (vlan, fmt.format(str(nx.hostname), vlan, "na", "missing", "na", 0, ""))
+        )
+    if cfg.missing:
+        return [line for vlan, line in lines]
+    for vlan in nx.vlan_ids:
+        nx.vlan = vlan
+        interfaces = nx.interfaces
+        if isinstance(interfaces, list):
+            interfaces = ",".join(interfaces)
+        line = fmt.format(
+            str(nx.hostname),
+            vlan,
+            nx.name,
+            nx.state,
+            nx.shut_state,
+            len(nx.ports),
+            interfaces or "",
+        )
+        lines.append((vlan, line))
+    return [line for vlan, line in sorted(lines)]
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+vlans = get_vlan_list()
+if cfg.missing and vlans == None:
+    log.error("exiting. --missing requires --vlans.")
+    exit(1)
+
+fmt = "{:<20} {:<6} {:<32} {:<10} {:<12} {:>5}  {}"
+print_header()
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = [executor.submit(worker, device, vault) for device in devices]
+for future in futures:
+    for line in future.result():
+        print(line)
+executor.shutdown()
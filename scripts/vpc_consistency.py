@@ -29,8 +29,13 @@ Example output when vpc po allowed-vlans are mismatched:
    vpc-param-peer-val: -
 192.168.11.103  cvd-1312-leaf        Po12 all 23 interface vpc port-channel params are consistent
 % 
+
+Check all vpc port-channels (learned from show vpc).  The per-interface cli are
+batched into as few requests as possible:
+
+% ./vpc_consistency.py --vault hashicorp --devices cvd_leaf_2 --all_interfaces
 """
-our_version = 109
+our_version = 110
 script_name = "vpc_consistency"
 
 # standard libraries
@@ -47,14 +52,16 @@ from nxapi_netbox.nxapi.nxapi_vpc_consistency import (
     NxapiVpcConsistencyGlobal,
     NxapiVpcConsistencyVni,
     NxapiVpcConsistencyVlans,
-    NxapiVpcConsistencyInterface,
+    NxapiVpcConsistencyInterfaces,
 )
 
 
 def get_parser():
+    help_all_interfaces = "test all vpc port-channel interfaces for vpc consistency. Overrides --interfaces"
     help_interfaces = "a comma-separated list (no spaces) of port-channel interfaces to test for vpc consistency"
     help_mismatched_labels = "display labels whose number of comma-separated entries differ from the number of values they refer to"
 
+    ex_all_interfaces = "Example: --all_interfaces"
     ex_interfaces = "Example: --interfaces Po1,Po10"
     ex_mismatched_labels = "Example: --mismatched_labels"
 
@@ -78,6 +85,15 @@ def get_parser():
         help="{} {}".format(help_mismatched_labels, ex_mismatched_labels),
     )
 
+    default.add_argument(
+        "--all_interfaces",
+        dest="all_interfaces",
+        required=False,
+        action="store_true",
+        default=False,
+        help="{} {}".format(help_all_interfaces, ex_all_interfaces),
+    )
+
     default.add_argument(
         "--interfaces",
         dest="interfaces",
@@ -148,6 +164,37 @@ def show_inconsistent_params(ip, nx, interface=None):
     return lines
 
 
+def show_inconsistent_interface_params(ip, nx):
+    lines = list()
+    inconsistent_items = nx.inconsistent_params
+    for interface in nx.interfaces:
+        if interface in nx.errors:
+            lines.append(
+                "{:<15} {:<20} {} error: {}".format(
+                    ip, nx.hostname, interface, nx.errors[interface]
+                )
+            )
+            continue
+        if interface not in inconsistent_items:
+            lines.append(
+                "{:<15} {:<20} {} all {} {} vpc port-channel params are consistent".format(
+                    ip, nx.hostname, interface, len(nx.info[interface]), nx.param_type
+                )
+            )
+            continue
+        for item in inconsistent_items[interface]:
+            lines.append(
+                "{:<15} {:<20} {} {}".format(
+                    ip, nx.hostname, interface, item["vpc-param-name"]
+                )
+            )
+            for key in item:
+                if key == "vpc-param-name":
+                    continue
+                lines.append("   {}: {}".format(key, item[key]))
+    return lines
+
+
 def show_mismatched_labels(ip, nx):
     lines = list()
     if cfg.mismatched_labels == False:
@@ -179,16 +226,16 @@ def worker(device, vault):
         lines += show_inconsistent_params(ip, nx)
         lines += show_mismatched_labels(ip, nx)
 
-    if cfg.interfaces == None:
+    if cfg.interfaces == None and cfg.all_interfaces == False:
         return lines
-    for interface in cfg.interfaces.split(","):
-        nx = NxapiVpcConsistencyInterface(
-            vault.nxos_username, vault.nxos_password, ip, log
-        )
-        nx.nxapi_init(cfg)
-        nx.interface = interface
-        nx.refresh()
-        lines += show_inconsistent_params(ip, nx, interface)
+    nx = NxapiVpcConsistencyInterfaces(
+        vault.nxos_username, vault.nxos_password, ip, log
+    )
+    nx.nxapi_init(cfg)
+    if cfg.all_interfaces == False:
+        nx.interfaces = cfg.interfaces.split(",")
+    nx.refresh()
+    lines += show_inconsistent_interface_params(ip, nx)
     return lines
 
 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Name: vpc_domain_check.py
+Description: NXAPI: pair vpc peers in --devices and display inconsistent vpc consistency parameters
+
+Each device is queried once, with "show vpc", "show vpc role", and all
+"show vpc consistency-parameters" scopes (global, vni, vlans, and one per vpc port-channel)
+batched into a single request.  Devices are queried in parallel.  Devices are paired
+on (vpc domain id, vpc system mac), and each pair's consistency parameters are diffed.
+
+kind:
+    local/peer  the device's local value differs from the value it sees on its peer
+    cross-peer  the local values of the two peers differ
+    missing     the parameter was collected from one peer only
+    vlans       show vpc consistency-parameters vlans reason_code is not SUCCESS
+
+Each parameter is reported at most once per pair.  Interface parameters are
+compared per vpc id (scope "vpc <id>"), so peers may use different
+port-channel numbers for the same vpc.
+
+Example usage:
+
+./vpc_domain_check.py --vault hashicorp --devices cvd_leaf_1,cvd_leaf_2,cvd_leaf_3,cvd_leaf_4
+
+Example output:
+
+domain   kind         device                         scope    parameter                      value_a              value_b
+1        cross-peer   cvd-1311-leaf/cvd-1312-leaf    vpc 11   mtu                            9216                 1500
+2        no_peer      cvd-1313-leaf                  na       na                             na                   na
+"""
+our_version = 101
+script_name = "vpc_domain_check"
+
+# standard libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# local libraries
+from nxapi_netbox.args.args_cookie import ArgsCookie
+from nxapi_netbox.args.args_nxapi_tools import ArgsNxapiTools
+from nxapi_netbox.general.log import get_logger
+from nxapi_netbox.netbox.netbox_session import netbox, get_device_mgmt_ip
+from nxapi_netbox.vault.vault import get_vault
+from nxapi_netbox.nxapi.nxapi_vpc_domain import NxapiVpcDomainMember, VpcDomain
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="DESCRIPTION: NXAPI: pair vpc peers in --devices and display inconsistent vpc consistency parameters",
+        parents=[ArgsCookie, ArgsNxapiTools],
+    )
+    default = parser.add_argument_group(title="DEFAULT SCRIPT ARGS")
+    mandatory = parser.add_argument_group(title="MANDATORY SCRIPT ARGS")
+
+    parser.add_argument(
+        "--version", action="version", version="{} v{}".format("%(prog)s", our_version)
+    )
+    return parser.parse_args()
+
+
+def get_device_list():
+    try:
+        return cfg.devices.split(",")
+    except:
+        log.error(
+            "exiting. Cannot parse --devices {}.  Example usage: --devices leaf_1,spine_2,leaf_2".format(
+                cfg.devices
+            )
+        )
+        exit(1)
+
+
+def print_header():
+    print(
+        fmt.format(
+            "domain", "kind", "device", "scope", "parameter", "value_a", "value_b"
+        )
+    )
+
+
+def print_output(domain):
+    for pair in domain.pairs:
+        domain_id = domain.members[pair[0]].domain_id
+        if pair[1] is None:
+            print(fmt.format(domain_id, "no_peer", pair[0], "na", "na", "na", "na"))
+        for kind, device, scope, name, value_a, value_b in domain.inconsistencies(pair):
+            print(fmt.format(domain_id, kind, device, scope, name, value_a, value_b))
+
+
+def worker(device, vault):
+    ip = get_device_mgmt_ip(nb, device)
+    nx = NxapiVpcDomainMember(vault.nxos_username, vault.nxos_password, ip, log)
+    nx.nxapi_init(cfg)
+    nx.refresh()
+    return nx
+
+
+cfg = get_parser()
+log = get_logger(script_name, cfg.loglevel, "DEBUG")
+vault = get_vault(cfg.vault)
+vault.fetch_data()
+nb = netbox(vault)
+
+devices = get_device_list()
+
+fmt = "{:<8} {:<12} {:<30} {:<8} {:<30} {:<20} {}"
+
+executor = ThreadPoolExecutor(max_workers=len(devices))
+futures = list()
+for device in devices:
+    args = [device, vault]
+    futures.append(executor.submit(worker, *args))
+
+domain = VpcDomain(log)
+for future in futures:
+    domain.add(future.result())
+domain.build()
+
+print_header()
+print_output(domain)